@@ -1,12 +1,28 @@
+from .reward_statistics import *
 from .utils import *
 from .bernoulli_arm import *
 from .gaussian_arm import *
 from .pseudo_arm import *
+from .reward_stream import *
+from .arm_bank import *
+from .reward_tape import *
+from .trace_arm import *
 
 
 __all__ = [
     'Arm',
+    'RewardStatistics',
     'BernoulliArm',
     'GaussianArm',
     'PseudoArm',
+    'LockstepPseudoArms',
+    'RewardStream',
+    'ArmBank',
+    'BernoulliArmBank',
+    'GaussianArmBank',
+    'TapeArm',
+    'write_reward_tape',
+    'load_reward_tape',
+    'TraceArm',
+    'convert_trace',
 ]
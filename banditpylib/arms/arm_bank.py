@@ -0,0 +1,309 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .bernoulli_arm import BernoulliArm
+from .gaussian_arm import GaussianArm
+from .reward_statistics import RewardStatistics
+from .utils import Arm
+
+
+class ArmBank(ABC):
+  """Bank of arms
+
+  Parameters of a family of arms are stored as arrays, so that the rewards of
+  any number of pulls across the arms are drawn by one vectorized call instead
+  of one call per arm. It can be used in place of a list of arms by
+  :class:`banditpylib.bandits.OrdinaryBandit`.
+  """
+  def __init__(self, name: Optional[str]):
+    """
+    Args:
+      name: alias name for the arm bank
+    """
+    self.__name = self._name() if name is None else name
+
+  @property
+  def name(self) -> str:
+    """arm bank name"""
+    return self.__name
+
+  @abstractmethod
+  def _name(self) -> str:
+    """
+    Returns:
+      default arm bank name
+    """
+
+  @property
+  @abstractmethod
+  def means(self) -> np.ndarray:
+    """mean of rewards of each arm"""
+
+  def __len__(self) -> int:
+    return len(self.means)
+
+  @abstractmethod
+  def arm(self, arm_id: int) -> Arm:
+    """
+    Args:
+      arm_id: arm id
+
+    Returns:
+      the arm as an :class:`Arm`
+    """
+
+  @abstractmethod
+  def sample(self,
+             arm_ids: np.ndarray,
+             random_state: np.random.RandomState = None) -> np.ndarray:
+    """Pull arms once each
+
+    Args:
+      arm_ids: arms to pull. An arm can appear more than once.
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
+
+    Returns:
+      reward of each pull
+    """
+
+  def pull(self,
+           arm_ids: np.ndarray,
+           counts: np.ndarray,
+           random_state: np.random.RandomState = None) -> List[np.ndarray]:
+    """Pull arms multiple times
+
+    Args:
+      arm_ids: arms to pull
+      counts: number of times to pull each arm in `arm_ids`
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
+
+    Returns:
+      rewards of each arm in `arm_ids`
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if len(counts) == 0:
+      return []
+    rewards = self.sample(np.repeat(arm_ids, counts), random_state)
+    return np.split(rewards, np.cumsum(counts)[:-1])
+
+  def _sample_stats(self, arm_ids: np.ndarray, counts: np.ndarray,
+                    random_state) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw the sums and the sums of squares of rewards
+
+    By default, the rewards are drawn by :func:`sample` and aggregated.
+
+    Args:
+      arm_ids: arms to pull
+      counts: number of times to pull each arm in `arm_ids`, which are
+        positive
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards
+
+    Returns:
+      sum of rewards and sum of squared rewards of each arm in `arm_ids`
+    """
+    rewards = self.sample(np.repeat(arm_ids, counts), random_state)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return (np.add.reduceat(rewards, starts),
+            np.add.reduceat(rewards**2, starts))
+
+  def pull_stats(self,
+                 arm_ids: np.ndarray,
+                 counts: np.ndarray,
+                 random_state: np.random.RandomState = None) -> \
+      List[RewardStatistics]:
+    """Pull arms multiple times and only keep the sufficient statistics
+
+    Args:
+      arm_ids: arms to pull
+      counts: number of times to pull each arm in `arm_ids`
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
+
+    Returns:
+      statistics of the rewards of each arm in `arm_ids`
+    """
+    arm_ids = np.asarray(arm_ids, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    stats = [RewardStatistics(0, 0.0, 0.0)] * len(counts)
+    pulled = np.flatnonzero(counts > 0)
+    if len(pulled) > 0:
+      (totals, sums_of_squares) = self._sample_stats(
+          arm_ids[pulled], counts[pulled],
+          np.random if random_state is None else random_state)
+      for (index, total, sum_of_squares) in zip(pulled, totals,
+                                                sums_of_squares):
+        stats[index] = RewardStatistics(counts[index], total, sum_of_squares)
+    return stats
+
+
+class BernoulliArmBank(ArmBank):
+  """Bank of Bernoulli arms"""
+  def __init__(self, mus: np.ndarray, name: str = None):
+    """
+    Args:
+      mus: mean of rewards of each arm
+      name: alias name
+    """
+    super().__init__(name)
+    mus = np.asarray(mus, dtype=float)
+    if np.any(mus < 0):
+      raise Exception('Mean of rewards %.2f is less than 0!' % mus.min())
+    if np.any(mus > 1):
+      raise Exception('Mean of rewards %.2f is greater than 1!' % mus.max())
+    self.__mus = mus
+
+  def _name(self) -> str:
+    """
+    Returns:
+      default arm bank name
+    """
+    return 'bernoulli_arm_bank'
+
+  @property
+  def means(self) -> np.ndarray:
+    """mean of rewards of each arm"""
+    return self.__mus
+
+  def arm(self, arm_id: int) -> Arm:
+    """
+    Args:
+      arm_id: arm id
+
+    Returns:
+      the arm as a :class:`BernoulliArm`
+    """
+    return BernoulliArm(float(self.__mus[arm_id]))
+
+  def sample(self,
+             arm_ids: np.ndarray,
+             random_state: np.random.RandomState = None) -> np.ndarray:
+    """Pull arms once each
+
+    Args:
+      arm_ids: arms to pull. An arm can appear more than once.
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
+
+    Returns:
+      reward of each pull
+    """
+    return (np.random if random_state is None else
+            random_state).binomial(1, self.__mus[arm_ids])
+
+  def _sample_stats(self, arm_ids: np.ndarray, counts: np.ndarray,
+                    random_state) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw the sums and the sums of squares of rewards
+
+    Sums are drawn from binomial distributions.
+
+    Args:
+      arm_ids: arms to pull
+      counts: number of times to pull each arm in `arm_ids`, which are
+        positive
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards
+
+    Returns:
+      sum of rewards and sum of squared rewards of each arm in `arm_ids`
+    """
+    totals = random_state.binomial(counts, self.__mus[arm_ids])
+    return (totals, totals)
+
+
+class GaussianArmBank(ArmBank):
+  """Bank of Gaussian arms"""
+  def __init__(self,
+               mus: np.ndarray,
+               variances: np.ndarray,
+               name: str = None):
+    """
+    Args:
+      mus: mean of rewards of each arm
+      variances: variance of rewards of each arm
+      name: alias name
+    """
+    super().__init__(name)
+    mus = np.asarray(mus, dtype=float)
+    variances = np.asarray(variances, dtype=float)
+    if mus.shape != variances.shape:
+      raise Exception('Numbers of means %d and variances %d are not equal!' %
+                      (mus.size, variances.size))
+    if np.any(variances < 0):
+      raise Exception('Variance of rewards %.2f is negative!' %
+                      variances.min())
+    self.__mus = mus
+    self.__vars = variances
+    # standard deviations
+    self.__stds = np.sqrt(variances)
+
+  def _name(self) -> str:
+    """
+    Returns:
+      default arm bank name
+    """
+    return 'gaussian_arm_bank'
+
+  @property
+  def means(self) -> np.ndarray:
+    """mean of rewards of each arm"""
+    return self.__mus
+
+  def arm(self, arm_id: int) -> Arm:
+    """
+    Args:
+      arm_id: arm id
+
+    Returns:
+      the arm as a :class:`GaussianArm`
+    """
+    return GaussianArm(float(self.__mus[arm_id]), float(self.__vars[arm_id]))
+
+  def sample(self,
+             arm_ids: np.ndarray,
+             random_state: np.random.RandomState = None) -> np.ndarray:
+    """Pull arms once each
+
+    Args:
+      arm_ids: arms to pull. An arm can appear more than once.
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
+
+    Returns:
+      reward of each pull
+    """
+    return (np.random if random_state is None else random_state).normal(
+        self.__mus[arm_ids], self.__stds[arm_ids])
+
+  def _sample_stats(self, arm_ids: np.ndarray, counts: np.ndarray,
+                    random_state) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw the sums and the sums of squares of rewards
+
+    See :func:`GaussianArm.pull_stats` for the distributions.
+
+    Args:
+      arm_ids: arms to pull
+      counts: number of times to pull each arm in `arm_ids`, which are
+        positive
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards
+
+    Returns:
+      sum of rewards and sum of squared rewards of each arm in `arm_ids`
+    """
+    totals = random_state.normal(counts * self.__mus[arm_ids],
+                                 np.sqrt(counts) * self.__stds[arm_ids])
+    # chi-square with no degree of freedom is 0
+    deviations = np.where(
+        counts > 1, self.__vars[arm_ids] *
+        random_state.chisquare(np.maximum(counts - 1, 1)), 0.0)
+    return (totals, totals**2 / counts + deviations)
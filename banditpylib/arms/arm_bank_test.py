@@ -0,0 +1,37 @@
+import numpy as np
+
+from .arm_bank import BernoulliArmBank, GaussianArmBank
+
+
+class TestArmBank:
+  """Test arm banks"""
+
+  def test_bernoulli_arm_bank(self):
+    arm_bank = BernoulliArmBank(np.array([0, 1, 0.5]))
+    assert len(arm_bank) == 3
+    assert arm_bank.arm(1).mean == 1
+    rewards = arm_bank.pull(np.array([1, 0, 2]), np.array([3, 2, 1000]))
+    assert [len(arm_rewards) for arm_rewards in rewards] == [3, 2, 1000]
+    assert list(rewards[0]) == [1, 1, 1]
+    assert list(rewards[1]) == [0, 0]
+    assert set(rewards[2]) == {0, 1}
+
+  def test_gaussian_arm_bank(self):
+    arm_bank = GaussianArmBank(np.array([-1.0, 2.0]), np.array([0.0, 1.0]))
+    assert arm_bank.arm(1).var == 1
+    rewards = arm_bank.sample(np.array([0, 1] * 50000))
+    assert np.all(rewards[0::2] == -1)
+    assert abs(rewards[1::2].mean() - 2) < 0.05
+    # the same random state gives the same rewards
+    assert np.array_equal(
+        arm_bank.sample(np.array([1, 1]), np.random.RandomState(0)),
+        arm_bank.sample(np.array([1, 1]), np.random.RandomState(0)))
+
+  def test_pull_stats(self):
+    arm_bank = GaussianArmBank(np.array([-1.0, 2.0]), np.array([0.0, 1.0]))
+    stats = arm_bank.pull_stats(np.array([0, 1, 1]),
+                                np.array([10, 0, 10**6]))
+    assert [len(arm_stats) for arm_stats in stats] == [10, 0, 10**6]
+    assert stats[0].total == -10 and stats[0].sum_of_squares == 10
+    assert abs(stats[2].total / 10**6 - 2) < 0.01
+    assert abs(stats[2].sum_of_squares / 10**6 - 5) < 0.05
@@ -1,5 +1,6 @@
 import numpy as np
 
+from .reward_statistics import RewardStatistics
 from .utils import Arm
 
 
@@ -34,13 +35,39 @@ class BernoulliArm(Arm):
     """mean of rewards"""
     return self.__mu
 
-  def pull(self, pulls: int = 1) -> np.ndarray:
+  def pull(self,
+           pulls: int = 1,
+           random_state: np.random.RandomState = None) -> np.ndarray:
     """Pull the arm
 
     Args:
       pulls: number of times to pull
+      random_state: random state used to generate the rewards. The global
+        random state of numpy is used if it is `None`.
 
     Returns:
       stochastic rewards
     """
-    return np.random.binomial(1, self.__mu, pulls)
+    return (np.random if random_state is None else
+            random_state).binomial(1, self.__mu, pulls)
+
+  def pull_stats(self,
+                 pulls: int = 1,
+                 random_state: np.random.RandomState = None) -> \
+      RewardStatistics:
+    """Pull the arm and only keep the sufficient statistics of the rewards
+
+    The sum of rewards is drawn from a binomial distribution in one go.
+
+    Args:
+      pulls: number of times to pull
+      random_state: random state used to generate the rewards. The global
+        random state of numpy is used if it is `None`.
+
+    Returns:
+      statistics of the rewards
+    """
+    total = (np.random if random_state is None else
+             random_state).binomial(pulls, self.__mu)
+    # rewards are either 0 or 1, so the sum of squares is the sum
+    return RewardStatistics(pulls, total, total)
@@ -1,6 +1,7 @@
 import math
 import numpy as np
 
+from .reward_statistics import RewardStatistics
 from .utils import Arm
 
 
@@ -47,13 +48,46 @@ class GaussianArm(Arm):
     """variance of rewards"""
     return self.__var
 
-  def pull(self, pulls: int = 1) -> np.ndarray:
+  def pull(self,
+           pulls: int = 1,
+           random_state: np.random.RandomState = None) -> np.ndarray:
     """Pull the arm
 
     Args:
       pulls: number of times to pull
+      random_state: random state used to generate the rewards. The global
+        random state of numpy is used if it is `None`.
 
     Returns:
       stochastic rewards
     """
-    return np.random.normal(self.__mu, self.__std, pulls)
+    return (np.random if random_state is None else
+            random_state).normal(self.__mu, self.__std, pulls)
+
+  def pull_stats(self,
+                 pulls: int = 1,
+                 random_state: np.random.RandomState = None) -> \
+      RewardStatistics:
+    """Pull the arm and only keep the sufficient statistics of the rewards
+
+    The sum of rewards is drawn from :math:`\\mathcal{N}(n \\mu, n
+    \\sigma^2)`. The sum of squared deviations from the empirical mean is
+    independent of the sum and follows :math:`\\sigma^2 \\chi^2_{n - 1}`, so
+    the sum of squares is drawn in constant time as well.
+
+    Args:
+      pulls: number of times to pull
+      random_state: random state used to generate the rewards. The global
+        random state of numpy is used if it is `None`.
+
+    Returns:
+      statistics of the rewards
+    """
+    if pulls < 1:
+      return RewardStatistics(0, 0.0, 0.0)
+    random_state = np.random if random_state is None else random_state
+    total = random_state.normal(pulls * self.__mu,
+                                math.sqrt(pulls) * self.__std)
+    deviations = self.__var * random_state.chisquare(pulls - 1) \
+        if pulls > 1 else 0.0
+    return RewardStatistics(pulls, total, total**2 / pulls + deviations)
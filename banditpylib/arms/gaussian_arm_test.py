@@ -17,3 +17,14 @@ class TestGaussianArm:
         prob_within_one_std
     ) > 0.68, ('Probability of rewards within one std in N(0, 1) %.2f is '
                'no greater than 0.68!' % prob_within_one_std)
+
+  def test_pull_stats(self):
+    gaussian_arm = GaussianArm(mu=1.0, var=4.0)
+    stats = gaussian_arm.pull_stats(10**6)
+    assert len(stats) == 10**6
+    em_mean = stats.total / stats.count
+    em_var = stats.sum_of_squares / stats.count - em_mean**2
+    assert abs(em_mean - 1.0) < 0.01
+    assert abs(em_var - 4.0) < 0.05
+    stats = gaussian_arm.pull_stats(1)
+    assert stats.sum_of_squares == stats.total**2
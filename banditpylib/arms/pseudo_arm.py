@@ -1,5 +1,9 @@
+from typing import Union
+
 import numpy as np
 
+from .reward_statistics import RewardStatistics
+
 
 class PseudoArm:
   """Pseudo arm
@@ -56,12 +60,94 @@ class PseudoArm:
     self.__total_rewards = 0
     self.__sum_of_square_reward = 0
 
-  def update(self, rewards: np.ndarray):
+  def update(self, rewards: Union[np.ndarray, RewardStatistics]):
     """Update information
 
     Args:
-      rewards: empirical rewards
+      rewards: empirical rewards or their sufficient statistics
     """
+    if isinstance(rewards, RewardStatistics):
+      self.__total_pulls += rewards.count
+      self.__total_rewards += rewards.total
+      self.__sum_of_square_reward += rewards.sum_of_squares
+      return
     self.__total_pulls += len(rewards)
-    self.__total_rewards += sum(rewards)
-    self.__sum_of_square_reward += sum(rewards**2)
+    self.__total_rewards += np.sum(rewards)
+    self.__sum_of_square_reward += np.sum(rewards**2)
+
+
+class LockstepPseudoArms:
+  """Lockstep pseudo arms
+
+  This class is used to store empirical information of all arms across a batch
+  of independent trials which are simulated in lockstep. Entry :math:`(n, i)`
+  of each statistic corresponds to arm :math:`i` in trial :math:`n`.
+  """
+  def __init__(self, trials: int, arm_num: int):
+    """
+    Args:
+      trials: number of trials simulated in lockstep
+      arm_num: number of arms
+    """
+    if trials < 1:
+      raise Exception('Number of trials %d is less than 1!' % trials)
+    self.__trials = trials
+    self.__arm_num = arm_num
+    self.reset()
+
+  def trials(self) -> int:
+    """
+    Returns:
+      number of trials simulated in lockstep
+    """
+    return self.__trials
+
+  def arm_num(self) -> int:
+    """
+    Returns:
+      number of arms
+    """
+    return self.__arm_num
+
+  def total_pulls(self) -> np.ndarray:
+    """
+    Returns:
+      total number of pulls of each arm in each trial
+    """
+    return self.__total_pulls
+
+  def total_rewards(self) -> np.ndarray:
+    """
+    Returns:
+      total rewards of each arm in each trial obtained so far
+    """
+    return self.__total_rewards
+
+  @property
+  def em_mean(self) -> np.ndarray:
+    """empirical means of rewards"""
+    return self.__total_rewards / self.__total_pulls
+
+  @property
+  def em_var(self) -> np.ndarray:
+    """empirical variances of rewards"""
+    return (self.__sum_of_square_reward -
+            self.__total_rewards**2 / self.__total_pulls) / self.__total_pulls
+
+  def reset(self):
+    """Clear information"""
+    self.__total_pulls = np.zeros((self.__trials, self.__arm_num))
+    self.__total_rewards = np.zeros((self.__trials, self.__arm_num))
+    self.__sum_of_square_reward = np.zeros((self.__trials, self.__arm_num))
+
+  def update(self, arm_ids: np.ndarray, rewards: np.ndarray):
+    """Update information
+
+    Args:
+      arm_ids: arm pulled in each trial
+      rewards: reward obtained in each trial
+    """
+    trial_ids = np.arange(self.__trials)
+    self.__total_pulls[trial_ids, arm_ids] += 1
+    self.__total_rewards[trial_ids, arm_ids] += rewards
+    self.__sum_of_square_reward[trial_ids, arm_ids] += rewards**2
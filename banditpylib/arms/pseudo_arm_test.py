@@ -1,5 +1,8 @@
+import numpy as np
+
 from .bernoulli_arm import BernoulliArm
 from .pseudo_arm import PseudoArm
+from .reward_statistics import RewardStatistics
 
 
 class TestPseudoArm:
@@ -12,3 +15,13 @@ class TestPseudoArm:
     em_var = pseudo_arm.em_var
     assert em_var <= 1, \
         ('Empirical variance of Bernoulli arm %.2f is greater than 1!' % em_var)
+
+  def test_update_with_statistics(self):
+    rewards = np.array([0.5, 1.5, -1.0])
+    pseudo_arm = PseudoArm()
+    pseudo_arm.update(rewards)
+    stats_pseudo_arm = PseudoArm()
+    stats_pseudo_arm.update(RewardStatistics.from_rewards(rewards))
+    assert stats_pseudo_arm.total_pulls() == 3
+    assert stats_pseudo_arm.em_mean == pseudo_arm.em_mean
+    assert stats_pseudo_arm.em_var == pseudo_arm.em_var
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class RewardStatistics:
+  """Sufficient statistics of rewards
+
+  Aggregated feedback of pulling an arm many times i.e., the number of rewards,
+  their sum and their sum of squares, which is all
+  :class:`banditpylib.arms.PseudoArm` needs to maintain the empirical mean and
+  variance. Its length is the number of rewards, so it can be used in place of
+  the array of rewards by the learners.
+  """
+  def __init__(self, count: int, total: float, sum_of_squares: float):
+    """
+    Args:
+      count: number of rewards
+      total: sum of rewards
+      sum_of_squares: sum of squared rewards
+    """
+    if count < 0:
+      raise Exception('Number of rewards %d is negative!' % count)
+    self.__count = int(count)
+    self.__total = float(total)
+    self.__sum_of_squares = float(sum_of_squares)
+
+  @classmethod
+  def from_rewards(cls, rewards: np.ndarray) -> 'RewardStatistics':
+    """
+    Args:
+      rewards: empirical rewards
+
+    Returns:
+      statistics of `rewards`
+    """
+    rewards = np.asarray(rewards, dtype=float)
+    return cls(len(rewards), np.sum(rewards), np.sum(rewards**2))
+
+  @property
+  def count(self) -> int:
+    """number of rewards"""
+    return self.__count
+
+  @property
+  def total(self) -> float:
+    """sum of rewards"""
+    return self.__total
+
+  @property
+  def sum_of_squares(self) -> float:
+    """sum of squared rewards"""
+    return self.__sum_of_squares
+
+  def __len__(self) -> int:
+    return self.__count
+
+  def __repr__(self) -> str:
+    return 'RewardStatistics(count=%d, total=%s, sum_of_squares=%s)' % (
+        self.__count, self.__total, self.__sum_of_squares)
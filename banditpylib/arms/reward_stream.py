@@ -0,0 +1,73 @@
+from typing import List, Union
+
+import numpy as np
+
+from .utils import Arm
+
+
+class RewardStream:
+  """Reward stream
+
+  Stream of the rewards of one arm drawn from its own random number generator.
+  Rewards are pre-drawn in blocks and consumed in order, so the `i`-th pull of
+  the arm always gets the `i`-th reward of the stream no matter how the pulls
+  are grouped. Two streams with the same seed give the same rewards, which is
+  used to compare learners with common random numbers.
+  """
+
+  # size of the first block of pre-drawn rewards
+  MIN_BLOCK_SIZE = 64
+  # maximum size of a block of pre-drawn rewards
+  MAX_BLOCK_SIZE = 4096
+
+  def __init__(self, arm: Arm, random_seed: Union[int, List[int]]):
+    """
+    Args:
+      arm: arm whose rewards are drawn
+      random_seed: random seed of the stream. It can also be a list of
+        integers.
+    """
+    self.__arm = arm
+    # a list of integers is the entropy of the seed sequence of the generator
+    self.__rng = np.random.default_rng(random_seed)
+    self.__rewards = np.empty(0)
+    # position of the next reward in the pre-drawn block
+    self.__position = 0
+    self.__block_size = self.MIN_BLOCK_SIZE
+
+  def __draw_block(self, pulls: int):
+    """Draw the next block of rewards
+
+    Args:
+      pulls: number of rewards needed from the current position
+    """
+    # rewards needed beyond those already drawn
+    shortfall = pulls - (len(self.__rewards) - self.__position)
+    # blocks grow with the number of pulls so that short games do not draw
+    # too many rewards
+    size = max(shortfall, self.__block_size)
+    # arms whose rewards run out e.g., replayed traces are not drawn beyond
+    # their last reward
+    remaining_pulls = self.__arm.remaining_pulls()
+    if remaining_pulls is not None:
+      size = min(size, max(shortfall, remaining_pulls))
+    self.__block_size = min(self.__block_size * 2, self.MAX_BLOCK_SIZE)
+    self.__rewards = np.concatenate(
+        (self.__rewards[self.__position:],
+         self.__arm.pull(pulls=size, random_state=self.__rng)))
+    self.__position = 0
+
+  def pull(self, pulls: int = 1) -> np.ndarray:
+    """Pull the arm
+
+    Args:
+      pulls: number of times to pull
+
+    Returns:
+      the next `pulls` rewards of the stream
+    """
+    if self.__position + pulls > len(self.__rewards):
+      self.__draw_block(pulls)
+    rewards = self.__rewards[self.__position:self.__position + pulls]
+    self.__position += pulls
+    return rewards
@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from .gaussian_arm import GaussianArm
+from .reward_stream import RewardStream
+from .reward_tape import TapeArm, write_reward_tape
+from .trace_arm import TraceArm
+
+
+class TestRewardStream:
+  """Test reward stream"""
+
+  def test_same_rewards(self):
+    arm = GaussianArm(mu=0, var=1)
+    stream = RewardStream(arm, random_seed=3)
+    rewards = np.concatenate([stream.pull(pulls) for pulls in [1, 100, 1000]])
+    # rewards do not depend on how the pulls are grouped
+    np.testing.assert_array_equal(
+        RewardStream(arm, random_seed=3).pull(1101), rewards)
+
+  def test_finite_rewards(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    trace_filename = os.path.join(temp_dir.name, 'trace.npy')
+    np.save(trace_filename, np.arange(100.0))
+    tape_filename = os.path.join(temp_dir.name, 'tape.npy')
+    write_reward_tape(tape_filename, [GaussianArm(mu=0, var=1)],
+                      max_pulls=100,
+                      random_seed=0)
+    for arm in [TraceArm(trace_filename, mode='replay'),
+                TapeArm(tape_filename, 0)]:
+      arm.reset()
+      expected = arm.pull(100)
+      arm.reset()
+      stream = RewardStream(arm, random_seed=3)
+      # uneven pulls use up the rewards exactly
+      rewards = np.concatenate(
+          [stream.pull(pulls) for pulls in [1, 70, 2, 27]])
+      np.testing.assert_array_equal(rewards, expected)
+      with pytest.raises(Exception, match='runs out'):
+        stream.pull(1)
@@ -0,0 +1,175 @@
+from typing import List, Optional
+
+import numpy as np
+
+from .utils import Arm
+
+# number of rewards of an arm drawn at a time when writing a tape
+TAPE_BLOCK_SIZE = 1 << 20
+
+
+def write_reward_tape(filename: str,
+                      arms: List[Arm],
+                      max_pulls: int,
+                      random_seed: Optional[int] = None):
+  """Write a reward tape
+
+  The tape is a `.npy` file of shape `(arm_num, max_pulls)` whose row `i` is
+  the reward sequence of arm `i`. Each arm draws its rewards from its own
+  generator spawned from the :class:`numpy.random.SeedSequence` of
+  `random_seed`, in blocks of :data:`TAPE_BLOCK_SIZE` rewards written through
+  a memory map, so tapes larger than the memory can be written.
+
+  Args:
+    filename: file used to store the tape
+    arms: arms whose rewards are drawn
+    max_pulls: number of rewards of each arm
+    random_seed: random seed of the tape. `None` means fresh entropy is drawn
+      from the operating system.
+  """
+  if max_pulls < 1:
+    raise Exception('Maximum number of pulls %d is less than 1!' % max_pulls)
+  tape = np.lib.format.open_memmap(filename,
+                                   mode='w+',
+                                   dtype=np.float64,
+                                   shape=(len(arms), max_pulls))
+  seed_sequences = np.random.SeedSequence(random_seed).spawn(len(arms))
+  for (arm_id, (arm, seed_sequence)) in enumerate(zip(arms, seed_sequences)):
+    random_state = np.random.default_rng(seed_sequence)
+    for start in range(0, max_pulls, TAPE_BLOCK_SIZE):
+      size = min(TAPE_BLOCK_SIZE, max_pulls - start)
+      tape[arm_id, start:start + size] = arm.pull(pulls=size,
+                                                  random_state=random_state)
+  tape.flush()
+  del tape
+
+
+def load_reward_tape(filename: str,
+                     means: Optional[List[float]] = None) -> List['TapeArm']:
+  """Load the arms of a reward tape
+
+  Args:
+    filename: file of the tape written by :func:`write_reward_tape`
+    means: mean of rewards of each arm. `None` means the means of the rewards
+      on the tape are used.
+
+  Returns:
+    one :class:`TapeArm` per row of the tape
+  """
+  arm_num = np.load(filename, mmap_mode='r').shape[0]
+  if means is not None and len(means) != arm_num:
+    raise Exception('Number of means %d does not equal to number of arms %d!' %
+                    (len(means), arm_num))
+  return [
+      TapeArm(filename,
+              arm_id,
+              mean=None if means is None else means[arm_id])
+      for arm_id in range(arm_num)
+  ]
+
+
+class TapeArm(Arm):
+  """Arm replaying the rewards of a reward tape
+
+  The `i`-th pull after :func:`reset` gets the `i`-th reward of the arm's row
+  of the tape, so every learner playing with the tape sees the same rewards
+  and no random numbers are drawn. The tape is memory-mapped read-only and is
+  not pickled with the arm. It is mapped again when the arm is first pulled in
+  a worker, so the workers share the pages of the file through the page cache
+  of the operating system.
+
+  .. warning::
+    Pulls of all the trials simulated in lockstep would be read from the same
+    cursor, so the arm is rejected by
+    :class:`banditpylib.protocols.LockstepProtocol`.
+  """
+  def __init__(self,
+               filename: str,
+               arm_id: int,
+               mean: Optional[float] = None,
+               name: str = None):
+    """
+    Args:
+      filename: file of the tape written by :func:`write_reward_tape`
+      arm_id: row of the arm in the tape
+      mean: mean of rewards. `None` means the mean of the rewards on the tape
+        is used.
+      name: alias name
+    """
+    super().__init__(name)
+    self.__filename = filename
+    self.__arm_id = arm_id
+    self.__tape: Optional[np.ndarray] = None
+    if arm_id not in range(self.__rewards().shape[0]):
+      raise Exception('Arm id %d is out of range [0, %d)!' %
+                      (arm_id, self.__rewards().shape[0]))
+    self.__mean = float(
+        np.mean(self.__rewards()[arm_id])) if mean is None else mean
+    # position of the next reward on the tape
+    self.__cursor = 0
+
+  def _name(self) -> str:
+    """
+    Returns:
+      default arm name
+    """
+    return 'tape_arm'
+
+  def __rewards(self) -> np.ndarray:
+    """
+    Returns:
+      the memory-mapped tape, which is mapped when it is first used
+    """
+    if self.__tape is None:
+      self.__tape = np.load(self.__filename, mmap_mode='r')
+    return self.__tape
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    # the tape is mapped again by the process unpickling the arm
+    state['_TapeArm__tape'] = None
+    return state
+
+  @property
+  def mean(self) -> float:
+    """mean of rewards"""
+    return self.__mean
+
+  def max_pulls(self) -> int:
+    """
+    Returns:
+      number of rewards of the arm on the tape
+    """
+    return self.__rewards().shape[1]
+
+  def reset(self):
+    """Rewind the tape"""
+    self.__cursor = 0
+
+  def remaining_pulls(self) -> int:
+    """
+    Returns:
+      number of rewards left on the tape
+    """
+    return self.max_pulls() - self.__cursor
+
+  def pull(self,
+           pulls: int = 1,
+           random_state: np.random.RandomState = None) -> np.ndarray:
+    """Pull the arm
+
+    Args:
+      pulls: number of times to pull
+      random_state: ignored since the rewards are read from the tape
+
+    Returns:
+      the next `pulls` rewards on the tape
+    """
+    del random_state
+    if self.__cursor + pulls > self.max_pulls():
+      raise Exception('Tape of arm %d runs out after %d pulls!' %
+                      (self.__arm_id, self.max_pulls()))
+    rewards = np.array(self.__rewards()[self.__arm_id,
+                                        self.__cursor:self.__cursor + pulls])
+    self.__cursor += pulls
+    return rewards
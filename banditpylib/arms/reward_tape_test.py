@@ -0,0 +1,49 @@
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pytest
+
+from .bernoulli_arm import BernoulliArm
+from .reward_tape import TapeArm, load_reward_tape, write_reward_tape
+
+
+class TestRewardTape:
+  """Test reward tape"""
+
+  def test_write_and_replay(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'tape.npy')
+    arms = [BernoulliArm(mean) for mean in [0, 1, 0.5]]
+    write_reward_tape(filename, arms, max_pulls=100, random_seed=7)
+    tape = np.load(filename)
+    assert tape.shape == (3, 100)
+    assert np.all(tape[0] == 0) and np.all(tape[1] == 1)
+
+    tape_arms = load_reward_tape(filename, means=[0, 1, 0.5])
+    assert tape_arms[2].mean == 0.5
+    assert np.array_equal(
+        np.concatenate([tape_arms[2].pull(30), tape_arms[2].pull(20)]),
+        tape[2, :50])
+    tape_arms[2].reset()
+    assert np.array_equal(tape_arms[2].pull(10), tape[2, :10])
+    with pytest.raises(Exception):
+      tape_arms[2].pull(91)
+
+    # the same seed gives the same tape
+    write_reward_tape(filename, arms, max_pulls=100, random_seed=7)
+    assert np.array_equal(np.load(filename), tape)
+
+  def test_pickle(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'tape.npy')
+    write_reward_tape(filename, [BernoulliArm(0.5)] * 2, max_pulls=10**5)
+    tape_arm = TapeArm(filename, 1)
+    assert abs(tape_arm.mean - 0.5) < 0.01
+    tape_arm.pull(5)
+    # the tape is not pickled with the arm
+    payload = pickle.dumps(tape_arm)
+    assert len(payload) < 1000
+    unpickled_arm = pickle.loads(payload)
+    assert np.array_equal(unpickled_arm.pull(5), tape_arm.pull(5))
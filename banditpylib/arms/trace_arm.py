@@ -0,0 +1,252 @@
+import csv
+import os
+from typing import Optional, Union
+
+import numpy as np
+
+from .reward_statistics import RewardStatistics
+from .utils import Arm
+
+# number of rewards read from the trace at a time
+TRACE_BLOCK_SIZE = 1 << 16
+
+
+def _csv_rows(filename: str, column: Union[int, str]):
+  """Read the rewards of a CSV file row by row
+
+  Args:
+    filename: CSV file
+    column: index of the column or its name in the header
+
+  Returns:
+    generator of the rewards
+  """
+  with open(filename, 'r', newline='') as f:
+    reader = csv.reader(f)
+    if isinstance(column, str):
+      header = next(reader)
+      if column not in header:
+        raise Exception('Column %s is not in %s!' % (column, filename))
+      column = header.index(column)
+    for row in reader:
+      if not row:
+        continue
+      try:
+        yield float(row[column])
+      except (IndexError, ValueError) as error:
+        raise Exception('Line %d of %s has no reward in column %d!' %
+                        (reader.line_num, filename, column)) from error
+
+
+def convert_trace(filename: str,
+                  column: Union[int, str] = 0,
+                  output_filename: Optional[str] = None) -> str:
+  """Convert a column of a CSV log to a `.npy` trace
+
+  The log is read twice, once to count the rewards and once to write them in
+  blocks of :data:`TRACE_BLOCK_SIZE` through a memory map, so the memory
+  footprint does not depend on the size of the log. The conversion is skipped
+  if the output is newer than the log.
+
+  Args:
+    filename: CSV log
+    column: index of the column or its name in the header
+    output_filename: file used to store the trace. `None` means
+      `<filename>.<column>.npy`.
+
+  Returns:
+    file of the trace
+  """
+  if output_filename is None:
+    output_filename = '%s.%s.npy' % (filename, column)
+  if os.path.exists(output_filename) and \
+      os.path.getmtime(output_filename) >= os.path.getmtime(filename):
+    return output_filename
+  rewards_num = sum(1 for _ in _csv_rows(filename, column))
+  if rewards_num == 0:
+    raise Exception('No reward is found in %s!' % filename)
+  # write to a temporary file first so that a half written trace is never used
+  temp_filename = output_filename + '.tmp.npy'
+  trace = np.lib.format.open_memmap(temp_filename,
+                                    mode='w+',
+                                    dtype=np.float64,
+                                    shape=(rewards_num,))
+  block = np.empty(TRACE_BLOCK_SIZE)
+  (start, size) = (0, 0)
+  for reward in _csv_rows(filename, column):
+    block[size] = reward
+    size += 1
+    if size == TRACE_BLOCK_SIZE:
+      trace[start:start + size] = block
+      (start, size) = (start + size, 0)
+  trace[start:start + size] = block[:size]
+  trace.flush()
+  del trace
+  os.replace(temp_filename, output_filename)
+  return output_filename
+
+
+class TraceArm(Arm):
+  """Arm drawing rewards from a logged trace
+
+  The trace is a one-dimensional `.npy` file of rewards or a column of a CSV
+  log, which is converted to a `.npy` file by :func:`convert_trace` first. The
+  trace is memory-mapped read-only and read in blocks of
+  :data:`TRACE_BLOCK_SIZE` rewards, so the memory footprint of the arm does not
+  depend on the size of the trace. As :class:`TapeArm`, the trace is not
+  pickled with the arm and is mapped again by the workers.
+
+  In `bootstrap` mode, each pull gets a reward drawn from the trace uniformly
+  with replacement. In `replay` mode, pulls get the rewards of the trace in
+  order from the start of the trace after each :func:`reset`.
+  """
+  def __init__(self,
+               filename: str,
+               mode: str = 'bootstrap',
+               column: Union[int, str] = 0,
+               name: str = None):
+    """
+    Args:
+      filename: `.npy` trace or CSV log
+      mode: `bootstrap` or `replay`
+      column: index of the column or its name in the header of the CSV log
+      name: alias name
+    """
+    super().__init__(name)
+    if mode not in ['bootstrap', 'replay']:
+      raise Exception('Mode %s is not supported!' % mode)
+    self.__mode = mode
+    self.__filename = filename if filename.endswith('.npy') else \
+        convert_trace(filename, column)
+    self.__trace: Optional[np.ndarray] = None
+    rewards = self.__rewards()
+    if rewards.ndim != 1:
+      raise Exception('Trace %s is not one-dimensional!' % self.__filename)
+    if len(rewards) == 0:
+      raise Exception('Trace %s is empty!' % self.__filename)
+    total = 0.0
+    for start in range(0, len(rewards), TRACE_BLOCK_SIZE):
+      total += float(np.sum(rewards[start:start + TRACE_BLOCK_SIZE]))
+    self.__mean = total / len(rewards)
+    # position of the next reward in `replay` mode
+    self.__cursor = 0
+
+  def _name(self) -> str:
+    """
+    Returns:
+      default arm name
+    """
+    return 'trace_arm'
+
+  def __rewards(self) -> np.ndarray:
+    """
+    Returns:
+      the memory-mapped trace, which is mapped when it is first used
+    """
+    if self.__trace is None:
+      self.__trace = np.load(self.__filename, mmap_mode='r')
+    return self.__trace
+
+  def __getstate__(self):
+    state = self.__dict__.copy()
+    # the trace is mapped again by the process unpickling the arm
+    state['_TraceArm__trace'] = None
+    return state
+
+  @property
+  def mean(self) -> float:
+    """mean of rewards in the trace"""
+    return self.__mean
+
+  @property
+  def mode(self) -> str:
+    """`bootstrap` or `replay`"""
+    return self.__mode
+
+  def trace_length(self) -> int:
+    """
+    Returns:
+      number of rewards in the trace
+    """
+    return len(self.__rewards())
+
+  def reset(self):
+    """Rewind the trace"""
+    self.__cursor = 0
+
+  def remaining_pulls(self) -> Optional[int]:
+    """
+    Returns:
+      number of rewards left in the trace in `replay` mode. `None` in
+      `bootstrap` mode.
+    """
+    if self.__mode == 'bootstrap':
+      return None
+    return self.trace_length() - self.__cursor
+
+  def __read(self, pulls: int, random_state) -> np.ndarray:
+    """Read the rewards of the next pulls
+
+    Args:
+      pulls: number of times to pull
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the rewards in `bootstrap` mode
+
+    Returns:
+      rewards
+    """
+    if self.__mode == 'bootstrap':
+      indexes = (np.random if random_state is None else random_state).choice(
+          self.trace_length(), pulls)
+      return np.array(self.__rewards()[indexes])
+    if self.__cursor + pulls > self.trace_length():
+      raise Exception('Trace %s runs out after %d pulls!' %
+                      (self.__filename, self.trace_length()))
+    rewards = np.array(self.__rewards()[self.__cursor:self.__cursor + pulls])
+    self.__cursor += pulls
+    return rewards
+
+  def pull(self,
+           pulls: int = 1,
+           random_state: np.random.RandomState = None) -> np.ndarray:
+    """Pull the arm
+
+    Args:
+      pulls: number of times to pull
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the rewards in `bootstrap` mode. The global random state of numpy
+        is used if it is `None`.
+
+    Returns:
+      stochastic rewards
+    """
+    return self.__read(pulls, random_state)
+
+  def pull_stats(self,
+                 pulls: int = 1,
+                 random_state: np.random.RandomState = None) -> \
+      RewardStatistics:
+    """Pull the arm and only keep the sufficient statistics of the rewards
+
+    Rewards are read in blocks, so the memory footprint does not depend on
+    `pulls`.
+
+    Args:
+      pulls: number of times to pull
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the rewards in `bootstrap` mode. The global random state of numpy
+        is used if it is `None`.
+
+    Returns:
+      statistics of the rewards
+    """
+    if self.__mode == 'replay' and \
+        self.__cursor + pulls > self.trace_length():
+      raise Exception('Trace %s runs out after %d pulls!' %
+                      (self.__filename, self.trace_length()))
+    (total, sum_of_squares) = (0.0, 0.0)
+    for start in range(0, pulls, TRACE_BLOCK_SIZE):
+      rewards = self.__read(min(TRACE_BLOCK_SIZE, pulls - start), random_state)
+      total += float(np.sum(rewards))
+      sum_of_squares += float(np.sum(rewards**2))
+    return RewardStatistics(pulls, total, sum_of_squares)
@@ -0,0 +1,67 @@
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pytest
+
+from banditpylib.bandits import OrdinaryBandit
+from .trace_arm import TraceArm, convert_trace
+
+
+class TestTraceArm:
+  """Test trace arm"""
+
+  def test_csv_replay(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'log.csv')
+    with open(filename, 'w') as f:
+      f.write('user,click\n')
+      for row in range(10):
+        f.write('%d,%d\n' % (row, row % 3 == 0))
+    trace_arm = TraceArm(filename, mode='replay', column='click')
+    assert trace_arm.trace_length() == 10
+    assert trace_arm.mean == 0.4
+    assert list(trace_arm.pull(4)) == [1, 0, 0, 1]
+    trace_arm.reset()
+    stats = trace_arm.pull_stats(10)
+    assert (stats.count, stats.total, stats.sum_of_squares) == (10, 4, 4)
+    # the converted trace is reused
+    assert convert_trace(filename, 'click') == filename + '.click.npy'
+
+    # the trace is not pickled with the arm
+    trace_arm.reset()
+    trace_arm.pull(2)
+    unpickled_arm = pickle.loads(pickle.dumps(trace_arm))
+    assert list(unpickled_arm.pull(2)) == [0, 1]
+
+  def test_npy_bootstrap(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'trace.npy')
+    np.save(filename, np.array([0.0, 2.0]))
+    trace_arm = TraceArm(filename)
+    rewards = trace_arm.pull(10000)
+    assert set(rewards) == {0, 2}
+    assert abs(rewards.mean() - trace_arm.mean) < 0.1
+    # the same generator gives the same rewards
+    assert np.array_equal(trace_arm.pull(10, np.random.default_rng(0)),
+                          trace_arm.pull(10, np.random.default_rng(0)))
+    stats = trace_arm.pull_stats(10**6)
+    assert abs(stats.total / stats.count - 1) < 0.01
+
+  def test_replay_with_common_random_numbers(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'trace.npy')
+    # the trace is shorter than a block of a reward stream
+    np.save(filename, np.arange(10.0))
+    ordinary_bandit = OrdinaryBandit(
+        [TraceArm(filename, mode='replay'),
+         TraceArm(filename, mode='replay')])
+    ordinary_bandit.set_common_random_numbers(0)
+    for _ in range(2):
+      ordinary_bandit.reset()
+      feedback = ordinary_bandit.feed([(0, 4), (0, 6)])
+      assert [list(rewards) for (rewards, _) in feedback] == \
+          [[0, 1, 2, 3], [4, 5, 6, 7, 8, 9]]
+    with pytest.raises(Exception, match='runs out'):
+      ordinary_bandit.feed([(0, 1)])
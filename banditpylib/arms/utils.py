@@ -4,6 +4,8 @@ from typing import Optional
 
 import numpy as np
 
+from .reward_statistics import RewardStatistics
+
 
 class Arm(ABC):
   """Arm"""
@@ -32,13 +34,55 @@ class Arm(ABC):
   def mean(self) -> float:
     """mean of rewards"""
 
+  def reset(self):
+    """Reset the arm
+
+    It is called by the bandit environments when they are reset. Arms with
+    no state do nothing.
+    """
+
+  def remaining_pulls(self) -> Optional[int]:
+    """
+    Returns:
+      number of pulls left before the rewards of the arm run out. `None`
+      means the rewards never run out.
+    """
+    return None
+
   @abstractmethod
-  def pull(self, pulls: int = 1) -> np.ndarray:
+  def pull(self,
+           pulls: int = 1,
+           random_state: np.random.RandomState = None) -> np.ndarray:
     """Pull the arm
 
     Args:
       pulls: number of times to pull
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
 
     Returns:
       rewards
     """
+
+  def pull_stats(self,
+                 pulls: int = 1,
+                 random_state: np.random.RandomState = None) -> \
+      RewardStatistics:
+    """Pull the arm and only keep the sufficient statistics of the rewards
+
+    By default, the rewards are drawn by :func:`pull` and aggregated. Arms
+    whose statistics have closed-form distributions override it to draw them
+    in constant time and memory.
+
+    Args:
+      pulls: number of times to pull
+      random_state: random state or :class:`numpy.random.Generator` used to
+        generate the rewards. The global random state of numpy is used if it
+        is `None`.
+
+    Returns:
+      statistics of the rewards
+    """
+    return RewardStatistics.from_rewards(
+        self.pull(pulls=pulls, random_state=random_state))
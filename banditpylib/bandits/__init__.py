@@ -4,6 +4,7 @@ from .ordinary_bandit_itf import *
 from .ordinary_mnl_bandit import *
 from .linear_bandit import *
 from .linear_bandit_itf import *
+from .async_bandit import *
 
 
 __all__ = [
@@ -18,4 +19,6 @@ __all__ = [
     'search_best_assortment',
     'local_search_best_assortment',
     'OrdinaryMNLBandit',
+    'AsyncBandit',
+    'SimulatedLatencyBandit',
 ]
@@ -0,0 +1,224 @@
+from abc import ABC, abstractmethod
+import asyncio
+import random
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from banditpylib.learners import Goal
+from .utils import Bandit
+
+
+class AsyncBandit(ABC):
+  """Asynchronous bandit environment
+
+  It provides the same interfaces as :class:`Bandit` except that :func:`feed`
+  is a coroutine, so that other trials can go on while the environment is
+  executing the actions e.g., when the environment is a remote system.
+  """
+  def __init__(self, name: Optional[str]):
+    """
+    Args:
+      name: alias name for the bandit environment
+    """
+    self.__name = self._name() if name is None else name
+    self.__rng: Optional[np.random.Generator] = None
+
+  @property
+  def name(self) -> str:
+    """bandit name"""
+    return self.__name
+
+  def set_rng(self, rng: Optional[np.random.Generator]):
+    """Set the random number generator of the bandit environment
+
+    See :func:`Bandit.set_rng` for details.
+
+    Args:
+      rng: random number generator used to draw the rewards. `None` means the
+        global random state of numpy is used.
+    """
+    self.__rng = rng
+
+  @property
+  def rng(self):
+    """random number generator of the bandit environment, which is
+    :mod:`numpy.random` if no generator is set"""
+    return np.random if self.__rng is None else self.__rng
+
+  @abstractmethod
+  def _name(self) -> str:
+    """
+    Returns:
+      default bandit name
+    """
+
+  @property
+  @abstractmethod
+  def interface(self) -> type:
+    """synchronous bandit environment this environment behaves as, which
+    should be a subclass of the running environments of the learners"""
+
+  @abstractmethod
+  def reset(self):
+    """Reset the bandit environment
+
+    .. warning::
+      This function should be called before the start of the game.
+    """
+
+  def set_common_random_numbers(
+      self, random_seed: Optional[Union[int, List[int]]]):
+    """Set the seed of common random numbers
+
+    See :func:`Bandit.set_common_random_numbers` for details.
+
+    Args:
+      random_seed: random seed of the reward streams. It can also be a list
+        of integers. `None` means rewards are drawn from the global random
+        state of numpy.
+    """
+    if random_seed is not None:
+      raise Exception('%s does not support common random numbers!' %
+                      self.name)
+
+  @abstractmethod
+  def context(self) -> Any:
+    """
+    Returns:
+      current state of the bandit environment
+    """
+
+  @abstractmethod
+  async def feed(self, actions: List[Tuple[Any, int]]) -> \
+      Optional[List[Tuple[Any, Any]]]:
+    """
+    Args:
+      actions: actions for the bandit environment to execute
+
+    Returns:
+      feedback after `actions` are executed
+    """
+
+  @abstractmethod
+  def regret(self, goal: Goal) -> float:
+    """
+    Args:
+      goal: goal of the learner
+
+    Returns:
+      regret of the learner
+    """
+
+
+class SimulatedLatencyBandit(AsyncBandit):
+  """Bandit environment with simulated latency
+
+  It wraps a synchronous bandit environment and returns the feedback of
+  :func:`feed` after `latency` seconds plus a jitter drawn uniformly from
+  `[0, jitter]`. The actions are executed by the wrapped environment before
+  waiting, so the feedback is the same as the one of the wrapped environment.
+  It is a local stand-in for remote environments.
+  """
+  def __init__(self,
+               bandit: Bandit,
+               latency: float,
+               jitter: float = 0.0,
+               name: str = None):
+    """
+    Args:
+      bandit: bandit environment to wrap
+      latency: seconds to wait before returning the feedback
+      jitter: maximum extra seconds to wait
+      name: alias name
+    """
+    if latency < 0:
+      raise Exception('Latency %.2f is negative!' % latency)
+    if jitter < 0:
+      raise Exception('Jitter %.2f is negative!' % jitter)
+    self.__bandit = bandit
+    self.__latency = latency
+    self.__jitter = jitter
+    super().__init__(name)
+
+  def _name(self) -> str:
+    """
+    Returns:
+      default bandit name
+    """
+    return 'simulated_latency_%s' % self.__bandit.name
+
+  @property
+  def bandit(self) -> Bandit:
+    """bandit environment wrapped"""
+    return self.__bandit
+
+  @property
+  def interface(self) -> type:
+    """synchronous bandit environment this environment behaves as"""
+    return type(self.__bandit)
+
+  def reset(self):
+    """Reset the bandit environment
+
+    .. warning::
+      This function should be called before the start of the game.
+    """
+    self.__bandit.reset()
+
+  def set_common_random_numbers(
+      self, random_seed: Optional[Union[int, List[int]]]):
+    """Set the seed of common random numbers of the wrapped environment
+
+    Args:
+      random_seed: random seed of the reward streams. It can also be a list
+        of integers. `None` means rewards are drawn from the global random
+        state of numpy.
+    """
+    self.__bandit.set_common_random_numbers(random_seed)
+
+  def set_rng(self, rng: Optional[np.random.Generator]):
+    """Set the random number generator of the wrapped environment
+
+    Args:
+      rng: random number generator used to draw the rewards. `None` means the
+        global random state of numpy is used.
+    """
+    self.__bandit.set_rng(rng)
+
+  @property
+  def rng(self):
+    """random number generator of the wrapped environment"""
+    return self.__bandit.rng
+
+  def context(self) -> Any:
+    """
+    Returns:
+      current state of the bandit environment
+    """
+    return self.__bandit.context()
+
+  async def feed(self, actions: List[Tuple[Any, int]]) -> \
+      Optional[List[Tuple[Any, Any]]]:
+    """
+    Args:
+      actions: actions for the bandit environment to execute
+
+    Returns:
+      feedback after `actions` are executed
+    """
+    feedback = self.__bandit.feed(actions)
+    # the jitter is drawn from the random module of python so that it does not
+    # change the random numbers of numpy
+    await asyncio.sleep(self.__latency + random.uniform(0, self.__jitter))
+    return feedback
+
+  def regret(self, goal: Goal) -> float:
+    """
+    Args:
+      goal: goal of the learner
+
+    Returns:
+      regret of the learner
+    """
+    return self.__bandit.regret(goal)
@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+import numpy as np
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.learners import MaxReward
+from .async_bandit import SimulatedLatencyBandit
+from .ordinary_bandit import OrdinaryBandit
+
+
+class TestSimulatedLatencyBandit:
+  """Test simulated latency bandit"""
+
+  def test_feed(self):
+    means = [0, 1]
+    arms = [BernoulliArm(mean) for mean in means]
+    bandit = SimulatedLatencyBandit(OrdinaryBandit(arms), latency=0.05)
+    assert bandit.name == 'simulated_latency_ordinary_bandit'
+    assert bandit.interface is OrdinaryBandit
+    bandit.reset()
+
+    async def feed_all():
+      return await asyncio.gather(
+          *[bandit.feed([(0, 10)]) for _ in range(10)])
+
+    loop = asyncio.new_event_loop()
+    start_time = time.perf_counter()
+    try:
+      feedback = loop.run_until_complete(feed_all())
+    finally:
+      loop.close()
+    # the feeds wait at the same time
+    assert time.perf_counter() - start_time < 0.05 * 5
+    assert len(feedback) == 10
+    assert np.all(feedback[0][0][0] == 0)
+    assert bandit.regret(MaxReward()) == 100
@@ -71,9 +71,9 @@ class LinearBandit(OrdinaryBanditItf, LinearBanditItf):
     if arm_id not in range(self.__arm_num):
       raise Exception('Arm id %d is out of range [0, %d)!' % \
           (arm_id, self.__arm_num))
-    em_rewards = self.__arms[arm_id].pull(pulls)
+    em_rewards = self.__arms[arm_id].pull(pulls, random_state=self.rng)
     if em_rewards is not None:
-      self.__regret += (self.__best_arm.mean * pulls - em_rewards)
+      self.__regret += (self.__best_arm.mean * pulls - sum(em_rewards))
       self.__total_pulls += pulls
     return (em_rewards, None)
 
@@ -1,8 +1,8 @@
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 
 import numpy as np
 
-from banditpylib.arms import Arm
+from banditpylib.arms import Arm, ArmBank, RewardStatistics, RewardStream
 from banditpylib.learners import Goal, BestArmId, MaxReward
 from .ordinary_bandit_itf import OrdinaryBanditItf
 
@@ -13,24 +13,49 @@ class OrdinaryBandit(OrdinaryBanditItf):
   Arms are indexed from 0 by default. Each pull of arm :math:`i` will generate
   an `i.i.d.` reward from distribution :math:`\mathcal{D}_i`, which is unknown
   beforehand.
+
+  Arms can be given as a list of arms or as a
+  :class:`banditpylib.arms.ArmBank`. With an arm bank, the rewards of all the
+  actions passed to :func:`feed` are drawn in one vectorized call.
+
+  When `sufficient_statistics` is set, the feedback of an action is a
+  :class:`banditpylib.arms.RewardStatistics` instead of the array of rewards.
+  Statistics of Bernoulli and Gaussian arms are drawn in constant time and
+  memory, which suits learners asking for a huge number of pulls at a time
+  e.g., the fixed-budget best arm identification learners.
   """
 
-  def __init__(self, arms: List[Arm], name: str = None):
+  def __init__(self,
+               arms: Union[List[Arm], ArmBank],
+               name: str = None,
+               sufficient_statistics: bool = False):
     """
     Args:
       arms: arms in ordinary bandit
       name: alias name
+      sufficient_statistics: whether to return the sufficient statistics of
+        the rewards instead of the rewards
     """
     super().__init__(name)
     if len(arms) < 2:
       raise Exception('The number of arms %d is less than 2!' % len(arms))
-    self.__arms = arms
+    if isinstance(arms, ArmBank):
+      self.__arms: List[Arm] = []
+      self.__arm_bank: Optional[ArmBank] = arms
+      means = arms.means
+    else:
+      self.__arms = arms
+      self.__arm_bank = None
+      means = np.array([arm.mean for arm in arms])
     self.__arm_num = len(arms)
+    self.__sufficient_statistics = sufficient_statistics
     # find the best arm
-    self.__best_arm_id = max(
-        [(arm_id, arm.mean) for (arm_id, arm) in enumerate(self.__arms)],
-        key=lambda x: x[1])[0]
-    self.__best_arm = self.__arms[self.__best_arm_id]
+    self.__best_arm_id = int(np.argmax(means))
+    self.__best_mean = float(means[self.__best_arm_id])
+    # seed of common random numbers
+    self.__common_random_seed: Optional[List[int]] = None
+    # reward streams of the arms pulled when common random numbers are used
+    self.__reward_streams: Optional[Dict[int, RewardStream]] = None
 
   def _name(self) -> str:
     """
@@ -40,7 +65,7 @@ class OrdinaryBandit(OrdinaryBanditItf):
     return 'ordinary_bandit'
 
   def _take_action(self, arm_id: int, pulls: int) -> \
-      Optional[Tuple[np.ndarray, None]]:
+      Optional[Tuple[Union[np.ndarray, RewardStatistics], None]]:
     """Pull one arm
 
     Args:
@@ -49,21 +74,36 @@ class OrdinaryBandit(OrdinaryBanditItf):
 
     Returns:
       stochastic rewards after `arm_id` is pulled. The first element is the
-        stochstic rewards. `None` is returned if `pulls` is less than 1.
+        stochstic rewards or their statistics. `None` is returned if `pulls`
+        is less than 1.
     """
     if arm_id not in range(self.__arm_num):
       raise Exception('Arm id %d is out of range [0, %d)!' % \
           (arm_id, self.__arm_num))
     if pulls < 1:
       return None
+    if self.__sufficient_statistics:
+      if self.__reward_streams is None:
+        stats = self.__arms[arm_id].pull_stats(pulls=pulls,
+                                               random_state=self.rng)
+      else:
+        # rewards of the streams are still drawn one by one so that they are
+        # the same as the ones without statistics
+        stats = RewardStatistics.from_rewards(
+            self.__reward_stream(arm_id).pull(pulls=pulls))
+      self.__regret += (self.__best_mean * pulls - stats.total)
+      self.__total_pulls += pulls
+      return (stats, None)
     # empirical rewards when `arm_id` is pulled for `pulls` times
-    em_rewards = self.__arms[arm_id].pull(pulls=pulls)
-    self.__regret += (self.__best_arm.mean * pulls - sum(em_rewards))
+    em_rewards = self.__arms[arm_id].pull(pulls=pulls, random_state=self.rng) \
+        if self.__reward_streams is None else \
+        self.__reward_stream(arm_id).pull(pulls=pulls)
+    self.__regret += (self.__best_mean * pulls - np.sum(em_rewards))
     self.__total_pulls += pulls
     return (em_rewards, None)
 
   def feed(self, actions: List[Tuple[int, int]]) -> \
-      List[Tuple[np.ndarray, None]]:
+      List[Tuple[Union[np.ndarray, RewardStatistics], None]]:
     """Pull multiple arms
 
     Args:
@@ -72,8 +112,10 @@ class OrdinaryBandit(OrdinaryBanditItf):
 
     Returns:
       feedback after arms are pulled. For each tuple, the first element is
-        the stochstic rewards.
+        the stochstic rewards or their statistics.
     """
+    if self.__arm_bank is not None and self.__reward_streams is None:
+      return self.__feed_arm_bank(actions)
     feedback = []
     for (arm_id, pulls) in actions:
       stochastic_rewards = self._take_action(arm_id=arm_id, pulls=pulls)
@@ -81,6 +123,66 @@ class OrdinaryBandit(OrdinaryBanditItf):
         feedback.append(stochastic_rewards)
     return feedback
 
+  def __reward_stream(self, arm_id: int) -> RewardStream:
+    """
+    Args:
+      arm_id: arm id
+
+    Returns:
+      reward stream of the arm when common random numbers are used
+    """
+    if arm_id not in self.__reward_streams:
+      # each arm gets its own stream so that the rewards of an arm do not
+      # depend on the pulls of the other arms
+      arm = self.__arms[arm_id] if self.__arm_bank is None else \
+          self.__arm_bank.arm(arm_id)
+      self.__reward_streams[arm_id] = RewardStream(
+          arm, random_seed=self.__common_random_seed + [arm_id])
+    return self.__reward_streams[arm_id]
+
+  def __check_arm_ids(self, arm_ids: np.ndarray):
+    """Check arm ids are in range
+
+    Args:
+      arm_ids: arm ids
+    """
+    out_of_range = (arm_ids < 0) | (arm_ids >= self.__arm_num)
+    if np.any(out_of_range):
+      raise Exception('Arm id %d is out of range [0, %d)!' % \
+          (arm_ids[out_of_range][0], self.__arm_num))
+
+  def __feed_arm_bank(self, actions: List[Tuple[int, int]]) -> \
+      List[Tuple[Union[np.ndarray, RewardStatistics], None]]:
+    """Pull multiple arms of the arm bank in one draw
+
+    Args:
+      actions: for each tuple, the first element is the arm id and the
+        second element is the pull times
+
+    Returns:
+      feedback after arms are pulled
+    """
+    arm_ids = np.array([arm_id for (arm_id, _) in actions], dtype=np.int64)
+    pulls = np.array([pulls for (_, pulls) in actions], dtype=np.int64)
+    self.__check_arm_ids(arm_ids)
+    # actions with no pulls get no feedback
+    pulled = pulls >= 1
+    if not np.any(pulled):
+      return []
+    (arm_ids, pulls) = (arm_ids[pulled], pulls[pulled])
+    total_pulls = int(pulls.sum())
+    if self.__sufficient_statistics:
+      stats = self.__arm_bank.pull_stats(arm_ids, pulls, self.rng)
+      self.__regret += (self.__best_mean * total_pulls -
+                        sum(arm_stats.total for arm_stats in stats))
+      self.__total_pulls += total_pulls
+      return [(arm_stats, None) for arm_stats in stats]
+    rewards = self.__arm_bank.sample(np.repeat(arm_ids, pulls), self.rng)
+    self.__regret += (self.__best_mean * total_pulls - np.sum(rewards))
+    self.__total_pulls += total_pulls
+    return [(arm_rewards, None)
+            for arm_rewards in np.split(rewards, np.cumsum(pulls)[:-1])]
+
   def reset(self):
     """Reset the bandit environment
 
@@ -89,6 +191,79 @@ class OrdinaryBandit(OrdinaryBanditItf):
     """
     self.__total_pulls = 0
     self.__regret = 0.0
+    for arm in self.__arms:
+      arm.reset()
+    # streams are created when the arms are first pulled
+    self.__reward_streams = None if self.__common_random_seed is None else {}
+
+  def set_common_random_numbers(
+      self, random_seed: Optional[Union[int, List[int]]]):
+    """Set the seed of common random numbers
+
+    With common random numbers, the `i`-th pull of an arm always gets the same
+    reward given the same `random_seed`. It takes effect from the next
+    :func:`reset`.
+
+    Args:
+      random_seed: random seed of the reward streams. It can also be a list
+        of integers. `None` means rewards are drawn from the global random
+        state of numpy.
+    """
+    self.__common_random_seed = None if random_seed is None else \
+        np.atleast_1d(random_seed).tolist()
+
+  def lockstep_reset(self, trials: int):
+    """Reset the bandit environment for lockstep simulation
+
+    Args:
+      trials: number of trials simulated in lockstep
+
+    Arms whose rewards run out, e.g., the ones replaying a tape or a trace, are
+    not supported since the trials simulated in lockstep would share the
+    rewards of one arm.
+
+    .. warning::
+      This function should be called before the start of the lockstep game.
+    """
+    for arm in self.__arms:
+      arm.reset()
+      if arm.remaining_pulls() is not None:
+        raise Exception(
+            'Arm %s with finite rewards can not be simulated in lockstep!' %
+            arm.name)
+    self.__lockstep_regret = np.zeros(trials)
+
+  def lockstep_feed(self, arm_ids: np.ndarray) -> np.ndarray:
+    """Pull one arm in each of the trials simulated in lockstep
+
+    Args:
+      arm_ids: arm to pull in each trial
+
+    Returns:
+      stochastic reward obtained in each trial
+    """
+    if self.__arm_bank is not None:
+      self.__check_arm_ids(arm_ids)
+      rewards = self.__arm_bank.sample(arm_ids, self.rng)
+    else:
+      rewards = np.empty(len(arm_ids))
+      # draw rewards of the same arm in one go
+      for arm_id in np.unique(arm_ids):
+        if arm_id not in range(self.__arm_num):
+          raise Exception('Arm id %d is out of range [0, %d)!' % \
+              (arm_id, self.__arm_num))
+        trial_ids = np.flatnonzero(arm_ids == arm_id)
+        rewards[trial_ids] = self.__arms[arm_id].pull(pulls=len(trial_ids),
+                                                      random_state=self.rng)
+    self.__lockstep_regret += (self.__best_mean - rewards)
+    return rewards
+
+  def lockstep_regret(self) -> np.ndarray:
+    """
+    Returns:
+      regret of the learner in each trial simulated in lockstep
+    """
+    return self.__lockstep_regret
 
   def arm_num(self) -> int:
     """
@@ -1,5 +1,12 @@
-from banditpylib.arms import BernoulliArm
+import os
+import tempfile
+
+import numpy as np
+
+from banditpylib.arms import BernoulliArm, BernoulliArmBank, \
+    load_reward_tape, write_reward_tape
 from banditpylib.learners import MaxReward, BestArmId
+from banditpylib.learners.ordinary_fbbai_learner import SH
 from .ordinary_bandit import OrdinaryBandit
 
 
@@ -15,3 +22,79 @@ class TestOrdinaryBandit:
     ordinary_bandit.feed([(0, 100)])
     assert ordinary_bandit.regret(MaxReward()) == 100
     assert ordinary_bandit.regret(BestArmId(best_arm=1)) == 0
+
+  def test_common_random_numbers(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    ordinary_bandit.set_common_random_numbers(7)
+    ordinary_bandit.reset()
+    rewards = ordinary_bandit.feed([(0, 3), (1, 5), (0, 2)])
+    ordinary_bandit.reset()
+    # rewards of an arm do not depend on the pulls of the other arms
+    assert list(ordinary_bandit.feed([(0, 5)])[0][0]) == \
+        list(rewards[0][0]) + list(rewards[2][0])
+
+  def test_arm_bank(self):
+    arm_bank = BernoulliArmBank(np.array([0, 1, 0.5]))
+    ordinary_bandit = OrdinaryBandit(arm_bank)
+    assert ordinary_bandit.arm_num() == 3
+    ordinary_bandit.reset()
+    feedback = ordinary_bandit.feed([(0, 10), (2, 0), (1, 5)])
+    # no feedback for actions with no pulls
+    assert [list(rewards) for (rewards, _) in feedback] == [[0] * 10, [1] * 5]
+    assert ordinary_bandit.total_pulls() == 15
+    assert ordinary_bandit.regret(MaxReward()) == 10
+    assert ordinary_bandit.regret(BestArmId(best_arm=1)) == 0
+
+    # common random numbers give the same rewards as a list of arms
+    arms_bandit = OrdinaryBandit([arm_bank.arm(arm_id) for arm_id in range(3)])
+    for bandit in [ordinary_bandit, arms_bandit]:
+      bandit.set_common_random_numbers(7)
+      bandit.reset()
+    assert np.array_equal(
+        ordinary_bandit.feed([(2, 20)])[0][0],
+        arms_bandit.feed([(2, 20)])[0][0])
+
+  def test_sufficient_statistics(self):
+    means = [0.3, 0.5, 0.7]
+    for arms in [[BernoulliArm(mean) for mean in means],
+                 BernoulliArmBank(np.array(means))]:
+      ordinary_bandit = OrdinaryBandit(arms, sufficient_statistics=True)
+      ordinary_bandit.reset()
+      (stats, _) = ordinary_bandit.feed([(2, 10**8)])[0]
+      assert len(stats) == 10**8
+      assert stats.total == stats.sum_of_squares
+      assert abs(stats.total / 10**8 - 0.7) < 1e-3
+      assert ordinary_bandit.total_pulls() == 10**8
+
+      # learners consume the statistics as the rewards
+      learner = SH(arm_num=3, budget=10**8)
+      ordinary_bandit.reset()
+      learner.reset()
+      while True:
+        actions = learner.actions()
+        if actions is None:
+          break
+        learner.update(ordinary_bandit.feed(actions))
+      assert ordinary_bandit.total_pulls() <= 10**8
+      assert learner.best_arm() == 2
+
+  def test_reward_tape(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'tape.npy')
+    means = [0.3, 0.5, 0.7]
+    write_reward_tape(filename, [BernoulliArm(mean) for mean in means],
+                      max_pulls=1000)
+    ordinary_bandit = OrdinaryBandit(load_reward_tape(filename, means=means))
+    ordinary_bandit.reset()
+    feedback = ordinary_bandit.feed([(0, 10), (2, 20)])
+    regret = ordinary_bandit.regret(MaxReward())
+    # the tape is rewound when the bandit is reset
+    ordinary_bandit.reset()
+    replayed_feedback = ordinary_bandit.feed([(0, 4), (2, 20), (0, 6)])
+    assert np.array_equal(
+        feedback[0][0],
+        np.concatenate([replayed_feedback[0][0], replayed_feedback[2][0]]))
+    assert np.array_equal(feedback[1][0], replayed_feedback[1][0])
+    assert abs(ordinary_bandit.regret(MaxReward()) - regret) < 1e-9
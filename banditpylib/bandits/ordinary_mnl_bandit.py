@@ -205,12 +205,15 @@ class CvarReward(Reward):
 
 
 def search_best_assortment(reward: Reward,
-                           card_limit: int = np.inf) -> Tuple[float, Set[int]]:
+                           card_limit: int = np.inf,
+                           rng=None) -> Tuple[float, Set[int]]:
   """Search assortment with the maximum reward
 
   Args:
     reward: reward definition
     card_limit: cardinality constraint
+    rng: random number generator used to break ties. `None` means the global
+      random state of numpy.
 
   Returns:
     assortment with the maximum reward
@@ -249,14 +252,16 @@ def search_best_assortment(reward: Reward,
   ind = len(sorted_assort) - 1
   while (ind > 0 and sorted_assort[ind - 1][0] == sorted_assort[ind][0]):
     ind -= 1
-  return sorted_assort[np.random.randint(ind, len(sorted_assort))]
+  return sorted_assort[ind + int((np.random if rng is None else rng).choice(
+      len(sorted_assort) - ind))]
 
 
 def local_search_best_assortment(
     reward: Reward,
     random_neighbors: int,
     card_limit: int,
-    init_assortment: Set[int] = None) -> Tuple[float, Set[int]]:
+    init_assortment: Set[int] = None,
+    rng=None) -> Tuple[float, Set[int]]:
   """Local search assortment with the maximum reward
 
   .. warning::
@@ -270,6 +275,8 @@ def local_search_best_assortment(
     random_neighbors: number of random neighbors to look up
     card_limit: cardinality constraint
     init_assortment: initial assortment to start
+    rng: random number generator used to pick the neighbors. `None` means the
+      global random state of numpy.
 
   Returns:
     local best assortment with its reward
@@ -278,6 +285,7 @@ def local_search_best_assortment(
     raise Exception('Number of neighbors to look up %d is no greater than 0!' \
         % random_neighbors)
 
+  rng = np.random if rng is None else rng
   product_num = len(reward.revenues) - 1
 
   # all available products
@@ -285,7 +293,7 @@ def local_search_best_assortment(
   if init_assortment is None:
     # randomly generate an assortment initially
     best_assortment = set(
-        np.random.choice(list(all_products), card_limit, replace=False))
+        rng.choice(list(all_products), card_limit, replace=False))
     best_reward = reward.calc(best_assortment)
   else:
     best_assortment = set(init_assortment)
@@ -304,27 +312,26 @@ def local_search_best_assortment(
     local_best_assortment = set()
     local_best_reward = 0.0
     for _ in range(random_neighbors):
-      # pylint: disable=no-member
-      operation = np.random.choice(available_operations)
+      operation = rng.choice(available_operations)
 
       if operation == 'replace':
         # replace one product
-        product_to_remove = np.random.choice(list(best_assortment))
-        product_to_add = np.random.choice(list(remaining_products))
+        product_to_remove = rng.choice(list(best_assortment))
+        product_to_add = rng.choice(list(remaining_products))
         new_assortment = set(best_assortment)
         new_assortment.remove(product_to_remove)
         new_assortment.add(product_to_add)
         new_reward = reward.calc(new_assortment)
       elif operation == 'remove':
         # remove one product
-        product_to_remove = np.random.choice(list(best_assortment))
+        product_to_remove = rng.choice(list(best_assortment))
         new_assortment = set(best_assortment)
         new_assortment.remove(product_to_remove)
         new_reward = reward.calc(new_assortment)
       else:
         # operation = 'add'
         # add one product
-        product_to_add = np.random.choice(list(remaining_products))
+        product_to_add = rng.choice(list(remaining_products))
         new_assortment = set(best_assortment)
         new_assortment.add(product_to_add)
         new_reward = reward.calc(new_assortment)
@@ -434,7 +441,8 @@ class OrdinaryMNLBandit(Bandit):
       # compute the best assortment
       self.__best_reward, self.__best_assort = search_best_assortment(
           reward=self.__reward,
-          card_limit=self.__card_limit)
+          card_limit=self.__card_limit,
+          rng=self.rng)
       logging.info('Assortment %s has best reward %.2f.',
                    sorted(list(self.__best_assort)),
                    self.__best_reward)
@@ -477,7 +485,7 @@ class OrdinaryMNLBandit(Bandit):
     sample_prob = [self.__preference_params[0] / preference_params_sum] + \
         [self.__preference_params[product] / preference_params_sum
          for product in sorted_assort]
-    sample_results = np.random.choice(len(sample_prob), times, p=sample_prob)
+    sample_results = self.rng.choice(len(sample_prob), times, p=sample_prob)
     choices = [
         0 if (sample == 0) else sorted_assort[sample - 1]
         for sample in sample_results
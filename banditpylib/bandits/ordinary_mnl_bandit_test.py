@@ -69,6 +69,33 @@ class TestOrdinaryMNLBandit:
     assert best_assortment == local_best_assortment
 
 
+  def test_search_with_rng(self):
+    reward = MeanReward()
+    reward.set_preference_params(np.ones(7))
+    reward.set_revenues(np.array([0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]))
+    np.random.seed(0)
+    global_state = np.random.get_state()[1].copy()
+    local_best_assortments = [
+        local_search_best_assortment(reward=reward,
+                                     random_neighbors=3,
+                                     card_limit=3,
+                                     rng=np.random.default_rng(1))[1]
+        for _ in range(2)
+    ]
+    # the same generator gives the same assortment
+    assert local_best_assortments[0] == local_best_assortments[1]
+    # ties between the assortments of one product are broken by the generator
+    reward.set_revenues(np.array([0, 1, 1, 1, 1, 1, 1]))
+    best_assortments = [
+        search_best_assortment(reward=reward,
+                               card_limit=1,
+                               rng=np.random.default_rng(1))[1]
+        for _ in range(2)
+    ]
+    assert best_assortments[0] == best_assortments[1]
+    # the global random state of numpy is not used
+    assert np.array_equal(np.random.get_state()[1], global_state)
+
   def test_cvar_calculation(self):
     reward = CvarReward(alpha=0.5)
     reward.set_preference_params(np.array([1, 1, 1, 1]))
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
 
 from banditpylib.learners import Goal
 
@@ -17,12 +19,30 @@ class Bandit(ABC):
       name: alias name for the bandit environment
     """
     self.__name = self._name() if name is None else name
+    self.__rng: Optional[np.random.Generator] = None
 
   @property
   def name(self) -> str:
     """bandit name"""
     return self.__name
 
+  def set_rng(self, rng: Optional[np.random.Generator]):
+    """Set the random number generator of the bandit environment
+
+    Args:
+      rng: random number generator used to draw the rewards. `None` means the
+        global random state of numpy is used.
+    """
+    self.__rng = rng
+
+  @property
+  def rng(self):
+    """random number generator of the bandit environment, which is
+    :mod:`numpy.random` if no generator is set. Only the methods shared by
+    :class:`numpy.random.Generator` and :mod:`numpy.random` should be
+    called."""
+    return np.random if self.__rng is None else self.__rng
+
   @abstractmethod
   def _name(self) -> str:
     """
@@ -38,6 +58,23 @@ class Bandit(ABC):
       This function should be called before the start of the game.
     """
 
+  def set_common_random_numbers(
+      self, random_seed: Optional[Union[int, List[int]]]):
+    """Set the seed of common random numbers
+
+    With common random numbers, rewards are drawn from streams determined by
+    `random_seed` only, so that learners played with the same seed see the
+    same rewards. It takes effect from the next :func:`reset`.
+
+    Args:
+      random_seed: random seed of the reward streams. It can also be a list
+        of integers. `None` means rewards are drawn from the global random
+        state of numpy.
+    """
+    if random_seed is not None:
+      raise Exception('%s does not support common random numbers!' %
+                      self.name)
+
   @abstractmethod
   def context(self) -> Any:
     """
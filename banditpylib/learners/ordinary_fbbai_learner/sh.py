@@ -65,10 +65,10 @@ class SH(OrdinaryFBBAILearner):
       self.__last_actions = None
     elif len(self.__active_arms) <= self.__threshold:
       # uniform sampling
-      pulls = np.random.multinomial(self.__budget_left,
-                                    np.ones(len(self.__active_arms)) /
-                                    len(self.__active_arms),
-                                    size=1)[0]
+      pulls = self.rng.multinomial(self.__budget_left,
+                                   np.ones(len(self.__active_arms)) /
+                                   len(self.__active_arms),
+                                   size=1)[0]
       self.__last_actions = [(self.__active_arms[i], pulls[i])
                              for i in range(len(self.__active_arms))]
       self.__last_round = True
@@ -91,9 +91,10 @@ class SH(OrdinaryFBBAILearner):
       self.__pseudo_arms[self.__last_actions[ind][0]].update(rewards)
       self.__budget_left -= len(rewards)
     if self.__last_round:
-      self.__best_arm = argmax_tuple([
-          (self.__pseudo_arms[arm_id].em_mean,
-           arm_id) for arm_id in self.__active_arms])
+      self.__best_arm = argmax_tuple(
+          [(self.__pseudo_arms[arm_id].em_mean, arm_id)
+           for arm_id in self.__active_arms],
+          rng=self.rng)
     else:
       # remove half of the arms with the worst empirical means
       sorted_active_arms = sorted(self.__active_arms,
@@ -52,9 +52,9 @@ class Uniform(OrdinaryFBBAILearner):
       self.__last_actions = None
     else:
       # make sure each arm is sampled at least once
-      pulls = np.random.multinomial(self.budget() - self.arm_num(),
-                                    np.ones(self.arm_num()) / self.arm_num(),
-                                    size=1)[0]
+      pulls = self.rng.multinomial(self.budget() - self.arm_num(),
+                                   np.ones(self.arm_num()) / self.arm_num(),
+                                   size=1)[0]
       self.__last_actions = [(arm_id, pulls[arm_id] + 1)
                              for arm_id in range(self.arm_num())]
       self.__last_round = True
@@ -70,7 +70,8 @@ class Uniform(OrdinaryFBBAILearner):
     for (ind, (rewards, _)) in enumerate(feedback):
       self.__pseudo_arms[self.__last_actions[ind][0]].update(rewards)
     if self.__last_round:
-      self.__best_arm = argmax([arm.em_mean for arm in self.__pseudo_arms])
+      self.__best_arm = argmax([arm.em_mean for arm in self.__pseudo_arms],
+                                rng=self.rng)
 
   def best_arm(self) -> int:
     """
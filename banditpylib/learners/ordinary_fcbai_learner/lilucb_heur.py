@@ -106,4 +106,5 @@ class LilUCBHeuristic(OrdinaryFCBAILearner):
     """
     return argmax_tuple([(pseudo_arm.total_pulls(), arm_id)
                          for (arm_id,
-                              pseudo_arm) in enumerate(self.__pseudo_arms)])
+                              pseudo_arm) in enumerate(self.__pseudo_arms)],
+                        rng=self.rng)
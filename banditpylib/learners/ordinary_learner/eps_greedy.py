@@ -2,7 +2,7 @@ from typing import List, Tuple, Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
+from banditpylib.arms import PseudoArm, LockstepPseudoArms
 from .utils import OrdinaryLearner
 
 
@@ -44,6 +44,17 @@ class EpsGreedy(OrdinaryLearner):
     # current time step
     self.__time = 1
 
+  def __em_means(self) -> np.ndarray:
+    """
+    Returns:
+      empirical means of arms. It is infinity for arms whose rewards are not
+      observed yet e.g., when their feedback is delayed.
+    """
+    return np.array([
+        arm.em_mean if arm.total_pulls() > 0 else np.inf
+        for arm in self.__pseudo_arms
+    ])
+
   def actions(self, context=None) -> Optional[List[Tuple[int, int]]]:
     """
     Args:
@@ -59,21 +70,80 @@ class EpsGreedy(OrdinaryLearner):
     elif self.__time <= self.arm_num():
       self.__last_actions = [((self.__time - 1) % self.arm_num(), 1)]
     # with probability eps/t, randomly select an arm to pull
-    elif np.random.random() <= self.__eps / self.__time:
-      self.__last_actions = [(np.random.randint(0, self.arm_num()), 1)]
+    elif self.rng.random() <= self.__eps / self.__time:
+      self.__last_actions = [(self.rng.choice(self.arm_num()), 1)]
     else:
+      self.__last_actions = [(np.argmax(self.__em_means()), 1)]
+    if self.__last_actions is not None:
+      self.__time += 1
+    return self.__last_actions
+
+  def _lockstep_actions(self, time: int,
+                        pseudo_arms: LockstepPseudoArms) -> np.ndarray:
+    """Arms to pull in all trials for one round
+
+    Args:
+      time: current time step
+      pseudo_arms: empirical information of arms in all trials
+
+    Returns:
+      arm to pull in each trial
+    """
+    trials = pseudo_arms.trials()
+    if time <= self.arm_num():
+      return np.full(trials, (time - 1) % self.arm_num())
+    # with probability eps/t, randomly select an arm to pull
+    explore = self.rng.random(trials) <= self.__eps / time
+    return np.where(explore, self.rng.choice(self.arm_num(), trials),
+                    np.argmax(pseudo_arms.em_mean, axis=1))
+
+  def batch_actions(self, batch_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Arms to pull in the next time steps of a batch
+
+    Arms not pulled yet are pulled once first. After that, at each time step
+    :math:`t` of a batch, an arm picked uniformly at random is pulled with
+    probability :math:`\\frac{\\epsilon}{t}` and the arm with the maximum
+    empirical mean at the start of the batch is pulled otherwise.
+
+    Args:
+      batch_size: maximum number of time steps of the batch
+
+    Returns:
+      arms to pull and their numbers of pulls
+    """
+    steps = self._batch_steps(self.__time, batch_size)
+    if steps == 0:
+      self.__last_actions = None
+    elif self.__time <= self.arm_num():
+      # the batch stops after the arms not pulled yet since their empirical
+      # means are needed
       self.__last_actions = [
-          (np.argmax(np.array([arm.em_mean
-                               for arm in self.__pseudo_arms])), 1)
+          (arm_id, 1) for arm_id in range(
+              self.__time - 1, min(self.__time - 1 + steps, self.arm_num()))
       ]
+    else:
+      times = np.arange(self.__time, self.__time + steps)
+      explored_arms = self.rng.choice(
+          self.arm_num(),
+          np.count_nonzero(self.rng.random(steps) <= self.__eps / times))
+      pulls = np.bincount(explored_arms, minlength=self.arm_num())
+      pulls[np.argmax(self.__em_means())] += steps - len(explored_arms)
+      self.__last_actions = self._allocation(pulls)
+    if self.__last_actions is not None:
+      self.__time += sum(pulls for (_, pulls) in self.__last_actions)
     return self.__last_actions
 
-  def update(self, feedback: List[Tuple[np.ndarray, None]]):
+  def update(self,
+             feedback: List[Tuple[np.ndarray, None]],
+             actions: Optional[List[Tuple[int, int]]] = None):
     """Learner update
 
     Args:
       feedback: feedback returned by the bandit environment by executing
-        :func:`actions`
+        `actions`
+      actions: actions the feedback is for. `None` means the ones returned by
+        the last call of :func:`actions` or :func:`batch_actions`.
     """
-    self.__pseudo_arms[self.__last_actions[0][0]].update(feedback[0][0])
-    self.__time += 1
+    for ((arm_id, _), arm_feedback) in zip(
+        self.__last_actions if actions is None else actions, feedback):
+      self.__pseudo_arms[arm_id].update(arm_feedback[0])
@@ -2,7 +2,7 @@ from typing import List, Tuple, Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
+from banditpylib.arms import PseudoArm, LockstepPseudoArms
 from .utils import OrdinaryLearner
 
 
@@ -48,17 +48,40 @@ class MOSS(OrdinaryLearner):
   def MOSS(self) -> np.ndarray:
     """
     Returns:
-      optimistic estimate of arms' real means using horizon
+      optimistic estimate of arms' real means using horizon. It is infinity
+      for arms whose rewards are not observed yet e.g., when their feedback is
+      delayed.
     """
     moss = [
         arm.em_mean + np.sqrt(
             np.maximum(
                 0, np.log(self.horizon() /
                           (self.arm_num() * arm.total_pulls()))) /
-            arm.total_pulls()) for arm in self.__pseudo_arms
+            arm.total_pulls()) if arm.total_pulls() > 0 else np.inf
+        for arm in self.__pseudo_arms
     ]
     return moss
 
+  def _lockstep_actions(self, time: int,
+                        pseudo_arms: LockstepPseudoArms) -> np.ndarray:
+    """Arms to pull in all trials for one round
+
+    Args:
+      time: current time step
+      pseudo_arms: empirical information of arms in all trials
+
+    Returns:
+      arm to pull in each trial
+    """
+    if time <= self.arm_num():
+      return np.full(pseudo_arms.trials(), (time - 1) % self.arm_num())
+    total_pulls = pseudo_arms.total_pulls()
+    moss = pseudo_arms.em_mean + np.sqrt(
+        np.maximum(
+            0, np.log(self.horizon() / (self.arm_num() * total_pulls))) /
+        total_pulls)
+    return np.argmax(moss, axis=1)
+
   def actions(self, context=None) -> Optional[List[Tuple[int, int]]]:
     """
     Args:
@@ -74,14 +97,50 @@ class MOSS(OrdinaryLearner):
       self.__last_actions = [((self.__time - 1) % self.arm_num(), 1)]
     else:
       self.__last_actions = [(np.argmax(self.MOSS()), 1)]
+    if self.__last_actions is not None:
+      self.__time += 1
+    return self.__last_actions
+
+  def batch_actions(self, batch_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Arms to pull in the next time steps of a batch
+
+    Arms not pulled yet are pulled once first. After that, all the pulls of a
+    batch go to the arm with the maximum upper confidence bound at the start of
+    the batch.
+
+    Args:
+      batch_size: maximum number of time steps of the batch
+
+    Returns:
+      arms to pull and their numbers of pulls
+    """
+    steps = self._batch_steps(self.__time, batch_size)
+    if steps == 0:
+      self.__last_actions = None
+    elif self.__time <= self.arm_num():
+      # the batch stops after the arms not pulled yet since their rewards are
+      # needed by the upper confidence bounds
+      self.__last_actions = [
+          (arm_id, 1) for arm_id in range(
+              self.__time - 1, min(self.__time - 1 + steps, self.arm_num()))
+      ]
+    else:
+      self.__last_actions = [(np.argmax(self.MOSS()), steps)]
+    if self.__last_actions is not None:
+      self.__time += sum(pulls for (_, pulls) in self.__last_actions)
     return self.__last_actions
 
-  def update(self, feedback: List[Tuple[np.ndarray, None]]):
+  def update(self,
+             feedback: List[Tuple[np.ndarray, None]],
+             actions: Optional[List[Tuple[int, int]]] = None):
     """Learner update
 
     Args:
       feedback: feedback returned by the bandit environment by executing
-        :func:`actions`
+        `actions`
+      actions: actions the feedback is for. `None` means the ones returned by
+        the last call of :func:`actions` or :func:`batch_actions`.
     """
-    self.__pseudo_arms[self.__last_actions[0][0]].update(feedback[0][0])
-    self.__time += 1
+    for ((arm_id, _), arm_feedback) in zip(
+        self.__last_actions if actions is None else actions, feedback):
+      self.__pseudo_arms[arm_id].update(arm_feedback[0])
@@ -2,7 +2,7 @@ from typing import List, Tuple, Optional
 
 import numpy as np
 
-from banditpylib.arms import PseudoArm
+from banditpylib.arms import PseudoArm, LockstepPseudoArms
 from .utils import OrdinaryLearner
 
 
@@ -59,7 +59,7 @@ class ThompsonSampling(OrdinaryLearner):
       a = 1 + self.__pseudo_arms[arm_id].total_rewards()
       b = 1 + self.__pseudo_arms[arm_id].total_pulls(
       ) - self.__pseudo_arms[arm_id].total_rewards()
-      virtual_means[arm_id] = np.random.beta(a, b)
+      virtual_means[arm_id] = self.rng.beta(a, b)
     return np.argmax(virtual_means)
 
   def actions_from_gaussian_prior(self) -> int:
@@ -73,9 +73,32 @@ class ThompsonSampling(OrdinaryLearner):
       mu = self.__pseudo_arms[arm_id].total_rewards() / (
           self.__pseudo_arms[arm_id].total_pulls() + 1)
       sigma = 1.0 / (self.__pseudo_arms[arm_id].total_pulls() + 1)
-      virtual_means[arm_id] = np.random.normal(mu, sigma)
+      virtual_means[arm_id] = self.rng.normal(mu, sigma)
     return np.argmax(virtual_means)
 
+  def _lockstep_actions(self, time: int,
+                        pseudo_arms: LockstepPseudoArms) -> np.ndarray:
+    """Arms to pull in all trials for one round
+
+    Args:
+      time: current time step
+      pseudo_arms: empirical information of arms in all trials
+
+    Returns:
+      arm to pull in each trial
+    """
+    total_pulls = pseudo_arms.total_pulls()
+    total_rewards = pseudo_arms.total_rewards()
+    if self.__prior_dist == 'beta':
+      # the mean of each arm has a uniform prior Beta(1, 1)
+      virtual_means = self.rng.beta(1 + total_rewards,
+                                    1 + total_pulls - total_rewards)
+    else:
+      # the mean of each arm has a Gaussian prior Normal(0, 1)
+      virtual_means = self.rng.normal(total_rewards / (total_pulls + 1),
+                                      1.0 / (total_pulls + 1))
+    return np.argmax(virtual_means, axis=1)
+
   def actions(self, context=None) -> Optional[List[Tuple[int, int]]]:
     """
     Args:
@@ -92,14 +115,57 @@ class ThompsonSampling(OrdinaryLearner):
                               1)] if self.__prior_dist == 'beta' else [
                                   (self.actions_from_gaussian_prior(), 1)
                               ]
+    if self.__last_actions is not None:
+      self.__time += 1
+    return self.__last_actions
+
+  def batch_actions(self, batch_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Arms to pull in the next time steps of a batch
+
+    At each time step of a batch, virtual means are sampled from the
+    posterior distributions at the start of the batch and the arm with the
+    maximum sampled virtual mean is pulled.
+
+    Args:
+      batch_size: maximum number of time steps of the batch
+
+    Returns:
+      arms to pull and their numbers of pulls
+    """
+    steps = self._batch_steps(self.__time, batch_size)
+    if steps == 0:
+      self.__last_actions = None
+      return self.__last_actions
+    total_pulls = np.array([arm.total_pulls() for arm in self.__pseudo_arms])
+    total_rewards = np.array(
+        [arm.total_rewards() for arm in self.__pseudo_arms])
+    if self.__prior_dist == 'beta':
+      # the mean of each arm has a uniform prior Beta(1, 1)
+      virtual_means = self.rng.beta(1 + total_rewards,
+                                    1 + total_pulls - total_rewards,
+                                    size=(steps, self.arm_num()))
+    else:
+      # the mean of each arm has a Gaussian prior Normal(0, 1)
+      virtual_means = self.rng.normal(total_rewards / (total_pulls + 1),
+                                      1.0 / (total_pulls + 1),
+                                      size=(steps, self.arm_num()))
+    self.__last_actions = self._allocation(
+        np.bincount(np.argmax(virtual_means, axis=1),
+                    minlength=self.arm_num()))
+    self.__time += steps
     return self.__last_actions
 
-  def update(self, feedback: List[Tuple[np.ndarray, None]]):
+  def update(self,
+             feedback: List[Tuple[np.ndarray, None]],
+             actions: Optional[List[Tuple[int, int]]] = None):
     """Learner update
 
     Args:
       feedback: feedback returned by the bandit environment by executing
-        :func:`actions`
+        `actions`
+      actions: actions the feedback is for. `None` means the ones returned by
+        the last call of :func:`actions` or :func:`batch_actions`.
     """
-    self.__pseudo_arms[self.__last_actions[0][0]].update(feedback[0][0])
-    self.__time += 1
+    for ((arm_id, _), arm_feedback) in zip(
+        self.__last_actions if actions is None else actions, feedback):
+      self.__pseudo_arms[arm_id].update(arm_feedback[0])
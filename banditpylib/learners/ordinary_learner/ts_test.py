@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock
 
+import numpy as np
+
 from .ts import ThompsonSampling
 
 
@@ -12,3 +14,15 @@ class TestThompsonSampling:
     ts_learner.actions_from_beta_prior = MagicMock(return_value=1)
     # always pull arm 1
     assert ts_learner.actions() == [(1, 1)]
+
+  def test_batch_actions(self):
+    ts_learner = ThompsonSampling(arm_num=4, horizon=10)
+    ts_learner.reset()
+    actions = ts_learner.batch_actions(batch_size=6)
+    # one pull of each time step of the batch
+    assert sum(pulls for (_, pulls) in actions) == 6
+    ts_learner.update([(np.ones(pulls), None) for (_, pulls) in actions])
+    actions = ts_learner.batch_actions(batch_size=6)
+    assert sum(pulls for (_, pulls) in actions) == 4
+    ts_learner.update([(np.ones(pulls), None) for (_, pulls) in actions])
+    assert ts_learner.batch_actions(batch_size=6) is None
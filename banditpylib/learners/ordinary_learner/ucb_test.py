@@ -24,3 +24,22 @@ class TestUCB:
     for _ in range(arm_num + 1, horizon + 1):
       assert learner.actions() == [(0, 1)]
       learner.update(([np.array([0])], ))
+
+  def test_batch_actions(self):
+    arm_num = 3
+    horizon = 15
+    learner = UCB(arm_num=arm_num, horizon=horizon)
+    learner.reset()
+    mock_ucb = np.array([1, 1.2, 1])
+    learner.UCB = MagicMock(return_value=mock_ucb)
+
+    # the batch stops after each arm is pulled once
+    assert learner.batch_actions(batch_size=8) == [(0, 1), (1, 1), (2, 1)]
+    learner.update([(np.array([0]), None)] * 3)
+    # arm 1 gets all the pulls of a batch
+    assert learner.batch_actions(batch_size=8) == [(1, 8)]
+    learner.update([(np.zeros(8), None)])
+    # the last batch is cut at the horizon
+    assert learner.batch_actions(batch_size=8) == [(1, 4)]
+    learner.update([(np.zeros(4), None)])
+    assert learner.batch_actions(batch_size=8) is None
@@ -2,6 +2,7 @@ from typing import List, Tuple, Optional
 
 import numpy as np
 
+from banditpylib.arms import LockstepPseudoArms
 from .utils import OrdinaryLearner
 
 
@@ -48,13 +49,52 @@ class Uniform(OrdinaryLearner):
       self.__last_actions = None
     else:
       self.__last_actions = [((self.__time - 1) % self.arm_num(), 1)]
+    if self.__last_actions is not None:
+      self.__time += 1
     return self.__last_actions
 
-  def update(self, feedback: List[Tuple[np.ndarray, None]]):
+  def batch_actions(self, batch_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Arms to pull in the next time steps of a batch
+
+    Args:
+      batch_size: maximum number of time steps of the batch
+
+    Returns:
+      arms to pull and their numbers of pulls
+    """
+    steps = self._batch_steps(self.__time, batch_size)
+    if steps == 0:
+      self.__last_actions = None
+    else:
+      self.__last_actions = self._allocation(
+          np.bincount(np.arange(self.__time - 1, self.__time - 1 + steps) %
+                      self.arm_num(),
+                      minlength=self.arm_num()))
+      self.__time += steps
+    return self.__last_actions
+
+  def _lockstep_actions(self, time: int,
+                        pseudo_arms: LockstepPseudoArms) -> np.ndarray:
+    """Arms to pull in all trials for one round
+
+    Args:
+      time: current time step
+      pseudo_arms: empirical information of arms in all trials
+
+    Returns:
+      arm to pull in each trial
+    """
+    return np.full(pseudo_arms.trials(), (time - 1) % self.arm_num())
+
+  def update(self,
+             feedback: List[Tuple[np.ndarray, None]],
+             actions: Optional[List[Tuple[int, int]]] = None):
     """Learner update
 
     Args:
       feedback: feedback returned by the bandit environment by executing
-        :func:`actions`
+        `actions`
+      actions: actions the feedback is for. `None` means the ones returned by
+        the last call of :func:`actions` or :func:`batch_actions`.
     """
-    self.__time += 1
+    del feedback, actions
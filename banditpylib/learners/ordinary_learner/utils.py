@@ -1,5 +1,8 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
+import numpy as np
+
+from banditpylib.arms import LockstepPseudoArms
 from banditpylib.bandits import OrdinaryBanditItf
 from banditpylib.learners import Learner, Goal, MaxReward
 
@@ -9,6 +12,20 @@ class OrdinaryLearner(Learner):
   """Base class for learners in the ordinary multi-armed bandit
 
   This type of learners aim to maximize the expected total rewards.
+
+  Besides the ordinary interfaces, a learner can optionally support lockstep
+  simulation, in which a batch of independent trials advance together and the
+  statistics of all trials are stored as arrays. To support it, a learner only
+  needs to implement :func:`_lockstep_actions`.
+
+  A learner can also optionally support batched feedback by implementing
+  :func:`batch_actions`, in which it commits to the pulls of several time
+  steps at once and is updated once with the feedback of all of them.
+
+  Time steps advance when the pulls are taken rather than when their feedback
+  arrives, and :func:`update` accepts the actions the feedback is for, so the
+  feedback can be delayed and the learner acts on stale statistics in the
+  meantime.
   """
   def __init__(self, arm_num: int, horizon: int, name: Optional[str]):
     """
@@ -57,3 +74,93 @@ class OrdinaryLearner(Learner):
   def goal(self) -> Goal:
     """goal of the learner"""
     return MaxReward()
+
+  def lockstep_reset(self, trials: int):
+    """Reset the learner for lockstep simulation
+
+    Args:
+      trials: number of trials simulated in lockstep
+
+    .. warning::
+      This function should be called before the start of the lockstep game.
+    """
+    self.__lockstep_pseudo_arms = LockstepPseudoArms(trials=trials,
+                                                     arm_num=self.arm_num())
+    # current time step shared by all trials
+    self.__lockstep_time = 1
+
+  def _lockstep_actions(self, time: int,
+                        pseudo_arms: LockstepPseudoArms) -> np.ndarray:
+    """Arms to pull in all trials for one round
+
+    Args:
+      time: current time step
+      pseudo_arms: empirical information of arms in all trials
+
+    Returns:
+      arm to pull in each trial
+    """
+    raise Exception('%s does not support lockstep simulation!' % self.name)
+
+  def lockstep_actions(self) -> Optional[np.ndarray]:
+    """
+    Returns:
+      arm to pull in each trial. `None` is returned when the game ends.
+    """
+    if self.__lockstep_time > self.horizon():
+      self.__lockstep_last_actions = None
+    else:
+      self.__lockstep_last_actions = self._lockstep_actions(
+          self.__lockstep_time, self.__lockstep_pseudo_arms)
+    return self.__lockstep_last_actions
+
+  def lockstep_update(self, rewards: np.ndarray):
+    """Learner update in lockstep simulation
+
+    Args:
+      rewards: reward obtained in each trial by executing
+        :func:`lockstep_actions`
+    """
+    self.__lockstep_pseudo_arms.update(self.__lockstep_last_actions, rewards)
+    self.__lockstep_time += 1
+
+  def _batch_steps(self, time: int, batch_size: int) -> int:
+    """
+    Args:
+      time: current time step
+      batch_size: maximum number of time steps of a batch
+
+    Returns:
+      number of time steps of the next batch, which is 0 when the game ends
+    """
+    if batch_size < 1:
+      raise Exception('Batch size %d is less than 1!' % batch_size)
+    return max(min(batch_size, self.horizon() - time + 1), 0)
+
+  @staticmethod
+  def _allocation(pulls: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Args:
+      pulls: number of pulls of each arm
+
+    Returns:
+      arms to pull with their numbers of pulls. Arms not pulled are left out.
+    """
+    return [(arm_id, int(pulls[arm_id])) for arm_id in np.flatnonzero(pulls)]
+
+  def batch_actions(self, batch_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Arms to pull in the next time steps of a batch
+
+    The learner commits to the pulls of at most `batch_size` time steps
+    without feedback in between. The feedback of all the pulls is passed to
+    :func:`update` at once. A batch may cover fewer time steps e.g., at the
+    end of the horizon.
+
+    Args:
+      batch_size: maximum number of time steps of the batch
+
+    Returns:
+      arms to pull and their numbers of pulls. `None` is returned when the
+      game ends.
+    """
+    raise Exception('%s does not support batched feedback!' % self.name)
@@ -93,7 +93,7 @@ class EpsGreedy(OrdinaryMNLLearner):
            assortment=set(),
            card_limit=self.card_limit())
     # pylint: disable=no-member
-    return assortments[int(np.random.randint(0, len(assortments)))]
+    return assortments[int(self.rng.choice(len(assortments)))]
 
   def actions(self, context=None) -> Optional[List[Tuple[Set[int], int]]]:
     """
@@ -112,7 +112,7 @@ class EpsGreedy(OrdinaryMNLLearner):
 
       # pylint: disable=no-member
       # with probability eps/t, randomly select an assortment to serve
-      if np.random.random() <= self.__eps / self.__time:
+      if self.rng.random() <= self.__eps / self.__time:
         self.__last_actions = [(self.select_ramdom_assort(), 1)]
         return self.__last_actions
 
@@ -125,10 +125,11 @@ class EpsGreedy(OrdinaryMNLLearner):
             random_neighbors=self.random_neighbors,
             card_limit=self.card_limit(),
             init_assortment=(
-                self.__last_actions[0][0] if self.__last_actions else None))
+                self.__last_actions[0][0] if self.__last_actions else None),
+            rng=self.rng)
       else:
         _, best_assortment = search_best_assortment(
-            reward=self.reward, card_limit=self.card_limit())
+            reward=self.reward, card_limit=self.card_limit(), rng=self.rng)
       self.__last_actions = [(best_assortment, 1)]
     return self.__last_actions
 
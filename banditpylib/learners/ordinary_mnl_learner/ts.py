@@ -93,7 +93,7 @@ class ThompsonSampling(OrdinaryMNLLearner):
     Returns:
       correlated sampling of preference parameters
     """
-    theta = np.max(np.random.normal(0, 1, self.card_limit()))
+    theta = np.max(self.rng.normal(0, 1, self.card_limit()))
     # unbiased estimate of preference parameters
     unbiased_est = self.__product_picks / self.__serving_episodes
     sampled_preference_params = unbiased_est + theta * (
@@ -142,10 +142,11 @@ class ThompsonSampling(OrdinaryMNLLearner):
             reward=self.reward,
             random_neighbors=self.random_neighbors,
             card_limit=self.card_limit(),
-            init_assortment=init_assortment)
+            init_assortment=init_assortment,
+            rng=self.rng)
       else:
         _, best_assortment = search_best_assortment(
-            reward=self.reward, card_limit=self.card_limit())
+            reward=self.reward, card_limit=self.card_limit(), rng=self.rng)
 
       self.__last_actions = [(best_assortment, 1)]
       self.__first_step_after_warm_start = False
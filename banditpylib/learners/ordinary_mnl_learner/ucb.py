@@ -105,10 +105,11 @@ class UCB(OrdinaryMNLLearner):
             random_neighbors=self.random_neighbors,
             card_limit=self.card_limit(),
             init_assortment=(
-                self.__last_actions[0][0] if self.__last_actions else None))
+                self.__last_actions[0][0] if self.__last_actions else None),
+            rng=self.rng)
       else:
         _, best_assortment = search_best_assortment(
-            reward=self.reward, card_limit=self.card_limit())
+            reward=self.reward, card_limit=self.card_limit(), rng=self.rng)
       self.__last_actions = [(best_assortment, 1)]
     return self.__last_actions
 
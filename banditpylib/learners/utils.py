@@ -4,11 +4,13 @@ from typing import Optional, Union, List, Tuple
 import numpy as np
 
 
-def argmax(values: List[float]) -> int:
+def argmax(values: List[float], rng=None) -> int:
   """Find index with the highest value
 
   Args:
     values: a list of values
+    rng: random number generator used to break ties. `None` means the global
+      random state of numpy is used.
 
   Returns:
     index with the highest value. When there is a tie, randomly output one of
@@ -18,14 +20,16 @@ def argmax(values: List[float]) -> int:
   max_value_indexes = [
       index for index, value in enumerate(values) if value == max_value
   ]
-  return np.random.choice(max_value_indexes)
+  return (np.random if rng is None else rng).choice(max_value_indexes)
 
 
-def argmax_tuple(values: List[Tuple[float, int]]) -> int:
+def argmax_tuple(values: List[Tuple[float, int]], rng=None) -> int:
   """Find the second element of the tuple with the highest value
 
   Args:
     values: a list of tuples
+    rng: random number generator used to break ties. `None` means the global
+      random state of numpy is used.
 
   Returns:
     the second element of the tuple with the highest value. When there is a tie,
@@ -35,7 +39,7 @@ def argmax_tuple(values: List[Tuple[float, int]]) -> int:
   max_value_indexes = [
       index for (value, index) in values if value == max_value
   ]
-  return np.random.choice(max_value_indexes)
+  return (np.random if rng is None else rng).choice(max_value_indexes)
 
 
 class Goal(ABC):
@@ -100,12 +104,34 @@ class Learner(ABC):
       name: alias name
     """
     self.__name = self._name() if name is None else name
+    self.__rng: Optional[np.random.Generator] = None
 
   @property
   def name(self) -> str:
     """learner name"""
     return self.__name
 
+  def set_rng(self, rng: Optional[np.random.Generator]):
+    """Set the random number generator of the learner
+
+    Protocols give each trial its own generator spawned from one root
+    :class:`numpy.random.SeedSequence`, so that trials run in parallel are
+    reproducible.
+
+    Args:
+      rng: random number generator. `None` means the global random state of
+        numpy is used.
+    """
+    self.__rng = rng
+
+  @property
+  def rng(self):
+    """random number generator of the learner, which is :mod:`numpy.random`
+    if no generator is set. Only the methods shared by
+    :class:`numpy.random.Generator` and :mod:`numpy.random` e.g., `random`,
+    `choice` and the distributions should be called."""
+    return np.random if self.__rng is None else self.__rng
+
   @abstractmethod
   def _name(self) -> str:
     """
@@ -1,8 +1,42 @@
+from .checkpoint import *
 from .utils import *
 from .single_player import *
+from .batched_single_player import *
+from .lockstep import *
+from .delay import *
+from .delayed_feedback import *
+from .async_single_player import *
+from .writer import *
+from .timing import *
+from .progress import *
+from .distributed import DistributedPool
 
 
 __all__ = [
     'Protocol',
+    'seed_trial',
+    'trial_seeds',
+    'trial_seed_sequence',
     'SinglePlayerProtocol',
+    'BatchedSinglePlayerProtocol',
+    'LockstepProtocol',
+    'DelayedFeedbackProtocol',
+    'Delay',
+    'ConstantDelay',
+    'GeometricDelay',
+    'UniformDelay',
+    'AsyncSinglePlayerProtocol',
+    'ResultWriter',
+    'JsonLinesWriter',
+    'ColumnarWriter',
+    'ColumnarResults',
+    'load_columnar',
+    'read_manifest',
+    'CheckpointSchedule',
+    'ExplicitSchedule',
+    'LinearSchedule',
+    'GeometricSchedule',
+    'PhaseTimer',
+    'ProgressMonitor',
+    'DistributedPool',
 ]
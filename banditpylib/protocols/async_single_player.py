@@ -0,0 +1,254 @@
+import asyncio
+import copy
+from multiprocessing.pool import Pool
+import time
+import types
+from typing import Any, Coroutine, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from absl import logging
+
+from banditpylib.bandits import AsyncBandit
+from banditpylib.learners import Learner
+from .checkpoint import CheckpointSchedule, as_schedule
+from .utils import Protocol, TrialSeed, seed_trial, trial_seed_sequence
+
+
+@types.coroutine
+def _isolated(coroutine: Coroutine, random_seed: TrialSeed):
+  """Run a coroutine with its own global random state of numpy
+
+  The random state is switched in whenever the coroutine resumes and saved
+  whenever it suspends, so the random numbers it draws do not depend on the
+  coroutines run in between.
+
+  Args:
+    coroutine: coroutine to run
+    random_seed: random seed of the random state
+
+  Returns:
+    value returned by the coroutine
+  """
+  random_state = np.random.RandomState(
+      trial_seed_sequence(random_seed).generate_state(4)).get_state()
+  (value, error) = (None, None)
+  while True:
+    np.random.set_state(random_state)
+    try:
+      suspended = coroutine.send(value) if error is None else \
+          coroutine.throw(error)
+    except StopIteration as stop:
+      return stop.value
+    finally:
+      random_state = np.random.get_state()
+    try:
+      (value, error) = ((yield suspended), None)
+    except BaseException as caught:  # pylint: disable=broad-except
+      # e.g., the trial is cancelled
+      (value, error) = (None, caught)
+
+
+class AsyncSinglePlayerProtocol(Protocol):
+  """Asynchronous single player protocol
+
+  This protocol plays the same game as
+  :class:`banditpylib.protocols.SinglePlayerProtocol` in an asynchronous
+  bandit environment i.e., :class:`banditpylib.bandits.AsyncBandit`. The
+  trials of a chunk are run at once on one event loop of the worker, so while
+  a trial is waiting for the feedback of the environment, the others go on.
+  At most `concurrency` trials are in flight in a worker, so the number of
+  trials run at once is also bounded by `chunk_size` of :func:`play`.
+
+  Each trial plays with its own copies of the bandit environment and the
+  learner. It also has its own global random state of numpy which is
+  switched in whenever the trial resumes, so a trial gets the same result as
+  in :class:`banditpylib.protocols.SinglePlayerProtocol` with the same random
+  seed no matter how the trials interleave, provided that the environment
+  draws its random numbers before it waits.
+
+  .. note::
+    Profiling and memory tracking are not supported since the trials of a
+    worker interleave.
+  """
+  def __init__(self,
+               bandit: AsyncBandit,
+               learners: List[Learner],
+               intermediate_regrets: Union[List[int],
+                                           CheckpointSchedule] = None,
+               pool: Pool = None,
+               concurrency: int = 100):
+    """
+    Args:
+      bandit: asynchronous bandit environment
+      learners: learners to be compared with
+      intermediate_regrets: a list of intermediate times or a
+        :class:`banditpylib.protocols.CheckpointSchedule` to record
+        intermediate regrets
+      pool: pool of worker processes used to run the trials
+      concurrency: maximum number of trials run at once by a worker
+    """
+    if not isinstance(bandit, AsyncBandit):
+      raise Exception('Bandit %s is not an asynchronous bandit!' %
+                      bandit.name)
+    if concurrency < 1:
+      raise Exception('Concurrency %d is less than 1!' % concurrency)
+    super().__init__(bandit=bandit, learners=learners, pool=pool)
+    self.__intermediate_regrets = as_schedule(intermediate_regrets)
+    self.__concurrency = concurrency
+
+  @property
+  def name(self) -> str:
+    """default protocol name"""
+    return 'async_single_player_protocol'
+
+  # pylint: disable=arguments-differ
+  def play(self, trials: int, output_filename: str, **kwargs) -> \
+      Dict[str, int]:
+    """Start playing the game
+
+    See :func:`banditpylib.protocols.Protocol.play` for the arguments.
+
+    Returns:
+      number of trials run for each learner
+    """
+    if kwargs.get('profile') is not None or kwargs.get('track_memory', False):
+      raise Exception('%s does not support profiling or memory tracking!' %
+                      self.name)
+    return super().play(trials=trials,
+                        output_filename=output_filename,
+                        **kwargs)
+
+  async def _async_trial(self, random_seed: TrialSeed) -> List[Dict]:
+    """One trial of the game
+
+    Args:
+      random_seed: random seed of common random numbers
+
+    Returns:
+      result of one trial
+    """
+    bandit = copy.deepcopy(self.bandit)
+    learner = copy.deepcopy(self.current_learner)
+    seed_trial(random_seed, bandit, learner)
+    bandit.set_common_random_numbers(self._common_random_seed(random_seed))
+    bandit.reset()
+    learner.reset()
+
+    # samples of the checkpoints and the final one
+    samples = len(self.__intermediate_regrets) + 1
+    sample_rounds = np.zeros(samples, dtype=np.int64)
+    sample_total_actions = np.zeros(samples, dtype=np.int64)
+    sample_regrets = np.zeros(samples)
+    recorded = 0
+    checkpoints = self.__intermediate_regrets.cursor()
+
+    # number of rounds to communicate with the bandit environment
+    adaptive_rounds = 0
+    # total actions executed by the bandit environment
+    total_actions = 0
+
+    def record_data():
+      nonlocal recorded
+      sample_rounds[recorded] = adaptive_rounds
+      sample_total_actions[recorded] = total_actions
+      sample_regrets[recorded] = bandit.regret(learner.goal)
+      recorded += 1
+
+    while True:
+      actions = learner.actions(bandit.context())
+
+      # stop the game if actions returned by the learner is None
+      if actions is None:
+        break
+
+      # record intermediate regrets
+      if checkpoints.reached(adaptive_rounds):
+        record_data()
+
+      feedback = await bandit.feed(actions)
+      learner.update(feedback)
+
+      if feedback:
+        # information update
+        for (_, times) in actions:
+          total_actions += int(times)
+        adaptive_rounds += 1
+
+    # record final regret
+    record_data()
+    return [
+        dict({
+            'bandit': bandit.name,
+            'learner': learner.name,
+            'rounds': rounds,
+            'total_actions': total,
+            'regret': regret
+        }) for (rounds, total, regret) in zip(
+            sample_rounds[:recorded].tolist(),
+            sample_total_actions[:recorded].tolist(),
+            sample_regrets[:recorded].tolist())
+    ]
+
+  async def __run_trials(self, trials: List[Tuple[int, TrialSeed]]) -> \
+      List[Tuple[int, TrialSeed, Any]]:
+    """Run trials at once
+
+    Args:
+      trials: index and random seed of each trial
+
+    Returns:
+      index, random seed and result of each trial
+    """
+    semaphore = asyncio.Semaphore(self.__concurrency)
+
+    async def run_trial(trial: int, random_seed: TrialSeed):
+      async with semaphore:
+        data = await _isolated(self._async_trial(random_seed), random_seed)
+      self._report_progress(data)
+      return (trial, random_seed, data)
+
+    return await asyncio.gather(*[
+        run_trial(trial, random_seed) for (trial, random_seed) in trials
+    ])
+
+  def _trial_chunk(self, trials: List[Tuple[int, TrialSeed]],
+                   debug: bool) -> \
+      Tuple[List[Tuple[int, TrialSeed, Union[Dict, List[Dict]]]], float,
+            Optional[Dict]]:
+    """A chunk of trials of the game
+
+    This method runs the trials at once on a new event loop of the worker and
+    returns their results in one batch.
+
+    Args:
+      trials: index and random seed of each trial
+      debug: whether to run the trials in debug mode
+
+    Returns:
+      index, random seed and result of each trial, the seconds used to run
+      the trials and `None` as the profiler statistics
+    """
+    if debug:
+      logging.set_verbosity(logging.DEBUG)
+    start_time = time.perf_counter()
+    loop = asyncio.new_event_loop()
+    try:
+      results = loop.run_until_complete(self.__run_trials(trials))
+    finally:
+      loop.close()
+    self._flush_progress()
+    return (list(results), time.perf_counter() - start_time, None)
+
+  def _one_trial(self, random_seed: TrialSeed, debug: bool) -> List[Dict]:
+    """One trial of the game
+
+    Args:
+      random_seed: random seed
+      debug: whether to run the trial in debug mode
+
+    Returns:
+      result of one trial
+    """
+    (results, _, _) = self._trial_chunk([(0, random_seed)], debug)
+    return results[0][2]
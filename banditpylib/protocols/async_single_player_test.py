@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import OrdinaryBandit, SimulatedLatencyBandit
+from banditpylib.learners.ordinary_learner import EpsGreedy
+from .async_single_player import AsyncSinglePlayerProtocol
+from .utils import Protocol, seed_trial
+
+
+class TestAsyncSinglePlayerProtocol:
+  """Test asynchronous single player protocol"""
+
+  def test_same_results_as_sync(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    bandit = SimulatedLatencyBandit(ordinary_bandit,
+                                    latency=0.001,
+                                    jitter=0.002)
+    learner = EpsGreedy(arm_num=3, horizon=20)
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with AsyncSinglePlayerProtocol(bandit=bandit,
+                                   learners=[learner],
+                                   intermediate_regrets=[10],
+                                   concurrency=3) as async_player:
+      async_player.play(trials=6,
+                        output_filename=output_filename,
+                        processes=1,
+                        chunk_size=6,
+                        resumable=True)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    assert len(records) == 2 * 6
+    assert records[0]['bandit'] == 'simulated_latency_ordinary_bandit'
+    with open(Protocol.manifest_filename(output_filename), 'r') as f:
+      random_seeds = [json.loads(line)['seed'] for line in f]
+
+    # trials interleave but each of them gets the same result as the one run
+    # alone with the same random seed
+    final_regrets = []
+    for random_seed in random_seeds:
+      seed_trial(random_seed, ordinary_bandit, learner)
+      ordinary_bandit.reset()
+      learner.reset()
+      while True:
+        actions = learner.actions(ordinary_bandit.context())
+        if actions is None:
+          break
+        learner.update(ordinary_bandit.feed(actions))
+      final_regrets.append(ordinary_bandit.regret(learner.goal))
+    assert [record['regret'] for record in records
+            if record['rounds'] == 20] == final_regrets
@@ -0,0 +1,79 @@
+from multiprocessing.pool import Pool
+from typing import Any, List, Optional, Tuple, Union
+
+from banditpylib.bandits import OrdinaryBanditItf
+from banditpylib.learners.ordinary_learner import OrdinaryLearner
+from .checkpoint import CheckpointSchedule
+from .single_player import SinglePlayerProtocol
+
+
+class BatchedSinglePlayerProtocol(SinglePlayerProtocol):
+  """Batched single player protocol
+
+  This protocol plays the same game as
+  :class:`banditpylib.protocols.SinglePlayerProtocol` in the ordinary
+  multi-armed bandit except that the learner commits to the pulls of at most
+  `batch_size` time steps in each round by
+  :func:`banditpylib.learners.ordinary_learner.OrdinaryLearner.batch_actions`
+  and is updated once with the feedback of all of them. The number of rounds
+  in the records is the number of batches, which is about `batch_size` times
+  fewer than the one of :class:`banditpylib.protocols.SinglePlayerProtocol`.
+
+  .. note::
+    Only learners supporting batched feedback can be used i.e., `UCB`,
+    `MOSS`, `UCBV`, `EpsGreedy`, `ThompsonSampling` and `Uniform` in
+    :mod:`banditpylib.learners.ordinary_learner`.
+  """
+  def __init__(self,
+               bandit: OrdinaryBanditItf,
+               learners: List[OrdinaryLearner],
+               batch_size: int,
+               intermediate_regrets: Union[List[int],
+                                           CheckpointSchedule] = None,
+               pool: Pool = None,
+               instrument: bool = False,
+               trial_timeout: Optional[float] = None,
+               max_steps: Optional[int] = None):
+    """
+    Args:
+      bandit: bandit environment
+      learners: learners to be compared with
+      batch_size: maximum number of time steps of a batch
+      intermediate_regrets: a list of intermediate rounds or a
+        :class:`banditpylib.protocols.CheckpointSchedule` to record
+        intermediate regrets
+      pool: pool of worker processes used to run the trials
+      instrument: whether to measure the time spent in each phase
+      trial_timeout: maximum seconds of one trial
+      max_steps: maximum number of actions executed in one trial
+    """
+    super().__init__(bandit=bandit,
+                     learners=learners,
+                     intermediate_regrets=intermediate_regrets,
+                     pool=pool,
+                     instrument=instrument,
+                     trial_timeout=trial_timeout,
+                     max_steps=max_steps)
+    for learner in learners:
+      if not isinstance(learner, OrdinaryLearner):
+        raise Exception('Learner %s is not an ordinary learner!' %
+                        learner.name)
+    if batch_size < 1:
+      raise Exception('Batch size %d is less than 1!' % batch_size)
+    self.__batch_size = batch_size
+
+  @property
+  def name(self) -> str:
+    """default protocol name"""
+    return 'batched_single_player_protocol'
+
+  def _actions(self, context: Any) -> Optional[List[Tuple[Any, int]]]:
+    """
+    Args:
+      context: current state of the bandit environment
+
+    Returns:
+      pulls of the current learner for the next batch
+    """
+    del context
+    return self.current_learner.batch_actions(self.__batch_size)
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import OrdinaryBandit
+from banditpylib.learners.ordinary_learner import EpsGreedy, UCB, \
+    ThompsonSampling, Uniform, UCBV, MOSS
+from .batched_single_player import BatchedSinglePlayerProtocol
+
+
+class TestBatchedSinglePlayer:
+  """Test batched single player protocol"""
+
+  def test_simple_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    horizon = 100
+    learners = [
+        EpsGreedy(arm_num=3, horizon=horizon),
+        UCB(arm_num=3, horizon=horizon),
+        ThompsonSampling(arm_num=3, horizon=horizon),
+        Uniform(arm_num=3, horizon=horizon),
+        UCBV(arm_num=3, horizon=horizon),
+        MOSS(arm_num=3, horizon=horizon)
+    ]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with BatchedSinglePlayerProtocol(bandit=ordinary_bandit,
+                                     learners=learners,
+                                     batch_size=10) as batched_player:
+      batched_player.play(trials=2, output_filename=output_filename)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    assert len(records) == 6 * 2
+    for record in records:
+      assert record['total_actions'] == horizon
+      # at most one round for each arm not pulled yet and one for each batch
+      assert record['rounds'] <= 3 + 10
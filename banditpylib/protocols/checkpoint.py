@@ -0,0 +1,184 @@
+from abc import ABC, abstractmethod
+import math
+from typing import List, Union
+
+import numpy as np
+
+
+class CheckpointCursor:
+  """Cursor over the checkpoints of a trial
+
+  The cursor points to the next checkpoint. Since the number of rounds never
+  decreases during a trial, each query only compares with the next checkpoint
+  and the cursor moves forward, which takes amortized :math:`O(1)` time.
+  """
+  def __init__(self, points: List[int]):
+    """
+    Args:
+      points: checkpoints in increasing order
+    """
+    self.__points = points
+    self.__index = 0
+    self.__next = points[0] if points else math.inf
+
+  @property
+  def next_checkpoint(self) -> Union[int, float]:
+    """next checkpoint. `inf` is returned when there is no checkpoint left."""
+    return self.__next
+
+  def __advance(self):
+    self.__index += 1
+    self.__next = self.__points[self.__index] \
+        if self.__index < len(self.__points) else math.inf
+
+  def reached(self, rounds: int) -> bool:
+    """Check whether a checkpoint is reached
+
+    The checkpoints up to `rounds` are consumed.
+
+    Args:
+      rounds: current number of rounds
+
+    Returns:
+      `True` if `rounds` is a checkpoint not reached before
+    """
+    if rounds < self.__next:
+      return False
+    # skip the checkpoints passed
+    while self.__next < rounds:
+      self.__advance()
+    if self.__next == rounds:
+      self.__advance()
+      return True
+    return False
+
+
+class CheckpointSchedule(ABC):
+  """Schedule of checkpoints
+
+  Checkpoints are numbers of rounds at which the intermediate regrets are
+  recorded.
+  """
+  def __init__(self):
+    self.__points: List[int] = sorted(
+        set(int(point) for point in self._points() if point >= 0))
+
+  @abstractmethod
+  def _points(self) -> List[int]:
+    """
+    Returns:
+      checkpoints of the schedule
+    """
+
+  def points(self) -> List[int]:
+    """
+    Returns:
+      checkpoints in increasing order
+    """
+    return self.__points
+
+  def __len__(self) -> int:
+    return len(self.__points)
+
+  def cursor(self) -> CheckpointCursor:
+    """
+    Returns:
+      cursor pointing to the first checkpoint
+    """
+    return CheckpointCursor(self.__points)
+
+
+class ExplicitSchedule(CheckpointSchedule):
+  """Schedule with explicitly given checkpoints"""
+  def __init__(self, points: List[int]):
+    """
+    Args:
+      points: checkpoints
+    """
+    self.__given_points = list(points)
+    super().__init__()
+
+  def _points(self) -> List[int]:
+    """
+    Returns:
+      checkpoints of the schedule
+    """
+    return self.__given_points
+
+
+class LinearSchedule(CheckpointSchedule):
+  """Schedule with checkpoints evenly spaced by a stride
+
+  Checkpoints are `start`, `start + step`, ... up to `stop` (inclusive).
+  """
+  def __init__(self, stop: int, step: int, start: int = 0):
+    """
+    Args:
+      stop: last possible checkpoint
+      step: stride between two checkpoints
+      start: first checkpoint
+    """
+    if step < 1:
+      raise Exception('Step %d is less than 1!' % step)
+    self.__stop = stop
+    self.__step = step
+    self.__start = start
+    super().__init__()
+
+  def _points(self) -> List[int]:
+    """
+    Returns:
+      checkpoints of the schedule
+    """
+    return list(range(self.__start, self.__stop + 1, self.__step))
+
+
+class GeometricSchedule(CheckpointSchedule):
+  """Schedule with log-spaced checkpoints
+
+  `num` checkpoints between `start` and `stop` (inclusive) spaced evenly on a
+  log scale. Duplicates after rounding to integers are removed.
+  """
+  def __init__(self, stop: int, num: int, start: int = 1):
+    """
+    Args:
+      stop: last checkpoint
+      num: number of checkpoints
+      start: first checkpoint which should be at least 1
+    """
+    if start < 1:
+      raise Exception('Start %d is less than 1!' % start)
+    if stop < start:
+      raise Exception('Stop %d is less than start %d!' % (stop, start))
+    if num < 1:
+      raise Exception('Number of checkpoints %d is less than 1!' % num)
+    self.__stop = stop
+    self.__num = num
+    self.__start = start
+    super().__init__()
+
+  def _points(self) -> List[int]:
+    """
+    Returns:
+      checkpoints of the schedule
+    """
+    return np.rint(np.geomspace(self.__start, self.__stop,
+                                self.__num)).astype(int).tolist()
+
+
+def as_schedule(
+    intermediate_regrets: Union[List[int], CheckpointSchedule, None]
+) -> CheckpointSchedule:
+  """Convert intermediate regrets to a schedule
+
+  Args:
+    intermediate_regrets: a list of checkpoints, a schedule or `None`
+
+  Returns:
+    schedule of checkpoints
+  """
+  if intermediate_regrets is None:
+    return ExplicitSchedule([])
+  if isinstance(intermediate_regrets, CheckpointSchedule):
+    return intermediate_regrets
+  return ExplicitSchedule(intermediate_regrets)
@@ -0,0 +1,26 @@
+from .checkpoint import ExplicitSchedule, LinearSchedule, GeometricSchedule
+
+
+class TestCheckpointSchedule:
+  """Test checkpoint schedules"""
+
+  def test_schedules(self):
+    assert ExplicitSchedule([5, 0, 5, 3]).points() == [0, 3, 5]
+    assert LinearSchedule(stop=10, step=5).points() == [0, 5, 10]
+    assert LinearSchedule(stop=9, step=4, start=1).points() == [1, 5, 9]
+    points = GeometricSchedule(stop=1000, num=4).points()
+    assert points == [1, 10, 100, 1000]
+    assert len(GeometricSchedule(stop=3, num=10)) == 3
+
+  def test_cursor(self):
+    cursor = ExplicitSchedule([0, 2, 3, 6]).cursor()
+    assert cursor.reached(0)
+    # a checkpoint is only reached once
+    assert not cursor.reached(0)
+    assert not cursor.reached(1)
+    assert cursor.reached(2)
+    # checkpoint 3 is skipped
+    assert not cursor.reached(4)
+    assert cursor.next_checkpoint == 6
+    assert cursor.reached(6)
+    assert not cursor.reached(7)
@@ -0,0 +1,133 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Delay(ABC):
+  """Distribution of feedback delays
+
+  Delays are measured in time steps i.e., actions executed by the bandit
+  environment. Feedback of an action with delay 0 arrives before the next
+  actions are taken. Delays are drawn in blocks by :func:`sample`.
+  """
+  @property
+  @abstractmethod
+  def name(self) -> str:
+    """delay name"""
+
+  @abstractmethod
+  def sample(self, size: int, random_state=None) -> np.ndarray:
+    """
+    Args:
+      size: number of delays to draw
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the delays. The global random state of numpy is used if it is
+        `None`.
+
+    Returns:
+      non-negative integer delays
+    """
+
+
+class ConstantDelay(Delay):
+  """Constant delay"""
+  def __init__(self, delay: int):
+    """
+    Args:
+      delay: delay of every action
+    """
+    if delay < 0:
+      raise Exception('Delay %d is negative!' % delay)
+    self.__delay = delay
+
+  @property
+  def name(self) -> str:
+    """delay name"""
+    return 'constant_delay'
+
+  def sample(self, size: int, random_state=None) -> np.ndarray:
+    """
+    Args:
+      size: number of delays to draw
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the delays. The global random state of numpy is used if it is
+        `None`.
+
+    Returns:
+      non-negative integer delays
+    """
+    del random_state
+    return np.full(size, self.__delay, dtype=np.int64)
+
+
+class GeometricDelay(Delay):
+  """Geometric delay
+
+  The delay is the number of failures before the first success of Bernoulli
+  trials with success probability :math:`\\frac{1}{1 + m}`, whose mean is
+  :math:`m`.
+  """
+  def __init__(self, mean: float):
+    """
+    Args:
+      mean: mean delay
+    """
+    if mean < 0:
+      raise Exception('Mean delay %.2f is negative!' % mean)
+    self.__mean = mean
+
+  @property
+  def name(self) -> str:
+    """delay name"""
+    return 'geometric_delay'
+
+  def sample(self, size: int, random_state=None) -> np.ndarray:
+    """
+    Args:
+      size: number of delays to draw
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the delays. The global random state of numpy is used if it is
+        `None`.
+
+    Returns:
+      non-negative integer delays
+    """
+    return (np.random if random_state is None else random_state).geometric(
+        1 / (1 + self.__mean), size=size) - 1
+
+
+class UniformDelay(Delay):
+  """Delay drawn uniformly from `[low, high]`"""
+  def __init__(self, low: int, high: int):
+    """
+    Args:
+      low: minimum delay
+      high: maximum delay
+    """
+    if low < 0:
+      raise Exception('Minimum delay %d is negative!' % low)
+    if high < low:
+      raise Exception('Maximum delay %d is less than minimum delay %d!' %
+                      (high, low))
+    self.__low = low
+    self.__high = high
+
+  @property
+  def name(self) -> str:
+    """delay name"""
+    return 'uniform_delay'
+
+  def sample(self, size: int, random_state=None) -> np.ndarray:
+    """
+    Args:
+      size: number of delays to draw
+      random_state: random state or :class:`numpy.random.Generator` used to
+        draw the delays. The global random state of numpy is used if it is
+        `None`.
+
+    Returns:
+      non-negative integer delays
+    """
+    return self.__low + (np.random if random_state is None else
+                         random_state).choice(self.__high - self.__low + 1,
+                                              size=size)
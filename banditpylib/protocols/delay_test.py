@@ -0,0 +1,16 @@
+import numpy as np
+
+from .delay import ConstantDelay, GeometricDelay, UniformDelay
+
+
+class TestDelay:
+  """Test delays"""
+
+  def test_sample(self):
+    np.random.seed(0)
+    assert list(ConstantDelay(3).sample(4)) == [3, 3, 3, 3]
+    delays = GeometricDelay(mean=5).sample(100000)
+    assert delays.min() >= 0
+    assert abs(delays.mean() - 5) < 0.1
+    delays = UniformDelay(low=2, high=4).sample(1000)
+    assert set(delays.tolist()) == {2, 3, 4}
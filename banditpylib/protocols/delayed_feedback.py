@@ -0,0 +1,177 @@
+import heapq
+import itertools
+from multiprocessing.pool import Pool
+from typing import List, Dict, Union
+
+import numpy as np
+
+from absl import logging
+
+from banditpylib.bandits import OrdinaryBanditItf
+from banditpylib.learners.ordinary_learner import OrdinaryLearner
+from .checkpoint import CheckpointSchedule, as_schedule
+from .delay import Delay
+from .utils import Protocol, TrialSeed, seed_trial, trial_seed_sequence
+
+
+class DelayedFeedbackProtocol(Protocol):
+  """Delayed feedback protocol
+
+  This protocol simulates the ordinary multi-armed bandit in which the
+  feedback of an action arrives some time steps after the action is taken.
+  During each round, the protocol runs the following steps in sequence.
+
+  * update the learner with the feedback arrived
+  * ask the learner for actions
+  * send the actions to the environment for execution and hold their feedback
+    until their delays drawn from `delay` pass
+
+  The learner keeps acting on stale statistics while feedback is pending.
+  Pending feedback is kept in a heap ordered by the time it arrives, so a
+  round costs :math:`O(\\log n)` time with :math:`n` pending actions. The
+  final record of each trial has the maximum number of pending actions as
+  `max_pending`. Delays are drawn from their own random number generator, so
+  with delay 0, the game is the same as the one of
+  :class:`banditpylib.protocols.SinglePlayerProtocol` given the same seed.
+
+  .. note::
+    Only learners supporting delayed feedback can be used i.e., `UCB`,
+    `MOSS`, `UCBV`, `EpsGreedy`, `ThompsonSampling` and `Uniform` in
+    :mod:`banditpylib.learners.ordinary_learner`.
+  """
+  # number of delays drawn at a time
+  DELAY_BLOCK = 4096
+
+  def __init__(self,
+               bandit: OrdinaryBanditItf,
+               learners: List[OrdinaryLearner],
+               delay: Delay,
+               intermediate_regrets: Union[List[int],
+                                           CheckpointSchedule] = None,
+               pool: Pool = None):
+    """
+    Args:
+      bandit: bandit environment
+      learners: learners to be compared with
+      delay: distribution of feedback delays
+      intermediate_regrets: a list of intermediate rounds or a
+        :class:`banditpylib.protocols.CheckpointSchedule` to record
+        intermediate regrets
+      pool: pool of worker processes used to run the trials
+    """
+    super().__init__(bandit=bandit, learners=learners, pool=pool)
+    for learner in learners:
+      if not isinstance(learner, OrdinaryLearner):
+        raise Exception('Learner %s is not an ordinary learner!' %
+                        learner.name)
+    self.__delay = delay
+    self.__intermediate_regrets = as_schedule(intermediate_regrets)
+
+  @property
+  def name(self) -> str:
+    """default protocol name"""
+    return 'delayed_feedback_protocol'
+
+  def _one_trial(self, random_seed: TrialSeed, debug: bool) -> List[Dict]:
+    """One trial of the game
+
+    Args:
+      random_seed: random seed
+      debug: whether to run the trial in debug mode
+
+    Returns:
+      result of one trial
+    """
+    if debug:
+      logging.set_verbosity(logging.DEBUG)
+    bandit = self.bandit
+    learner = self.current_learner
+    seed_trial(random_seed, bandit, learner)
+    # delays are drawn from their own child of the seed sequence of the trial
+    # next to the ones of the bandit environment and the learner, so the
+    # rewards do not depend on the delays drawn
+    delay_rng = np.random.default_rng(
+        trial_seed_sequence(random_seed).spawn(3)[2])
+    bandit.reset()
+    learner.reset()
+
+    # samples of the checkpoints and the final one
+    samples = len(self.__intermediate_regrets) + 1
+    sample_rounds = np.zeros(samples, dtype=np.int64)
+    sample_total_actions = np.zeros(samples, dtype=np.int64)
+    sample_regrets = np.zeros(samples)
+    recorded = 0
+    checkpoints = self.__intermediate_regrets.cursor()
+
+    # number of rounds to communicate with the bandit environment
+    adaptive_rounds = 0
+    # total actions executed by the bandit environment
+    total_actions = 0
+
+    # pending feedback ordered by the time step it arrives. The sequence
+    # number keeps the feedback arriving at the same time in order.
+    pending: List = []
+    sequence = itertools.count()
+    max_pending = 0
+    delays: List[int] = []
+    next_delay = 0
+
+    def record_data():
+      nonlocal recorded
+      sample_rounds[recorded] = adaptive_rounds
+      sample_total_actions[recorded] = total_actions
+      sample_regrets[recorded] = bandit.regret(learner.goal)
+      recorded += 1
+
+    while True:
+      # deliver the feedback arrived
+      if pending and pending[0][0] <= total_actions:
+        arrived_actions = []
+        arrived_feedback = []
+        while pending and pending[0][0] <= total_actions:
+          (_, _, action, arm_feedback) = heapq.heappop(pending)
+          arrived_actions.append(action)
+          arrived_feedback.append(arm_feedback)
+        learner.update(arrived_feedback, actions=arrived_actions)
+
+      actions = learner.actions(bandit.context())
+
+      # stop the game if actions returned by the learner is None
+      if actions is None:
+        break
+
+      # record intermediate regrets
+      if checkpoints.reached(adaptive_rounds):
+        record_data()
+
+      # the bandit environment gives no feedback of the actions without
+      # pulls, which are dropped so that the actions and the feedback pair up
+      actions = [action for action in actions if action[1] >= 1]
+      feedback = bandit.feed(actions)
+      for (action, arm_feedback) in zip(actions, feedback):
+        total_actions += int(action[1])
+        if next_delay == len(delays):
+          delays = self.__delay.sample(self.DELAY_BLOCK, delay_rng).tolist()
+          next_delay = 0
+        heapq.heappush(pending, (total_actions + delays[next_delay],
+                                 next(sequence), action, arm_feedback))
+        next_delay += 1
+      max_pending = max(max_pending, len(pending))
+      adaptive_rounds += 1
+
+    # record final regret
+    record_data()
+    one_trial_data = [
+        dict({
+            'bandit': bandit.name,
+            'learner': learner.name,
+            'rounds': rounds,
+            'total_actions': total,
+            'regret': regret
+        }) for (rounds, total, regret) in zip(
+            sample_rounds[:recorded].tolist(),
+            sample_total_actions[:recorded].tolist(),
+            sample_regrets[:recorded].tolist())
+    ]
+    one_trial_data[-1]['max_pending'] = max_pending
+    return one_trial_data
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import OrdinaryBandit
+from banditpylib.learners.ordinary_learner import UCB, EpsGreedy
+from .delay import Delay, ConstantDelay, GeometricDelay
+from .delayed_feedback import DelayedFeedbackProtocol
+from .utils import Protocol, seed_trial
+
+
+class _RandomZeroDelay(Delay):
+  """Delay which is always 0 but still draws random numbers"""
+  @property
+  def name(self) -> str:
+    return 'random_zero_delay'
+
+  def sample(self, size: int, random_state=None) -> np.ndarray:
+    random_state.random(size)
+    return np.zeros(size, dtype=np.int64)
+
+
+class _IdleArmEpsGreedy(EpsGreedy):
+  """Epsilon-greedy learner which also asks for zero pulls of arm 0"""
+  def actions(self, context=None):
+    actions = super().actions(context)
+    return None if actions is None else [(0, 0)] + actions
+
+
+class TestDelayedFeedback:
+  """Test delayed feedback protocol"""
+
+  def test_no_delay(self):
+    self.check_no_delay(ConstantDelay(0))
+    # delays drawn do not change the rewards
+    self.check_no_delay(_RandomZeroDelay())
+
+  @staticmethod
+  def check_no_delay(delay: Delay):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learner = EpsGreedy(arm_num=3, horizon=50)
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with DelayedFeedbackProtocol(bandit=ordinary_bandit,
+                                 learners=[learner],
+                                 delay=delay) as delayed_player:
+      delayed_player.play(trials=3,
+                          output_filename=output_filename,
+                          resumable=True)
+    with open(output_filename, 'r') as f:
+      records = {json.loads(line)['regret'] for line in f}
+    with open(Protocol.manifest_filename(output_filename), 'r') as f:
+      random_seeds = [json.loads(line)['seed'] for line in f]
+
+    # the game is the same as the one without delay
+    final_regrets = set()
+    for random_seed in random_seeds:
+      seed_trial(random_seed, ordinary_bandit, learner)
+      ordinary_bandit.reset()
+      learner.reset()
+      while True:
+        actions = learner.actions()
+        if actions is None:
+          break
+        learner.update(ordinary_bandit.feed(actions))
+      final_regrets.add(ordinary_bandit.regret(learner.goal))
+    assert records == final_regrets
+
+  def test_delay(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [
+        UCB(arm_num=3, horizon=1000),
+        EpsGreedy(arm_num=3, horizon=1000)
+    ]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with DelayedFeedbackProtocol(bandit=ordinary_bandit,
+                                 learners=learners,
+                                 delay=GeometricDelay(mean=50),
+                                 intermediate_regrets=[500]) as delayed_player:
+      delayed_player.play(trials=2, output_filename=output_filename)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    final_records = [record for record in records if 'max_pending' in record]
+    assert len(records) == 2 * 2 * 2
+    for record in final_records:
+      assert record['total_actions'] == 1000
+      # feedback of the last actions is still pending
+      assert record['max_pending'] > 1
+
+  def test_zero_pulls(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [
+        EpsGreedy(arm_num=3, horizon=100, name='eps_greedy'),
+        _IdleArmEpsGreedy(arm_num=3, horizon=100, name='idle_arm_eps_greedy')
+    ]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with DelayedFeedbackProtocol(bandit=ordinary_bandit,
+                                 learners=learners,
+                                 delay=ConstantDelay(5)) as delayed_player:
+      delayed_player.play(trials=3,
+                          output_filename=output_filename,
+                          common_random_numbers=True)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    # actions without pulls change nothing
+    regrets = {}
+    for record in records:
+      regrets.setdefault(record['learner'], {})[record['trial']] = \
+          (record['total_actions'], record['regret'])
+    assert regrets['eps_greedy'] == regrets['idle_arm_eps_greedy']
@@ -0,0 +1,647 @@
+"""Distributed execution of trials
+
+A :class:`DistributedPool` serves trial tasks and collects their results over
+TCP through a :class:`multiprocessing.managers.BaseManager` server. Worker
+processes on any host can connect to the server and run the tasks. Tasks of a
+worker which dies or disconnects are served again to the other workers. Start
+a worker on another host by::
+
+  BANDITPYLIB_AUTHKEY=<authkey> python -m banditpylib.protocols.distributed \\
+      <host>:<port>
+"""
+import argparse
+import itertools
+import math
+import multiprocessing
+from multiprocessing.managers import BaseManager
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from absl import logging
+
+from . import worker
+
+# environment variable of the authentication key used by the workers
+AUTHKEY_ENV = 'BANDITPYLIB_AUTHKEY'
+# seconds between two heartbeats of a worker
+HEARTBEAT_INTERVAL = 1.0
+
+
+class _PayloadRegistry:
+  """Registry of the protocols published for the workers"""
+  def __init__(self):
+    self.__payloads: Dict[str, bytes] = {}
+
+  def put(self, key: str, payload: bytes):
+    """
+    Args:
+      key: key of the payload
+      payload: pickled protocol
+    """
+    self.__payloads[key] = payload
+
+  def get(self, key: str) -> bytes:
+    """
+    Args:
+      key: key of the payload
+
+    Returns:
+      pickled protocol
+    """
+    return self.__payloads[key]
+
+  def remove(self, key: str):
+    """
+    Args:
+      key: key of the payload
+    """
+    self.__payloads.pop(key, None)
+
+
+class _TaskBoard:
+  """Board of the tasks served to the workers
+
+  A task taken by a worker is kept on the board until the worker hands in its
+  result, so that the task can be served again if the worker is lost. Workers
+  send heartbeats to the board, and a worker is lost once its heartbeats stop.
+  """
+  def __init__(self, results: queue.Queue):
+    """
+    Args:
+      results: queue of the results of the tasks
+    """
+    self.__tasks: queue.Queue = queue.Queue()
+    self.__results = results
+    self.__lock = threading.Lock()
+    # tasks taken by each worker keyed by the task id
+    self.__in_flight: Dict[str, Dict[int, Any]] = {}
+    # time of the last heartbeat of each worker
+    self.__heartbeats: Dict[str, float] = {}
+
+  def put(self, task: Tuple[int, Callable, Tuple]):
+    """
+    Args:
+      task: id, function and arguments of the task
+    """
+    self.__tasks.put(task)
+
+  def take(self, worker_id: str) -> Optional[Tuple[int, Callable, Tuple]]:
+    """Take a task
+
+    Args:
+      worker_id: id of the worker
+
+    Returns:
+      id, function and arguments of the task. `None` means the board is
+      stopped.
+    """
+    task = self.__tasks.get()
+    if task is None:
+      # wake up the other workers
+      self.__tasks.put(None)
+      return None
+    with self.__lock:
+      self.__in_flight.setdefault(worker_id, {})[task[0]] = task
+    return task
+
+  def finish(self, worker_id: str, result: Tuple[int, bool, Any]):
+    """Hand in the result of a task
+
+    Args:
+      worker_id: id of the worker
+      result: id of the task, whether the task succeeds and its value
+    """
+    with self.__lock:
+      self.__in_flight.get(worker_id, {}).pop(result[0], None)
+    self.__results.put(result)
+
+  def heartbeat(self, worker_id: str):
+    """
+    Args:
+      worker_id: id of the worker
+    """
+    with self.__lock:
+      self.__heartbeats[worker_id] = time.monotonic()
+
+  def requeue(self, worker_id: str) -> int:
+    """Serve the tasks of a lost worker again
+
+    Args:
+      worker_id: id of the worker
+
+    Returns:
+      number of tasks served again
+    """
+    with self.__lock:
+      self.__heartbeats.pop(worker_id, None)
+      tasks = self.__in_flight.pop(worker_id, {})
+    for task in tasks.values():
+      self.__tasks.put(task)
+    return len(tasks)
+
+  def requeue_lost(self, timeout: float) -> Dict[str, int]:
+    """Serve the tasks of the workers without heartbeats again
+
+    Args:
+      timeout: seconds without heartbeats after which a worker is lost
+
+    Returns:
+      number of tasks served again for each lost worker
+    """
+    now = time.monotonic()
+    with self.__lock:
+      lost_workers = [
+          worker_id
+          for worker_id in set(self.__in_flight) | set(self.__heartbeats)
+          if now - self.__heartbeats.get(worker_id, -math.inf) > timeout
+      ]
+    return {worker_id: self.requeue(worker_id) for worker_id in lost_workers}
+
+  def stop(self):
+    """Stop the workers once the tasks put before are taken"""
+    self.__tasks.put(None)
+
+
+# objects served by the manager, which are created in the server process
+_SERVED: Dict[str, Any] = {}
+
+
+def _served(name: str, factory: Callable[[], Any]) -> Any:
+  """
+  Args:
+    name: name of the object
+    factory: function creating the object
+
+  Returns:
+    object served by the manager
+  """
+  if name not in _SERVED:
+    _SERVED[name] = factory()
+  return _SERVED[name]
+
+
+def _result_queue():
+  return _served('result_queue', queue.Queue)
+
+
+def _task_board():
+  return _served('task_board', lambda: _TaskBoard(_result_queue()))
+
+
+def _payload_registry():
+  return _served('payload_registry', _PayloadRegistry)
+
+
+class _TrialManager(BaseManager):
+  """Manager serving the tasks, the results and the published protocols"""
+
+
+_TrialManager.register('result_queue', callable=_result_queue)
+_TrialManager.register('task_board', callable=_task_board)
+_TrialManager.register('payload_registry', callable=_payload_registry)
+
+
+class DistributedResult:
+  """Result of a task run by a distributed worker
+
+  It provides the same interfaces as :class:`multiprocessing.pool.AsyncResult`
+  used by the protocols.
+  """
+  def __init__(self,
+               callback: Optional[Callable[[Any], None]],
+               on_wait: Optional[Callable[[], None]] = None):
+    """
+    Args:
+      callback: function called with the value when the task succeeds
+      on_wait: function called by the waiting thread every
+        :data:`HEARTBEAT_INTERVAL` seconds until the task is finished
+    """
+    self.__callback = callback
+    self.__on_wait = on_wait
+    self.__event = threading.Event()
+    self.__success = False
+    self.__value: Any = None
+
+  def _set(self, success: bool, value: Any):
+    """Set the result of the task
+
+    Args:
+      success: whether the task succeeds
+      value: value returned by the task or the exception raised
+    """
+    (self.__success, self.__value) = (success, value)
+    try:
+      if success and self.__callback is not None:
+        self.__callback(value)
+    finally:
+      # the waiters are woken up even if the callback fails
+      self.__event.set()
+
+  def ready(self) -> bool:
+    """
+    Returns:
+      whether the task is finished
+    """
+    return self.__event.is_set()
+
+  def successful(self) -> bool:
+    """
+    Returns:
+      whether the task succeeds
+    """
+    if not self.ready():
+      raise Exception('Result is not ready!')
+    return self.__success
+
+  def wait(self, timeout: Optional[float] = None):
+    """Wait for the task to finish
+
+    Args:
+      timeout: maximum seconds to wait
+    """
+    if self.__on_wait is None:
+      self.__event.wait(timeout)
+      return
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+      self.__on_wait()
+      interval = HEARTBEAT_INTERVAL if deadline is None else min(
+          HEARTBEAT_INTERVAL, deadline - time.monotonic())
+      if self.__event.wait(max(interval, 0)) or interval <= 0:
+        return
+
+  def get(self, timeout: Optional[float] = None) -> Any:
+    """
+    Args:
+      timeout: maximum seconds to wait
+
+    Returns:
+      value returned by the task. The exception raised by the task is raised
+      again.
+    """
+    self.wait(timeout)
+    if not self.ready():
+      raise multiprocessing.TimeoutError
+    if not self.__success:
+      raise self.__value
+    return self.__value
+
+
+class DistributedPool:
+  """Pool of distributed workers
+
+  The pool starts a manager server listening on `address`. Workers connect to
+  the server, take tasks from a shared queue and put the results back. Results
+  are handed to the callbacks by a background thread as
+  :class:`multiprocessing.pool.Pool` does, so the pool can be passed to the
+  protocols in place of a local pool. Protocols are published to a registry
+  served by the manager instead of temporary files, so that workers on other
+  hosts can load them.
+
+  Tasks are pickled by reference, so `banditpylib` should be installed on all
+  the hosts.
+
+  Workers send heartbeats to the server every :data:`HEARTBEAT_INTERVAL`
+  seconds. Tasks taken by a worker which exits or whose heartbeats stop for
+  `worker_timeout` seconds are served again, and local workers which exit are
+  replaced, so a lost worker never leaves the protocols waiting. A task may
+  then be run twice, and only its first result is kept. The background thread
+  only finds the local workers which exit. Their replacements are started by
+  the threads submitting or waiting for the tasks, so no process is forked
+  from the background thread, and none is started once the pool is closed.
+  """
+  def __init__(self,
+               address: Tuple[str, int] = ('', 0),
+               authkey: Optional[bytes] = None,
+               local_workers: int = 0,
+               worker_timeout: float = 30.0):
+    """
+    Args:
+      address: address the server listens on. Port 0 means a free port is
+        picked.
+      authkey: authentication key shared with the workers. A random key is
+        generated if it is `None`.
+      local_workers: number of worker processes started on this host
+      worker_timeout: seconds without heartbeats after which a worker is lost
+    """
+    if worker_timeout <= HEARTBEAT_INTERVAL:
+      raise Exception('Worker timeout %.2f is no greater than the heartbeat '
+                      'interval %.2f!' % (worker_timeout, HEARTBEAT_INTERVAL))
+    self.__worker_timeout = worker_timeout
+    self.__authkey = authkey if authkey is not None else os.urandom(16)
+    self.__manager = _TrialManager(address=address, authkey=self.__authkey)
+    self.__manager.start()
+    # pylint: disable=no-member
+    self.__tasks = self.__manager.task_board()  # type: ignore
+    self.__results = self.__manager.result_queue()  # type: ignore
+    self.__payloads = self.__manager.payload_registry()  # type: ignore
+
+    # results not finished keyed by the task id
+    self.__pending: Dict[int, DistributedResult] = {}
+    self.__lock = threading.Lock()
+    self.__task_ids = itertools.count()
+    # guards the local workers and whether the pool is closed
+    self.__worker_lock = threading.Lock()
+    # local worker processes keyed by the worker id
+    self.__workers: Dict[str, multiprocessing.Process] = {}
+    for _ in range(local_workers):
+      self.__start_worker()
+    # number of local workers which exit and are not replaced yet
+    self.__exited_workers = 0
+    self.__closed = False
+    # the thread is started after the workers are forked
+    self.__handler = threading.Thread(target=self.__handle_results,
+                                      daemon=True)
+    self.__handler.start()
+
+  @classmethod
+  def local(cls, processes: int) -> 'DistributedPool':
+    """Create a pool with local workers only
+
+    The server listens on 127.0.0.1, which is useful for testing.
+
+    Args:
+      processes: number of worker processes
+
+    Returns:
+      the pool
+    """
+    return cls(address=('127.0.0.1', 0), local_workers=processes)
+
+  @property
+  def address(self) -> Tuple[str, int]:
+    """address of the server"""
+    return self.__manager.address  # type: ignore
+
+  @property
+  def authkey(self) -> bytes:
+    """authentication key shared with the workers"""
+    return self.__authkey
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  def __start_worker(self):
+    """Start a local worker process
+
+    .. warning::
+      It should be called with :attr:`__worker_lock` held except in
+      :func:`__init__`.
+    """
+    worker_id = uuid.uuid4().hex
+    process = multiprocessing.Process(target=run_worker,
+                                      args=(self.address, self.__authkey,
+                                            worker_id),
+                                      daemon=True)
+    process.start()
+    self.__workers[worker_id] = process
+
+  def __replace_workers(self):
+    """Start the replacements of the local workers which exit"""
+    with self.__worker_lock:
+      if self.__closed:
+        return
+      for _ in range(self.__exited_workers):
+        self.__start_worker()
+      self.__exited_workers = 0
+
+  def __check_workers(self):
+    """Serve the tasks of the lost workers again and mark the local workers
+    which exit to be replaced"""
+    with self.__worker_lock:
+      if self.__closed:
+        return
+      exited_workers = {
+          worker_id: process
+          for (worker_id, process) in self.__workers.items()
+          if not process.is_alive()
+      }
+      for worker_id in exited_workers:
+        del self.__workers[worker_id]
+      self.__exited_workers += len(exited_workers)
+    for (worker_id, process) in exited_workers.items():
+      requeued = self.__tasks.requeue(worker_id)
+      logging.warning(
+          'local worker %s exits with code %s and %d tasks are served again',
+          worker_id, process.exitcode, requeued)
+    for (worker_id,
+         requeued) in self.__tasks.requeue_lost(self.__worker_timeout).items():
+      if requeued > 0:
+        logging.warning('worker %s is lost and %d tasks are served again',
+                        worker_id, requeued)
+
+  def __handle_results(self):
+    last_check = time.monotonic()
+    while True:
+      try:
+        result = self.__results.get(timeout=HEARTBEAT_INTERVAL)
+      except queue.Empty:
+        result = False
+      except (EOFError, OSError):
+        break
+      # `None` is put by `close`
+      if result is None:
+        break
+      if time.monotonic() - last_check >= HEARTBEAT_INTERVAL:
+        last_check = time.monotonic()
+        try:
+          self.__check_workers()
+        except (EOFError, OSError):
+          break
+      if result is False:
+        continue
+      (task_id, success, value) = result
+      with self.__lock:
+        async_result = self.__pending.pop(task_id, None)
+      # the task is run again after its worker is lost and it has been
+      # finished before
+      if async_result is None:
+        continue
+      try:
+        async_result._set(success, value)  # pylint: disable=protected-access
+      except Exception as error:  # pylint: disable=broad-except
+        logging.error('callback of task %d fails: %s', task_id, error)
+
+  def publish(self, protocol) -> str:
+    """Publish a protocol for the workers
+
+    Args:
+      protocol: protocol to publish
+
+    Returns:
+      key of the published protocol
+    """
+    key = uuid.uuid4().hex
+    self.__payloads.put(
+        key, pickle.dumps(protocol, protocol=pickle.HIGHEST_PROTOCOL))
+    return key
+
+  def unpublish(self, key: str):
+    """Remove a published protocol
+
+    Args:
+      key: key of the published protocol
+    """
+    self.__payloads.remove(key)
+
+  def apply_async(self,
+                  func: Callable,
+                  args=(),
+                  callback: Optional[Callable[[Any], None]] = None) -> \
+      DistributedResult:
+    """Submit a task
+
+    Args:
+      func: function to run which should be importable by the workers
+      args: arguments of the function
+      callback: function called with the value returned by `func` in a
+        background thread
+
+    Returns:
+      result of the task
+    """
+    self.__replace_workers()
+    with self.__worker_lock:
+      if self.__closed:
+        raise Exception('Pool is closed!')
+    result = DistributedResult(callback, on_wait=self.__replace_workers)
+    with self.__lock:
+      task_id = next(self.__task_ids)
+      self.__pending[task_id] = result
+    self.__tasks.put((task_id, func, tuple(args)))
+    return result
+
+  def close(self):
+    """Stop the local workers and shut down the server
+
+    Workers on the other hosts exit once the server is shut down.
+    """
+    with self.__worker_lock:
+      if self.__closed:
+        return
+      self.__closed = True
+      workers = list(self.__workers.values())
+    self.__tasks.stop()
+    for process in workers:
+      process.join()
+    self.__results.put(None)
+    self.__handler.join()
+    self.__manager.shutdown()
+
+  def terminate(self):
+    """Same as :func:`close`"""
+    self.close()
+
+  def join(self):
+    """Workers are joined by :func:`close`"""
+
+
+def _send_heartbeats(tasks, worker_id: str, stopped: threading.Event):
+  """Send heartbeats of a worker until it stops
+
+  Args:
+    tasks: proxy of the task board
+    worker_id: id of the worker
+    stopped: event set when the worker stops
+  """
+  while not stopped.wait(HEARTBEAT_INTERVAL):
+    try:
+      tasks.heartbeat(worker_id)
+    except (EOFError, OSError):
+      break
+
+
+def run_worker(address: Tuple[str, int],
+               authkey: bytes,
+               worker_id: Optional[str] = None):
+  """Run tasks served by a :class:`DistributedPool`
+
+  The worker exits when the pool is closed or the server is shut down.
+
+  Args:
+    address: address of the server
+    authkey: authentication key of the server
+    worker_id: id of the worker. A random id is generated if it is `None`.
+  """
+  worker_id = worker_id if worker_id is not None else uuid.uuid4().hex
+  manager = _TrialManager(address=address, authkey=authkey)
+  manager.connect()
+  # pylint: disable=no-member
+  tasks = manager.task_board()  # type: ignore
+  payloads = manager.payload_registry()  # type: ignore
+  worker.set_loader(lambda key: pickle.loads(payloads.get(key)))
+
+  # heartbeats are sent by a background thread, which gets its own
+  # connection to the server, so they do not wait for the tasks
+  tasks.heartbeat(worker_id)
+  stopped = threading.Event()
+  threading.Thread(target=_send_heartbeats,
+                   args=(tasks, worker_id, stopped),
+                   daemon=True).start()
+  try:
+    while True:
+      try:
+        task = tasks.take(worker_id)
+      except (EOFError, OSError):
+        break
+      if task is None:
+        break
+      (task_id, func, args) = task
+      try:
+        result = (task_id, True, func(*args))
+      except Exception as error:  # pylint: disable=broad-except
+        result = (task_id, False, error)
+      try:
+        tasks.finish(worker_id, result)
+      except (EOFError, OSError):
+        break
+      except Exception as error:  # pylint: disable=broad-except
+        # the value can not be pickled
+        tasks.finish(worker_id, (task_id, False, Exception(str(error))))
+  finally:
+    stopped.set()
+
+
+def main(argv=None):
+  """Entry of a worker on another host
+
+  Args:
+    argv: command line arguments
+  """
+  parser = argparse.ArgumentParser(
+      prog='python -m banditpylib.protocols.distributed',
+      description='Run trials served by a distributed pool. The '
+      'authentication key is read from the environment variable %s.' %
+      AUTHKEY_ENV)
+  parser.add_argument('address', help='address of the server i.e., host:port')
+  parser.add_argument('--processes',
+                      type=int,
+                      default=1,
+                      help='number of worker processes')
+  args = parser.parse_args(argv)
+  (host, port) = args.address.rsplit(':', 1)
+  authkey = os.environ.get(AUTHKEY_ENV)
+  if authkey is None:
+    raise Exception('Environment variable %s is not set!' % AUTHKEY_ENV)
+  processes = [
+      multiprocessing.Process(target=run_worker,
+                              args=((host, int(port)), authkey.encode()))
+      for _ in range(args.processes)
+  ]
+  for process in processes:
+    process.start()
+  for process in processes:
+    process.join()
+
+
+if __name__ == '__main__':
+  sys.exit(main())
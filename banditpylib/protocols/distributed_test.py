@@ -0,0 +1,137 @@
+import json
+import multiprocessing
+from multiprocessing.pool import Pool
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import OrdinaryBandit
+from banditpylib.learners.ordinary_learner import EpsGreedy, UCB
+from .distributed import DistributedPool, run_worker
+from .single_player import SinglePlayerProtocol
+
+
+def _exit_once(filename: str) -> str:
+  """Kill the worker the first time it is called"""
+  if not os.path.exists(filename):
+    open(filename, 'w').close()
+    os._exit(1)
+  return 'done'
+
+
+def _hang_once(filename: str) -> str:
+  """Block the worker the first time it is called"""
+  if not os.path.exists(filename):
+    open(filename, 'w').close()
+    time.sleep(600)
+  return 'done'
+
+
+class TestDistributedPool:
+  """Test distributed pool"""
+
+  def test_apply_async(self):
+    with DistributedPool.local(processes=2) as pool:
+      assert pool.address[0] == '127.0.0.1'
+      values = []
+      results = [
+          pool.apply_async(sum, args=[[i, 1]], callback=values.append)
+          for i in range(5)
+      ]
+      assert [result.get() for result in results] == [1, 2, 3, 4, 5]
+      assert sorted(values) == [1, 2, 3, 4, 5]
+      # exceptions raised by the workers are raised again
+      with pytest.raises(ValueError):
+        pool.apply_async(int, args=['x']).get()
+
+  def test_single_player(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10), UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with DistributedPool.local(processes=2) as pool:
+      with SinglePlayerProtocol(bandit=ordinary_bandit,
+                                learners=learners,
+                                pool=pool) as single_player:
+        single_player.play(trials=5,
+                           output_filename=output_filename,
+                           processes=2,
+                           chunk_size=2)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    assert len(records) == 2 * 5
+    assert {record['learner'] for record in records
+           } == {'epsilon_greedy', 'ucb'}
+
+  def test_worker_exits(self, monkeypatch):
+    # threads starting the worker processes
+    threads = []
+    start = multiprocessing.Process.start
+
+    def recording_start(process):
+      threads.append(threading.current_thread())
+      start(process)
+
+    monkeypatch.setattr(multiprocessing.Process, 'start', recording_start)
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'exited')
+    with DistributedPool.local(processes=1) as pool:
+      # the task of the dead worker is run again by its replacement
+      assert pool.apply_async(_exit_once, args=[filename]).get(30) == 'done'
+      assert pool.apply_async(sum, args=[[1, 2]]).get(30) == 3
+    # the replacement is started by the waiting thread instead of the one
+    # handling the results
+    assert threads == [threading.current_thread()] * 2
+
+  def test_worker_lost(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'hung')
+    with DistributedPool(address=('127.0.0.1', 0),
+                         worker_timeout=2.0) as pool:
+      lost_worker = multiprocessing.Process(target=run_worker,
+                                            args=(pool.address, pool.authkey),
+                                            daemon=True)
+      lost_worker.start()
+      result = pool.apply_async(_hang_once, args=[filename])
+      while not os.path.exists(filename):
+        time.sleep(0.05)
+      # heartbeats stop once the worker is killed
+      lost_worker.terminate()
+      lost_worker.join()
+      worker = multiprocessing.Process(target=run_worker,
+                                       args=(pool.address, pool.authkey),
+                                       daemon=True)
+      worker.start()
+      assert result.get(30) == 'done'
+    worker.join()
+
+  def test_same_as_local_pool(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=20), UCB(arm_num=3, horizon=20)]
+    temp_dir = tempfile.TemporaryDirectory()
+    results = []
+    # a seeded play gives the same records no matter which pool runs it
+    for (name, pool) in [('distributed', DistributedPool.local(processes=2)),
+                         ('local', Pool(processes=2))]:
+      output_filename = os.path.join(temp_dir.name, '%s.json' % name)
+      with pool:
+        with SinglePlayerProtocol(bandit=ordinary_bandit,
+                                  learners=learners,
+                                  pool=pool) as single_player:
+          single_player.play(trials=6,
+                             output_filename=output_filename,
+                             processes=2,
+                             chunk_size=2,
+                             seed=11)
+      with open(output_filename, 'r') as f:
+        results.append(sorted(f.read().splitlines()))
+    assert len(results[0]) == 2 * 6
+    assert results[0] == results[1]
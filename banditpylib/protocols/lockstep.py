@@ -0,0 +1,225 @@
+import multiprocessing
+from multiprocessing.pool import Pool
+import time
+from typing import List, Dict, Optional, Union
+
+import numpy as np
+
+from absl import logging
+
+from banditpylib.bandits import OrdinaryBandit
+from banditpylib.learners.ordinary_learner import OrdinaryLearner
+from .checkpoint import CheckpointSchedule, as_schedule
+from .utils import Protocol, TrialSeed, seed_trial, trial_seeds
+from .writer import open_result_writer
+
+
+class LockstepProtocol(Protocol):
+  """Lockstep protocol
+
+  This protocol simulates the same game as
+  :class:`banditpylib.protocols.SinglePlayerProtocol` in the ordinary
+  multi-armed bandit. Instead of running the trials one by one, it advances a
+  batch of independent trials of the same learner in lockstep. During each
+  round, the protocol runs the following steps in sequence.
+
+  * ask the learner for the arm to pull in every trial
+  * send the arms to the environment which draws the rewards of all trials in
+    one go
+  * update the learner with the rewards of all trials
+
+  The statistics of all trials are stored as arrays of shape
+  `(trials, arm_num)`, so the cost of one round is shared by all trials. The
+  records dumped are the same as the ones of
+  :class:`banditpylib.protocols.SinglePlayerProtocol`.
+
+  .. note::
+    Only learners supporting lockstep simulation can be used i.e., `UCB`,
+    `MOSS`, `UCBV`, `EpsGreedy`, `ThompsonSampling` and `Uniform` in
+    :mod:`banditpylib.learners.ordinary_learner`.
+  """
+  def __init__(self,
+               bandit: OrdinaryBandit,
+               learners: List[OrdinaryLearner],
+               intermediate_regrets: Union[List[int],
+                                           CheckpointSchedule] = None,
+               pool: Pool = None):
+    """
+    Args:
+      bandit: bandit environment
+      learners: learners to be compared with
+      intermediate_regrets: a list of intermediate times or a
+        :class:`banditpylib.protocols.CheckpointSchedule` to record
+        intermediate regrets
+      pool: pool of worker processes used to run the trials
+    """
+    super().__init__(bandit=bandit, learners=learners, pool=pool)
+    if not isinstance(bandit, OrdinaryBandit):
+      raise Exception('Bandit %s is not an ordinary bandit!' % bandit.name)
+    for learner in learners:
+      if not isinstance(learner, OrdinaryLearner):
+        raise Exception('Learner %s is not an ordinary learner!' %
+                        learner.name)
+    # make sure the arms of the bandit environment can be simulated in lockstep
+    bandit.lockstep_reset(1)
+    self.__learners = learners
+    self.__intermediate_regrets = as_schedule(intermediate_regrets)
+
+  @property
+  def name(self) -> str:
+    """default protocol name"""
+    return 'lockstep_protocol'
+
+  def _lockstep_trials(self, learner: OrdinaryLearner, random_seed: TrialSeed,
+                       trials: int, debug: bool) -> List[Dict]:
+    """Trials of the game simulated in lockstep
+
+    Args:
+      learner: learner to run
+      random_seed: random seed
+      trials: number of trials to simulate in lockstep
+      debug: whether to run the trials in debug mode
+
+    Returns:
+      results of the trials
+    """
+    if debug:
+      logging.set_verbosity(logging.DEBUG)
+    seed_trial(random_seed, self.bandit, learner)
+
+    # reset the bandit environment and the learner
+    self.bandit.lockstep_reset(trials)
+    learner.lockstep_reset(trials)
+
+    # samples of the checkpoints and the final one
+    samples = len(self.__intermediate_regrets) + 1
+    sample_rounds = np.zeros(samples, dtype=np.int64)
+    sample_regrets = np.zeros((samples, trials))
+    recorded = 0
+    checkpoints = self.__intermediate_regrets.cursor()
+
+    # number of rounds to communicate with the bandit environment which equals
+    # to the total actions executed since one arm is pulled per round
+    adaptive_rounds = 0
+
+    def record_data():
+      nonlocal recorded
+      sample_rounds[recorded] = adaptive_rounds
+      sample_regrets[recorded] = self.bandit.lockstep_regret()
+      recorded += 1
+
+    while True:
+      arm_ids = learner.lockstep_actions()
+
+      # stop the game if actions returned by the learner is None
+      if arm_ids is None:
+        break
+
+      # record intermediate regrets
+      if checkpoints.reached(adaptive_rounds):
+        record_data()
+
+      rewards = self.bandit.lockstep_feed(arm_ids)
+      learner.lockstep_update(rewards)
+      adaptive_rounds += 1
+
+    # record final regret
+    record_data()
+    rounds_list = sample_rounds[:recorded].tolist()
+    # regrets of each trial in the order of the samples
+    regrets_list = sample_regrets[:recorded].T.tolist()
+    return [
+        dict({
+            'bandit': self.bandit.name,
+            'learner': learner.name,
+            'rounds': rounds,
+            'total_actions': rounds,
+            'regret': regret
+        }) for trial_regrets in regrets_list
+        for (rounds, regret) in zip(rounds_list, trial_regrets)
+    ]
+
+  def _one_trial(self, random_seed: TrialSeed, debug: bool) -> List[Dict]:
+    """One trial of the game
+
+    Args:
+      random_seed: random seed
+      debug: whether to run the trial in debug mode
+
+    Returns:
+      result of one trial
+    """
+    return self._lockstep_trials(self.current_learner, random_seed, 1, debug)
+
+  # pylint: disable=arguments-differ
+  def play(self,
+           trials: int,
+           output_filename: str,
+           processes=-1,
+           debug=False,
+           output_format: str = 'json',
+           seed: Optional[int] = None):
+    """Start playing the game
+
+    The trials of each learner are split into at most `processes` blocks and
+    the trials within each block are simulated in lockstep.
+
+    Args:
+      trials: number of repetitions
+      output_filename: file used to dump the results
+      processes: maximum number of processes to run. -1 means no limit. It is
+        ignored when the pool is provided by the caller.
+      debug: debug mode. When it is set to `True`, `trials` will be
+        automatically set to 1 and debug information of the trial will be
+        printed out.
+      output_format: `json` to dump each record as one line of JSON or
+        `columnar` to store the records as typed columns under the directory
+        `output_filename`
+      seed: root seed of the play. Each block gets its own child of the
+        :class:`numpy.random.SeedSequence` of `seed`. `None` means
+        fresh entropy is drawn from the operating system.
+
+    .. warning::
+      By default, results are appended to `output_filename`.
+    """
+    if debug:
+      trials = 1
+    blocks = min(
+        multiprocessing.cpu_count() if processes < 0 else processes, trials)
+    # number of trials in each block
+    block_trials = [
+        trials // blocks + (1 if block < trials % blocks else 0)
+        for block in range(blocks)
+    ]
+
+    pool = self._pool(processes)
+    root_seed_sequence = np.random.SeedSequence(seed)
+    if seed is None:
+      logging.info('root seed of the play is %d', root_seed_sequence.entropy)
+
+    # results are written by a background thread
+    with open_result_writer(output_filename, output_format) as writer:
+      for (learner_index, learner) in enumerate(self.__learners):
+        logging.info('start %s\'s play with %s', learner.name,
+                     self.bandit.name)
+
+        start_time = time.time()
+
+        block_results = []
+        block_seeds = trial_seeds(root_seed_sequence.entropy, learner_index,
+                                  blocks)
+        for (block_seed, trials_in_block) in zip(block_seeds, block_trials):
+          result = pool.apply_async(
+              self._lockstep_trials,
+              args=[learner, block_seed, trials_in_block, debug])
+          block_results.append(result)
+
+        # results are handed to the writer in this thread rather than in a
+        # callback, since an error raised by a callback stops the result
+        # handler thread of the pool and the play would hang
+        for result in block_results:
+          writer.write(result.get())
+
+        logging.info('%s\'s play with %s runs %.2f seconds.', learner.name,
+                     self.bandit.name,
+                     time.time() - start_time)
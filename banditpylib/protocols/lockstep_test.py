@@ -0,0 +1,109 @@
+import json
+import math
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from banditpylib.arms import BernoulliArm, write_reward_tape, \
+    load_reward_tape
+from banditpylib.bandits import OrdinaryBandit
+from banditpylib.learners.ordinary_learner import EpsGreedy, UCB, MOSS, \
+    UCBV, ThompsonSampling, Uniform
+from .lockstep import LockstepProtocol
+from .single_player import SinglePlayerProtocol
+
+
+class TestLockstep:
+  """Test lockstep protocol"""
+
+  def test_simple_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    horizon = 20
+    learners = [
+        EpsGreedy(arm_num=3, horizon=horizon),
+        UCB(arm_num=3, horizon=horizon),
+        MOSS(arm_num=3, horizon=horizon),
+        UCBV(arm_num=3, horizon=horizon),
+        ThompsonSampling(arm_num=3, horizon=horizon),
+        Uniform(arm_num=3, horizon=horizon)
+    ]
+    lockstep = LockstepProtocol(bandit=ordinary_bandit,
+                                learners=learners,
+                                intermediate_regrets=[0, 10])
+    temp_file = tempfile.NamedTemporaryFile()
+    lockstep.play(trials=5, output_filename=temp_file.name, processes=2)
+    lockstep.close()
+    with open(temp_file.name, 'r') as f:
+      records = [json.loads(line) for line in f.readlines()]
+    # 3 records for each trial of each learner
+    assert len(records) == 6 * 5 * 3
+    final_records = [record for record in records if record['rounds'] == 20]
+    assert len(final_records) == 6 * 5
+    for record in final_records:
+      assert record['total_actions'] == horizon
+      assert record['bandit'] == ordinary_bandit.name
+
+  def test_finite_rewards(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'tape.npy')
+    means = [0.3, 0.5, 0.7]
+    write_reward_tape(filename, [BernoulliArm(mean) for mean in means],
+                      max_pulls=100)
+    ordinary_bandit = OrdinaryBandit(load_reward_tape(filename, means=means))
+    # trials simulated in lockstep would share the rewards on the tape
+    with pytest.raises(Exception, match='finite rewards'):
+      LockstepProtocol(bandit=ordinary_bandit,
+                       learners=[UCB(arm_num=3, horizon=20)])
+
+  def test_same_as_single_player(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    horizon = 100
+    trials = 200
+    learners = [
+        UCB(arm_num=3, horizon=horizon),
+        ThompsonSampling(arm_num=3, horizon=horizon)
+    ]
+    temp_dir = tempfile.TemporaryDirectory()
+    lockstep_filename = os.path.join(temp_dir.name, 'lockstep.json')
+    single_player_filename = os.path.join(temp_dir.name, 'single_player.json')
+    with LockstepProtocol(bandit=ordinary_bandit,
+                          learners=learners) as lockstep_player:
+      lockstep_player.play(trials=trials,
+                           output_filename=lockstep_filename,
+                           processes=2,
+                           seed=3)
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=trials,
+                         output_filename=single_player_filename,
+                         processes=2,
+                         chunk_size=50,
+                         seed=3)
+
+    def final_regrets(output_filename):
+      regrets = {}
+      with open(output_filename, 'r') as f:
+        for record in map(json.loads, f):
+          regrets.setdefault(record['learner'], []).append(record['regret'])
+      return regrets
+
+    # trials simulated in lockstep draw their random numbers in a different
+    # order, so only the distributions of the final regrets are the same
+    lockstep_regrets = final_regrets(lockstep_filename)
+    single_player_regrets = final_regrets(single_player_filename)
+    for learner in learners:
+      lockstep_samples = np.array(lockstep_regrets[learner.name])
+      single_player_samples = np.array(single_player_regrets[learner.name])
+      assert len(lockstep_samples) == len(single_player_samples) == trials
+      # mean final regrets agree within 4 standard errors
+      standard_error = math.sqrt(
+          np.var(lockstep_samples, ddof=1) / trials +
+          np.var(single_player_samples, ddof=1) / trials)
+      assert abs(np.mean(lockstep_samples) -
+               np.mean(single_player_samples)) < 4 * standard_error
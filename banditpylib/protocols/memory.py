@@ -0,0 +1,55 @@
+import sys
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+try:
+  import resource
+except ImportError:  # pragma: no cover
+  # `resource` is not available on Windows
+  resource = None  # type: ignore
+
+
+def max_rss() -> int:
+  """
+  Returns:
+    maximum resident set size of the current process in bytes. 0 is returned
+    if it is not available on the platform.
+  """
+  if resource is None:
+    return 0
+  rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # the size is in kilobytes except on macOS
+  return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def track_memory(func: Callable, **kwargs) -> Tuple[Any, int, int]:
+  """Run a function and track its memory usage
+
+  Peak memory is the maximum size of the memory blocks allocated by python and
+  numpy traced by :mod:`tracemalloc` during the call. RSS growth is how much
+  the maximum resident set size of the process grows during the call, which
+  includes memory not traced but is 0 unless the call goes beyond the previous
+  high-water mark.
+
+  Args:
+    func: function to run
+    kwargs: arguments of the function
+
+  Returns:
+    result of the function, peak memory and RSS growth in bytes
+  """
+  # memory allocated before tracing starts or before the traces are cleared
+  # is not counted
+  started = not tracemalloc.is_tracing()
+  if started:
+    tracemalloc.start()
+  else:
+    tracemalloc.clear_traces()
+  start_rss = max_rss()
+  try:
+    result = func(**kwargs)
+    (_, peak_memory) = tracemalloc.get_traced_memory()
+  finally:
+    if started:
+      tracemalloc.stop()
+  return (result, peak_memory, max_rss() - start_rss)
@@ -0,0 +1,15 @@
+import numpy as np
+
+from .memory import track_memory
+
+
+class TestMemory:
+  """Test memory tracking"""
+
+  def test_track_memory(self):
+    (total, peak_memory, rss_growth) = track_memory(
+        lambda size: float(np.ones(size).sum()), size=1000000)
+    assert total == 1000000
+    # an array of 8 MB is allocated
+    assert peak_memory >= 8000000
+    assert rss_growth >= 0
@@ -0,0 +1,69 @@
+import cProfile
+import pstats
+from typing import Any, Callable, Dict, Optional
+
+
+class _RawStats:
+  """Raw statistics of a profiler in the form accepted by
+  :class:`pstats.Stats`"""
+  def __init__(self, stats: Dict):
+    self.stats = stats
+
+  def create_stats(self):
+    """Statistics are already created"""
+
+
+class TrialProfiler:
+  """Profiler of trials
+
+  The profiler runs in the worker. The statistics of all the trials it runs
+  are accumulated and shipped to the parent process as a plain dictionary,
+  which is merged by :func:`merge_stats`.
+  """
+  def __init__(self):
+    self.__profiler = cProfile.Profile()
+    self.__profiled = False
+
+  def run(self, func: Callable, **kwargs) -> Any:
+    """Run a function under the profiler
+
+    Args:
+      func: function to run
+      kwargs: arguments of the function
+
+    Returns:
+      result of the function
+    """
+    self.__profiled = True
+    self.__profiler.enable()
+    try:
+      return func(**kwargs)
+    finally:
+      self.__profiler.disable()
+
+  def stats(self) -> Optional[Dict]:
+    """
+    Returns:
+      statistics of the trials run. `None` if no trial is profiled.
+    """
+    if not self.__profiled:
+      return None
+    self.__profiler.create_stats()
+    return self.__profiler.stats  # type: ignore
+
+
+def merge_stats(merged_stats: Optional[pstats.Stats],
+                stats: Dict) -> pstats.Stats:
+  """Merge statistics returned by :func:`TrialProfiler.stats`
+
+  Args:
+    merged_stats: statistics merged so far. `None` if nothing is merged.
+    stats: statistics to merge
+
+  Returns:
+    merged statistics
+  """
+  if merged_stats is None:
+    return pstats.Stats(_RawStats(stats))
+  merged_stats.add(_RawStats(stats))
+  return merged_stats
@@ -0,0 +1,135 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+from absl import logging
+
+
+class ProgressMonitor:
+  """Monitor of the progress of a learner's play
+
+  Workers put the number of trials they finish and their steps to a queue
+  shared with the parent process. The monitor drains the queue in a background
+  thread of the parent, and periodically logs the progress and writes it to a
+  status file in JSON. The status file is replaced atomically so that it can
+  be polled by other programs at any time.
+  """
+  def __init__(self,
+               progress_queue,
+               learner_name: str,
+               bandit_name: str,
+               trials: int,
+               interval: float,
+               log_progress: bool = True,
+               status_filename: Optional[str] = None):
+    """
+    Args:
+      progress_queue: queue the workers report to
+      learner_name: name of the learner
+      bandit_name: name of the bandit environment
+      trials: number of trials to run
+      interval: seconds between two reports
+      log_progress: whether to log the progress
+      status_filename: file used to dump the status. `None` means no status
+        file is written.
+    """
+    if interval <= 0:
+      raise Exception('Interval %.2f is no greater than 0!' % interval)
+    self.__queue = progress_queue
+    self.__learner_name = learner_name
+    self.__bandit_name = bandit_name
+    self.__trials = trials
+    self.__interval = interval
+    self.__log_progress = log_progress
+    self.__status_filename = status_filename
+    self.__finished_trials = 0
+    self.__steps = 0
+    self.__start_time = time.time()
+    self.__stopped = threading.Event()
+    self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+  def start(self):
+    """Start monitoring"""
+    self.__start_time = time.time()
+    self.__thread.start()
+
+  def stop(self):
+    """Stop monitoring
+
+    The reports left in the queue are drained and the final status is written.
+    """
+    self.__stopped.set()
+    self.__thread.join()
+
+  def __drain(self, timeout: float):
+    """Drain the reports in the queue
+
+    Args:
+      timeout: seconds to wait for the first report
+    """
+    try:
+      (trials, steps) = self.__queue.get(timeout=timeout)
+      while True:
+        self.__finished_trials += trials
+        self.__steps += steps
+        (trials, steps) = self.__queue.get_nowait()
+    except queue.Empty:
+      pass
+
+  def status(self, state: str = 'running') -> dict:
+    """
+    Args:
+      state: state of the play
+
+    Returns:
+      current status
+    """
+    elapsed_seconds = time.time() - self.__start_time
+    trials_per_second = self.__finished_trials / max(elapsed_seconds, 1e-9)
+    left_trials = self.__trials - self.__finished_trials
+    return {
+        'state': state,
+        'learner': self.__learner_name,
+        'bandit': self.__bandit_name,
+        'trials': self.__trials,
+        'finished_trials': self.__finished_trials,
+        'steps': self.__steps,
+        'steps_per_second': self.__steps / max(elapsed_seconds, 1e-9),
+        'elapsed_seconds': elapsed_seconds,
+        'eta_seconds': left_trials / trials_per_second
+                       if trials_per_second > 0 else None,
+        'time': time.time()
+    }
+
+  def __report(self, state: str):
+    """Report the current status
+
+    Args:
+      state: state of the play
+    """
+    status = self.status(state)
+    if self.__log_progress:
+      logging.info(
+          '%s: %d/%d trials, %.0f steps per second, ETA %s', status['learner'],
+          status['finished_trials'], status['trials'],
+          status['steps_per_second'], '%.0f seconds' %
+          status['eta_seconds'] if status['eta_seconds'] is not None else '-')
+    if self.__status_filename is not None:
+      # write to a temporary file first so that the file is never half written
+      temp_filename = self.__status_filename + '.tmp'
+      with open(temp_filename, 'w') as f:
+        json.dump(status, f)
+      os.replace(temp_filename, self.__status_filename)
+
+  def __run(self):
+    next_report_time = time.time() + self.__interval
+    while not self.__stopped.is_set():
+      self.__drain(timeout=max(min(next_report_time - time.time(), 0.1), 0))
+      if time.time() >= next_report_time:
+        self.__report('running')
+        next_report_time = time.time() + self.__interval
+    self.__drain(timeout=0)
+    self.__report('finished')
@@ -1,4 +1,10 @@
-from typing import List, Dict
+import contextlib
+import math
+from multiprocessing.pool import Pool
+import signal
+import threading
+import time
+from typing import Any, List, Dict, Optional, Tuple, Union
 
 import numpy as np
 
@@ -6,7 +12,43 @@ from absl import logging
 
 from banditpylib.bandits import Bandit
 from banditpylib.learners import Learner
-from .utils import Protocol
+from .checkpoint import CheckpointSchedule, as_schedule
+from .timing import PhaseTimer
+from .utils import Protocol, TrialSeed, seed_trial
+
+
+class _TrialTimeout(Exception):
+  """Raised in a trial when its wall-clock limit is hit"""
+
+
+@contextlib.contextmanager
+def _alarm(seconds: Optional[float]):
+  """Raise :class:`_TrialTimeout` after `seconds` seconds
+
+  The alarm is a real-time interval timer, whose signal interrupts the trial
+  wherever it is e.g., in a call to the bandit environment which never
+  returns. It only works in the main thread on POSIX, which is where the
+  workers run the trials. Elsewhere, no alarm is set.
+
+  Args:
+    seconds: seconds before the alarm. `None` means no alarm.
+  """
+  if seconds is None or not hasattr(signal, 'setitimer') or \
+      threading.current_thread() is not threading.main_thread():
+    yield
+    return
+
+  def raise_timeout(signum, frame):
+    del signum, frame
+    raise _TrialTimeout()
+
+  handler = signal.signal(signal.SIGALRM, raise_timeout)
+  signal.setitimer(signal.ITIMER_REAL, seconds)
+  try:
+    yield
+  finally:
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    signal.signal(signal.SIGALRM, handler)
 
 
 class SinglePlayerProtocol(Protocol):
@@ -24,28 +66,80 @@ class SinglePlayerProtocol(Protocol):
   .. note::
     The total number of rounds shows how adaptive the learner is and it is at
     most the total number of actions.
+
+  When `instrument` is set, the time spent in each step is measured. The
+  phases are `actions` (fetching the state and asking for actions), `feed` and
+  `update`. Their statistics are added to the final record of each trial as
+  described in :class:`banditpylib.protocols.PhaseTimer` and summarized in the
+  log of :func:`play`.
+
+  A trial can be limited by `trial_timeout` and `max_steps`. The limits are
+  checked before each round. Besides, `trial_timeout` is enforced by an alarm
+  signal which interrupts the trial even in the middle of a round e.g., when
+  the bandit environment never returns the feedback. The alarm is only
+  available on POSIX and otherwise the timeout is checked before each round
+  only. When a limit is hit, the trial stops and its final record is marked
+  as `censored` with the statistics so far. All records have the `censored`
+  field when a limit is set.
   """
+  # phases of a round measured by the instrumentation
+  PHASES = ['actions', 'feed', 'update']
+
   def __init__(self,
                bandit: Bandit,
                learners: List[Learner],
-               intermediate_regrets: List[int] = None):
+               intermediate_regrets: Union[List[int],
+                                           CheckpointSchedule] = None,
+               pool: Pool = None,
+               instrument: bool = False,
+               trial_timeout: Optional[float] = None,
+               max_steps: Optional[int] = None):
     """
     Args:
       bandit: bandit environment
       learner: learners to be compared with
-      intermediate_regrets: a list of intermediate times to record
+      intermediate_regrets: a list of intermediate times or a
+        :class:`banditpylib.protocols.CheckpointSchedule` to record
         intermediate regrets
+      pool: pool of worker processes used to run the trials
+      instrument: whether to measure the time spent in each phase
+      trial_timeout: maximum seconds of one trial
+      max_steps: maximum number of actions executed in one trial
     """
-    super().__init__(bandit=bandit, learners=learners)
-    self.__intermediate_regrets = \
-        intermediate_regrets if intermediate_regrets is not None else []
+    super().__init__(bandit=bandit, learners=learners, pool=pool)
+    self.__intermediate_regrets = as_schedule(intermediate_regrets)
+    self.__instrument = instrument
+    if trial_timeout is not None and trial_timeout <= 0:
+      raise Exception('Trial timeout %.2f is no greater than 0!' %
+                      trial_timeout)
+    if max_steps is not None and max_steps < 1:
+      raise Exception('Maximum steps %d is less than 1!' % max_steps)
+    self.__trial_timeout = trial_timeout
+    self.__max_steps = max_steps
 
   @property
   def name(self) -> str:
     """default protocol name"""
     return 'single_player_protocol'
 
-  def _one_trial(self, random_seed: int, debug: bool) -> List[Dict]:
+  def _timed_phases(self) -> List[str]:
+    """
+    Returns:
+      phases measured in each trial
+    """
+    return self.PHASES if self.__instrument else []
+
+  def _actions(self, context: Any) -> Optional[List[Tuple[Any, int]]]:
+    """
+    Args:
+      context: current state of the bandit environment
+
+    Returns:
+      actions of the current learner for the next round
+    """
+    return self.current_learner.actions(context)
+
+  def _one_trial(self, random_seed: TrialSeed, debug: bool) -> List[Dict]:
     """One trial of the game
 
     This method defines how to run one trial of the game.
@@ -59,49 +153,102 @@ class SinglePlayerProtocol(Protocol):
     """
     if debug:
       logging.set_verbosity(logging.DEBUG)
-    np.random.seed(random_seed)
+    seed_trial(random_seed, self.bandit, self.current_learner)
 
     # reset the bandit environment and the learner
     self.bandit.reset()
     self.current_learner.reset()
 
-    one_trial_data = []
+    # samples of the checkpoints and the final one
+    samples = len(self.__intermediate_regrets) + 1
+    sample_rounds = np.zeros(samples, dtype=np.int64)
+    sample_total_actions = np.zeros(samples, dtype=np.int64)
+    sample_regrets = np.zeros(samples)
+    recorded = 0
+    checkpoints = self.__intermediate_regrets.cursor()
+
     # number of rounds to communicate with the bandit environment
     adaptive_rounds = 0
     # total actions executed by the bandit environment
     total_actions = 0
 
+    timer = PhaseTimer(self.PHASES) if self.__instrument else None
+    clock = time.perf_counter_ns
+
+    limited = self.__trial_timeout is not None or self.__max_steps is not None
+    deadline = time.perf_counter() + self.__trial_timeout \
+        if self.__trial_timeout is not None else math.inf
+    max_steps = self.__max_steps if self.__max_steps is not None else math.inf
+    # whether the trial is stopped by a limit
+    censored = False
+
     def record_data():
-      one_trial_data.append(
-          dict({
-              'bandit': self.bandit.name,
-              'learner': self.current_learner.name,
-              'rounds': adaptive_rounds,
-              'total_actions': total_actions,
-              'regret': self.bandit.regret(self.current_learner.goal)
-          }))
-
-    while True:
-      context = self.bandit.context()
-      actions = self.current_learner.actions(context)
-
-      # stop the game if actions returned by the learner is None
-      if actions is None:
-        break
-
-      # record intermediate regrets
-      if adaptive_rounds in self.__intermediate_regrets:
-        record_data()
-
-      feedback = self.bandit.feed(actions)
-      self.current_learner.update(feedback)
-
-      if feedback:
-        # information update
-        for (_, times) in actions:
-          total_actions += int(times)
-        adaptive_rounds += 1
+      nonlocal recorded
+      sample_rounds[recorded] = adaptive_rounds
+      sample_total_actions[recorded] = total_actions
+      sample_regrets[recorded] = self.bandit.regret(self.current_learner.goal)
+      recorded += 1
+
+    try:
+      with _alarm(self.__trial_timeout):
+        while True:
+          start_time = clock() if timer else 0
+          context = self.bandit.context()
+          actions = self._actions(context)
+          if timer:
+            timer.add(0, clock() - start_time)
+
+          # stop the game if actions returned by the learner is None
+          if actions is None:
+            break
+
+          # stop the game if a limit is hit
+          if limited and (total_actions >= max_steps or
+                          time.perf_counter() > deadline):
+            censored = True
+            break
+
+          # record intermediate regrets
+          if checkpoints.reached(adaptive_rounds):
+            record_data()
+
+          if timer:
+            start_time = clock()
+            feedback = self.bandit.feed(actions)
+            feed_time = clock()
+            self.current_learner.update(feedback)
+            timer.add(1, feed_time - start_time)
+            timer.add(2, clock() - feed_time)
+          else:
+            feedback = self.bandit.feed(actions)
+            self.current_learner.update(feedback)
+
+          if feedback:
+            # information update
+            for (_, times) in actions:
+              total_actions += int(times)
+            adaptive_rounds += 1
+    except _TrialTimeout:
+      censored = True
 
     # record final regret
     record_data()
+    one_trial_data = [
+        dict({
+            'bandit': self.bandit.name,
+            'learner': self.current_learner.name,
+            'rounds': rounds,
+            'total_actions': total,
+            'regret': regret
+        }) for (rounds, total, regret) in zip(
+            sample_rounds[:recorded].tolist(),
+            sample_total_actions[:recorded].tolist(),
+            sample_regrets[:recorded].tolist())
+    ]
+    if limited:
+      for data_point in one_trial_data:
+        data_point['censored'] = False
+      one_trial_data[-1]['censored'] = censored
+    if timer:
+      one_trial_data[-1].update(timer.to_record())
     return one_trial_data
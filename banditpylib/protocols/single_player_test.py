@@ -1,9 +1,34 @@
+import json
+from multiprocessing.pool import Pool
+import os
+import pstats
 import tempfile
+import time
+
+import pytest
 
 from banditpylib.arms import BernoulliArm
 from banditpylib.bandits import OrdinaryBandit
-from banditpylib.learners.ordinary_learner import EpsGreedy
+from banditpylib.learners.ordinary_learner import EpsGreedy, UCB
+from .checkpoint import LinearSchedule
 from .single_player import SinglePlayerProtocol
+from .utils import normal_quantile, seed_trial
+from .writer import load_columnar
+
+
+class _HangingBandit(OrdinaryBandit):
+  """Bandit environment which never returns the feedback of the fifth
+  round"""
+  def reset(self):
+    super().reset()
+    self.__rounds = 0
+
+  def feed(self, actions):
+    self.__rounds += 1
+    if self.__rounds == 5:
+      while True:
+        time.sleep(1)
+    return super().feed(actions)
 
 
 class TestSinglePlayer:
@@ -18,7 +43,452 @@ class TestSinglePlayer:
                                          learners=[eps_greedy_learner])
     temp_file = tempfile.NamedTemporaryFile()
     single_player.play(trials=3, output_filename=temp_file.name)
+    single_player.close()
     with open(temp_file.name, 'r') as f:
       # check number of records is 3
       lines = f.readlines()
       assert len(lines) == 3
+
+  def test_intermediate_regrets(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners,
+                              intermediate_regrets=LinearSchedule(
+                                  stop=10, step=5)) as single_player:
+      single_player.play(trials=2, output_filename=output_filename)
+    with open(output_filename, 'r') as f:
+      rounds = [json.loads(line)['rounds'] for line in f]
+      # checkpoints 0 and 5 of each trial followed by the final regret
+      assert sorted(rounds) == [0, 0, 5, 5, 10, 10]
+
+  def test_common_random_numbers(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [
+        UCB(arm_num=3, horizon=10, name='ucb_1'),
+        UCB(arm_num=3, horizon=10, name='ucb_2')
+    ]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=4,
+                         output_filename=output_filename,
+                         common_random_numbers=True,
+                         resumable=True)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    with open(SinglePlayerProtocol.manifest_filename(output_filename),
+              'r') as f:
+      entries = [json.loads(line) for line in f]
+    seeds = {}
+    for entry in entries:
+      seeds.setdefault(entry['learner'], {})[entry['trial']] = entry['seed']
+    # identical learners get the same regrets in paired trials
+    assert seeds['ucb_1'] == seeds['ucb_2']
+    assert sorted(record['regret'] for record in records
+                  if record['learner'] == 'ucb_1') == \
+        sorted(record['regret'] for record in records
+               if record['learner'] == 'ucb_2')
+
+  def test_seed(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=50)]
+    temp_dir = tempfile.TemporaryDirectory()
+    results = []
+    # the same seed gives the same trials no matter how they are distributed
+    for (processes, chunk_size) in [(1, 6), (3, 1)]:
+      output_filename = os.path.join(temp_dir.name,
+                                     'results_%d.json' % processes)
+      with SinglePlayerProtocol(bandit=ordinary_bandit,
+                                learners=learners) as single_player:
+        single_player.play(trials=6,
+                           output_filename=output_filename,
+                           processes=processes,
+                           chunk_size=chunk_size,
+                           seed=7,
+                           resumable=True)
+      with open(output_filename, 'r') as f:
+        regrets = sorted(json.loads(line)['regret'] for line in f)
+      with open(SinglePlayerProtocol.manifest_filename(output_filename),
+                'r') as f:
+        seeds = {(entry['trial'], json.dumps(entry['seed']))
+                 for entry in map(json.loads, f)}
+      results.append((regrets, seeds))
+    assert results[0] == results[1]
+
+  def test_replay_trial(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [
+        EpsGreedy(arm_num=3, horizon=50, name='eps_greedy_1'),
+        EpsGreedy(arm_num=3, horizon=50, name='eps_greedy_2')
+    ]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=5,
+                         output_filename=output_filename,
+                         processes=2)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    # no manifest is written unless the play is resumable
+    assert not os.path.exists(
+        SinglePlayerProtocol.manifest_filename(output_filename))
+    # each trial gets its own child seed sequence
+    assert len({(record['seed_stream'], record['trial'])
+                for record in records}) == 10
+    assert len({record['seed_entropy'] for record in records}) == 1
+    # a single trial is replayed from the seed in its record
+    record = records[7]
+    learner = learners[record['seed_stream']]
+    seed_trial((int(record['seed_entropy']),
+                (record['seed_stream'], record['trial'])), ordinary_bandit,
+               learner)
+    ordinary_bandit.reset()
+    learner.reset()
+    while True:
+      actions = learner.actions(ordinary_bandit.context())
+      if actions is None:
+        break
+      learner.update(ordinary_bandit.feed(actions))
+    assert record['learner'] == learner.name
+    assert ordinary_bandit.regret(learner.goal) == record['regret']
+
+  def test_target_precision(self):
+    assert abs(normal_quantile(0.975) - 1.96) < 1e-2
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      # the target precision is reached by the first wave
+      used_trials = single_player.play(trials=1000,
+                                       output_filename=output_filename,
+                                       processes=2,
+                                       precision=100)
+      assert used_trials == {'ucb': SinglePlayerProtocol.MIN_PRECISION_TRIALS}
+      # the target precision can not be reached
+      used_trials = single_player.play(trials=30,
+                                       output_filename=output_filename,
+                                       processes=2,
+                                       chunk_size=None,
+                                       precision=0)
+      assert used_trials == {'ucb': 30}
+
+  def test_target_precision_with_prior_trials(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      used_trials = single_player.play(trials=1000,
+                                       output_filename=output_filename,
+                                       resumable=True,
+                                       precision=100)
+      assert used_trials == {'ucb': SinglePlayerProtocol.MIN_PRECISION_TRIALS}
+      # the final regrets of the trials finished before reach the target
+      # precision
+      used_trials = single_player.play(trials=1000,
+                                       output_filename=output_filename,
+                                       resume=True,
+                                       precision=100)
+      assert used_trials == {'ucb': 0}
+    # censored trials are left out of the confidence interval, so the target
+    # precision is never reached
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners,
+                              max_steps=4) as single_player:
+      used_trials = single_player.play(trials=30,
+                                       output_filename=output_filename,
+                                       precision=100)
+      assert used_trials == {'ucb': 30}
+
+  def test_instrument(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners,
+                              intermediate_regrets=[5],
+                              instrument=True) as single_player:
+      single_player.play(trials=2, output_filename=output_filename)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    final_records = [record for record in records if record['rounds'] == 10]
+    assert len(final_records) == 2
+    for record in final_records:
+      # actions are asked once more at the end of the game
+      assert record['actions_calls'] == 11
+      assert record['feed_calls'] == record['update_calls'] == 10
+      assert sum(record['update_histogram']) == 10
+    # only the final record has the statistics
+    assert all('feed_ns' not in record for record in records
+               if record['rounds'] == 5)
+
+  def test_profile(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10), UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    profile = os.path.join(temp_dir.name, 'profile')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=6,
+                         output_filename=output_filename,
+                         processes=2,
+                         chunk_size=2,
+                         profile=profile,
+                         profile_fraction=0.5)
+    for learner in learners:
+      stats = pstats.Stats('%s.%s.pstats' % (profile, learner.name))
+      # statistics of the trials include the calls of the learner
+      assert any(function == 'update'
+                 for (_, _, function) in stats.stats)  # type: ignore
+
+  def test_track_memory(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=2,
+                         output_filename=output_filename,
+                         track_memory=True,
+                         memory_budget=1)
+    with open(output_filename, 'r') as f:
+      for line in f:
+        record = json.loads(line)
+        assert record['peak_memory'] > 0
+        assert record['rss_growth'] >= 0
+
+  def test_progress(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    status_filename = os.path.join(temp_dir.name, 'status.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      # trials of a chunk are reported together
+      single_player.play(trials=5,
+                         output_filename=output_filename,
+                         processes=2,
+                         chunk_size=3,
+                         progress_interval=0.01,
+                         status_filename=status_filename)
+    with open(status_filename, 'r') as f:
+      status = json.load(f)
+    assert status['state'] == 'finished'
+    assert status['learner'] == 'ucb'
+    assert status['finished_trials'] == status['trials'] == 5
+    assert status['steps'] == 5 * 10
+
+  def test_trial_limits(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners,
+                              max_steps=4) as single_player:
+      single_player.play(trials=2, output_filename=output_filename)
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners,
+                              max_steps=10) as single_player:
+      single_player.play(trials=1, output_filename=output_filename)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    # trials are stopped after 4 actions
+    assert [(record['total_actions'], record['censored'])
+            for record in records] == [(4, True), (4, True), (10, False)]
+
+  def test_trial_timeout(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    hanging_bandit = _HangingBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=hanging_bandit,
+                              learners=learners,
+                              trial_timeout=0.5) as single_player:
+      single_player.play(trials=2,
+                         output_filename=output_filename,
+                         processes=2)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    # trials are interrupted in the fifth round
+    assert [(record['total_actions'], record['censored'])
+            for record in records] == [(4, True), (4, True)]
+
+  def test_reuse_pool(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10), UCB(arm_num=3, horizon=10)]
+    temp_file = tempfile.NamedTemporaryFile()
+    with Pool(processes=2) as pool:
+      with SinglePlayerProtocol(bandit=ordinary_bandit,
+                                learners=learners,
+                                pool=pool) as single_player:
+        # the same pool is used by both learners and both calls
+        single_player.play(trials=3, output_filename=temp_file.name)
+        single_player.play(trials=2, output_filename=temp_file.name)
+      # pool provided by the caller is still available after close
+      assert pool.apply_async(sum, args=[[1, 2]]).get() == 3
+    with open(temp_file.name, 'r') as f:
+      lines = f.readlines()
+      assert len(lines) == 2 * (3 + 2)
+
+  @pytest.mark.skipif(not os.path.exists('/dev/full'),
+                      reason='/dev/full is not available')
+  def test_failing_output(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      # errors of the writer are raised instead of hanging the play
+      with pytest.raises(Exception):
+        single_player.play(trials=3000,
+                           output_filename='/dev/full',
+                           processes=2,
+                           chunk_size=50)
+      # the pool is still usable
+      single_player.play(trials=3,
+                         output_filename=output_filename,
+                         processes=2)
+    with open(output_filename, 'r') as f:
+      assert len(f.readlines()) == 3
+
+  def test_chunked_run(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10)]
+    temp_file = tempfile.NamedTemporaryFile()
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=7,
+                         output_filename=temp_file.name,
+                         processes=2,
+                         chunk_size=3)
+      # chunk size is tuned automatically
+      single_player.play(trials=9,
+                         output_filename=temp_file.name,
+                         processes=2,
+                         chunk_size=None)
+    with open(temp_file.name, 'r') as f:
+      lines = f.readlines()
+      assert len(lines) == 7 + 9
+
+  def test_columnar_output(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10), UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners,
+                              intermediate_regrets=[5]) as single_player:
+      single_player.play(trials=3,
+                         output_filename=output_filename,
+                         output_format='columnar')
+    columns = load_columnar(output_filename)
+    assert len(columns) == 2 * 3 * 2
+    assert set(columns['learner']) == {'epsilon_greedy', 'ucb'}
+    assert set(columns['rounds']) == {5, 10}
+
+  def test_resume(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10), UCB(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      # an interrupted run finishing 3 trials of each learner
+      single_player.play(trials=3,
+                         output_filename=output_filename,
+                         resumable=True)
+      single_player.play(trials=5,
+                         output_filename=output_filename,
+                         resume=True)
+      # nothing is left to run
+      single_player.play(trials=5,
+                         output_filename=output_filename,
+                         resume=True)
+    with open(output_filename, 'r') as f:
+      assert len(f.readlines()) == 2 * 5
+    manifest_filename = SinglePlayerProtocol.manifest_filename(output_filename)
+    with open(manifest_filename, 'r') as f:
+      entries = [json.loads(line) for line in f.readlines()]
+    assert sorted([(entry['learner'], entry['trial']) for entry in entries
+                  ]) == sorted([(learner.name, trial) for learner in learners
+                                for trial in range(5)])
+
+  def test_resume_torn_files(self):
+    means = [0.3, 0.5, 0.7]
+    arms = [BernoulliArm(mean) for mean in means]
+    ordinary_bandit = OrdinaryBandit(arms)
+    learners = [EpsGreedy(arm_num=3, horizon=10)]
+    temp_dir = tempfile.TemporaryDirectory()
+    output_filename = os.path.join(temp_dir.name, 'results.json')
+    manifest_filename = SinglePlayerProtocol.manifest_filename(output_filename)
+    with SinglePlayerProtocol(bandit=ordinary_bandit,
+                              learners=learners) as single_player:
+      single_player.play(trials=3,
+                         output_filename=output_filename,
+                         resumable=True)
+      # a run killed after writing the records of a trial but before its
+      # entry of the manifest, and in the middle of a record and an entry
+      with open(output_filename, 'a') as f:
+        f.write(json.dumps({'learner': 'epsilon_greedy', 'regret': -1.0}) +
+                '\n')
+        f.write('{"learner": "epsi')
+      with open(manifest_filename, 'a') as f:
+        f.write('{"learner": "epsilon_greedy", "tri')
+      single_player.play(trials=5,
+                         output_filename=output_filename,
+                         resume=True)
+    with open(output_filename, 'r') as f:
+      records = [json.loads(line) for line in f]
+    assert len(records) == 5
+    assert sorted(record['trial'] for record in records) == list(range(5))
+    with open(manifest_filename, 'r') as f:
+      entries = [json.loads(line) for line in f]
+    assert sorted(entry['trial'] for entry in entries) == list(range(5))
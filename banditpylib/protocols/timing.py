@@ -0,0 +1,129 @@
+from typing import Dict, List
+
+
+class PhaseTimer:
+  """Timer of the phases of trials
+
+  For each phase, the timer accumulates the number of calls, the total
+  nanoseconds and a histogram of the nanoseconds of one call. The histogram
+  has logarithmic buckets i.e., bucket :math:`i` counts the calls taking
+  :math:`[2^{i-1}, 2^i)` nanoseconds, so adding a call only costs a few integer
+  operations.
+
+  The statistics of a phase are dumped as fields `<phase>_calls`, `<phase>_ns`
+  and `<phase>_histogram` of a record, where trailing empty buckets of the
+  histogram are dropped.
+  """
+
+  # number of buckets of a histogram
+  BUCKETS = 64
+
+  def __init__(self, phases: List[str]):
+    """
+    Args:
+      phases: names of the phases
+    """
+    self.__phases = phases
+    self.__calls = [0] * len(phases)
+    self.__nanoseconds = [0] * len(phases)
+    self.__histograms = [[0] * self.BUCKETS for _ in phases]
+
+  @property
+  def phases(self) -> List[str]:
+    """names of the phases"""
+    return self.__phases
+
+  def add(self, phase_id: int, nanoseconds: int):
+    """Add one call of a phase
+
+    Args:
+      phase_id: index of the phase
+      nanoseconds: nanoseconds used by the call
+    """
+    self.__calls[phase_id] += 1
+    self.__nanoseconds[phase_id] += nanoseconds
+    self.__histograms[phase_id][min(nanoseconds.bit_length(),
+                                    self.BUCKETS - 1)] += 1
+
+  def calls(self, phase_id: int) -> int:
+    """
+    Args:
+      phase_id: index of the phase
+
+    Returns:
+      number of calls of the phase
+    """
+    return self.__calls[phase_id]
+
+  def nanoseconds(self, phase_id: int) -> int:
+    """
+    Args:
+      phase_id: index of the phase
+
+    Returns:
+      total nanoseconds of the phase
+    """
+    return self.__nanoseconds[phase_id]
+
+  def histogram(self, phase_id: int) -> List[int]:
+    """
+    Args:
+      phase_id: index of the phase
+
+    Returns:
+      histogram of the nanoseconds of one call of the phase
+    """
+    return self.__histograms[phase_id]
+
+  def merge(self, record: Dict):
+    """Merge the statistics dumped in a record
+
+    Args:
+      record: record with the fields dumped by :func:`to_record`
+    """
+    for (phase_id, phase) in enumerate(self.__phases):
+      self.__calls[phase_id] += record['%s_calls' % phase]
+      self.__nanoseconds[phase_id] += record['%s_ns' % phase]
+      for (bucket, calls) in enumerate(record['%s_histogram' % phase]):
+        self.__histograms[phase_id][bucket] += calls
+
+  def to_record(self) -> Dict:
+    """
+    Returns:
+      fields of the statistics to add to a record
+    """
+    record: Dict = {}
+    for (phase_id, phase) in enumerate(self.__phases):
+      histogram = self.__histograms[phase_id]
+      buckets = max([bucket + 1 for (bucket, calls) in enumerate(histogram)
+                     if calls > 0],
+                    default=0)
+      record['%s_calls' % phase] = self.__calls[phase_id]
+      record['%s_ns' % phase] = self.__nanoseconds[phase_id]
+      record['%s_histogram' % phase] = histogram[:buckets]
+    return record
+
+  def summary(self) -> str:
+    """
+    Returns:
+      summary of the phases for logging
+    """
+    total = max(sum(self.__nanoseconds), 1)
+    summaries = []
+    for (phase_id, phase) in enumerate(self.__phases):
+      calls = self.__calls[phase_id]
+      nanoseconds = self.__nanoseconds[phase_id]
+      histogram = self.__histograms[phase_id]
+      # the bucket where the median call falls in
+      (median_bucket, counted) = (0, 0)
+      for (bucket, bucket_calls) in enumerate(histogram):
+        counted += bucket_calls
+        if 2 * counted >= calls:
+          median_bucket = bucket
+          break
+      summaries.append(
+          '%s: %d calls, %.3f seconds (%.1f%%), %.0f ns per call, median '
+          'below %d ns' %
+          (phase, calls, nanoseconds / 1e9, 100 * nanoseconds / total,
+           nanoseconds / max(calls, 1), 2**median_bucket))
+    return '; '.join(summaries)
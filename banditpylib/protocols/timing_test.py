@@ -0,0 +1,22 @@
+from .timing import PhaseTimer
+
+
+class TestPhaseTimer:
+  """Test phase timer"""
+
+  def test_merge(self):
+    timer = PhaseTimer(['actions', 'feed'])
+    timer.add(0, 3)
+    timer.add(0, 5)
+    timer.add(1, 1000)
+    record = timer.to_record()
+    assert record['actions_calls'] == 2
+    assert record['actions_ns'] == 8
+    # 3 is in bucket 2 and 5 is in bucket 3
+    assert record['actions_histogram'] == [0, 0, 1, 1]
+    merged_timer = PhaseTimer(['actions', 'feed'])
+    merged_timer.merge(record)
+    merged_timer.merge(record)
+    assert merged_timer.calls(1) == 2
+    assert merged_timer.nanoseconds(1) == 2000
+    assert merged_timer.histogram(0)[:4] == [0, 0, 2, 2]
@@ -1,14 +1,24 @@
-import json
+import functools
+import math
 import multiprocessing
-from multiprocessing import Pool
+from multiprocessing.pool import Pool, AsyncResult
+import pstats
 import time
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Tuple, Optional
 
 from abc import ABC, abstractmethod
 from absl import logging
 
-from banditpylib.bandits import Bandit
+import numpy as np
+
+from banditpylib.bandits import Bandit, AsyncBandit
 from banditpylib.learners import Learner
+from . import memory, worker
+from .distributed import DistributedPool
+from .profiler import TrialProfiler, merge_stats
+from .progress import ProgressMonitor
+from .timing import PhaseTimer
+from .writer import open_result_writer, read_manifest
 
 
 def time_seed() -> int:
@@ -21,29 +31,182 @@ def time_seed() -> int:
   return int((tem_time - int(tem_time)) * 10000000)
 
 
+# seed of a trial, which is the entropy of the play and the spawn key of the
+# trial i.e., `(entropy, (stream, trial))`
+TrialSeed = Tuple[int, Tuple[int, ...]]
+
+
+def trial_seeds(entropy: int, stream: int, size: int) -> List[TrialSeed]:
+  """Seeds of a stream of trials
+
+  The `i`-th trial gets the child :class:`numpy.random.SeedSequence` of the
+  play with spawn key `(stream, i)`. Unlike 32-bit seeds, child seed sequences
+  of the same play never collide, and a trial can be replayed from its entropy
+  and spawn key alone. Seed sequences are only built by the workers, so the
+  seeds are cheap to ship.
+
+  Args:
+    entropy: entropy of the root seed sequence of the play
+    stream: index of the stream
+    size: number of seeds
+
+  Returns:
+    random seeds
+  """
+  return [(entropy, (stream, index)) for index in range(size)]
+
+
+def trial_seed_sequence(
+    random_seed: Union[int, TrialSeed]) -> np.random.SeedSequence:
+  """
+  Args:
+    random_seed: random seed of a trial. It is either an integer or the
+      entropy and the spawn key of a trial e.g., the `seed` of an entry of the
+      manifest.
+
+  Returns:
+    seed sequence of the trial
+  """
+  if isinstance(random_seed, (int, np.integer)):
+    return np.random.SeedSequence(int(random_seed))
+  (entropy, spawn_key) = random_seed
+  return np.random.SeedSequence(entropy, spawn_key=tuple(spawn_key))
+
+
+def seed_trial(random_seed: Union[int, TrialSeed],
+               bandit: Union[Bandit, AsyncBandit], learner: Learner):
+  """Seed the random number generators of one trial
+
+  The bandit environment and the learner get their own
+  :class:`numpy.random.Generator` spawned from the seed sequence of the trial
+  returned by :func:`trial_seed_sequence`, so the trial gives the same result
+  no matter which process runs it. The global random state of numpy is seeded
+  by the same seed sequence as well for the code still using it.
+
+  Args:
+    random_seed: random seed of the trial
+    bandit: bandit environment of the trial
+    learner: learner of the trial
+  """
+  seed_sequence = trial_seed_sequence(random_seed)
+  np.random.seed(seed_sequence.generate_state(4))
+  (bandit_seed_sequence, learner_seed_sequence) = seed_sequence.spawn(2)
+  bandit.set_rng(np.random.default_rng(bandit_seed_sequence))
+  learner.set_rng(np.random.default_rng(learner_seed_sequence))
+
+
+def normal_quantile(probability: float) -> float:
+  """Quantile of the standard normal distribution
+
+  Args:
+    probability: probability in (0, 1)
+
+  Returns:
+    `x` such that the standard normal distribution is at most `x` with
+    probability `probability`
+  """
+  (lower, upper) = (-40.0, 40.0)
+  # bisection on the cumulative distribution function
+  for _ in range(100):
+    middle = (lower + upper) / 2
+    if (1 + math.erf(middle / math.sqrt(2))) / 2 < probability:
+      lower = middle
+    else:
+      upper = middle
+  return (lower + upper) / 2
+
+
 class Protocol(ABC):
   """
   Abstract class for a protocol which is used to coordinate the interactions
   between the learner and the bandit environment.
 
   For each setup, just call :func:`play` to start the game.
+
+  Trials are run by a pool of worker processes which is reused across learners
+  and across calls of :func:`play`. The pool can be provided by the caller.
+  Otherwise, it is created by the protocol on the first call of :func:`play`
+  and shut down by :func:`close`. The protocol can also be used as a context
+  manager, which calls :func:`close` on exit.
   """
+  # target seconds of a chunk of trials when the chunk size is auto-tuned
+  CHUNK_SECONDS = 0.2
+  # minimum number of trials before the target precision is checked
+  MIN_PRECISION_TRIALS = 10
+  # default seconds between two writes of the status file
+  STATUS_INTERVAL = 10.0
+  # maximum seconds a worker holds the progress of finished trials before
+  # reporting it
+  PROGRESS_REPORT_SECONDS = 1.0
+
   def __init__(self,
-               bandit: Bandit,
-               learners: List[Learner]):
+               bandit: Union[Bandit, AsyncBandit],
+               learners: List[Learner],
+               pool: Pool = None):
     """
     Args:
       bandit: bandit environment
       learners: learners to be compared with
+      pool: pool of worker processes used to run the trials. The pool is owned
+        by the caller and will not be shut down by :func:`close`. A
+        :class:`banditpylib.protocols.DistributedPool` can be used to run the
+        trials on other hosts.
     """
+    # asynchronous environments follow the interface of a synchronous one
+    environment = bandit.interface if isinstance(bandit,
+                                                 AsyncBandit) else type(bandit)
     for learner in learners:
-      if not isinstance(bandit, learner.running_environment):
+      if not issubclass(environment, learner.running_environment):
         raise Exception('Learner %s can not recognize environment %s!' %
                         (learner.name, bandit.name))
     self.__bandit = bandit
     self.__learners = learners
     # learner the simulator is currently running
     self.__current_learner: Learner
+    self.__pool = pool
+    # whether the pool is created and owned by the protocol
+    self.__owns_pool = False
+    # number of processes of the pool owned by the protocol
+    self.__pool_processes = 0
+    # whether the trials are run with common random numbers
+    self.__common_random_numbers = False
+    # fraction of the trials run under the profiler
+    self.__profile_fraction = 0.0
+    # whether to track the memory usage of each trial
+    self.__track_memory = False
+    # memory budget of one trial in bytes
+    self.__memory_budget: Optional[int] = None
+    # queue the workers report progress to
+    self.__progress_queue = None
+    # trials and steps finished by the worker but not reported yet
+    self.__unreported_progress = (0, 0)
+    # time of the last progress report of the worker
+    self.__last_progress_report = 0.0
+    # seconds between two progress reports
+    self.__progress_interval: Optional[float] = None
+    # file used to dump the progress
+    self.__status_filename: Optional[str] = None
+    # first error raised when handling the results of a chunk
+    self.__chunk_error: Optional[Exception] = None
+    # whether the manifest of finished trials is written
+    self.__resumable = False
+
+  def __getstate__(self):
+    # the pool can not be pickled and is never used by the workers. Workers
+    # only run the current learner, so the other learners are not shipped.
+    state = self.__dict__.copy()
+    state['_Protocol__pool'] = None
+    state['_Protocol__owns_pool'] = False
+    state['_Protocol__learners'] = []
+    state['_Protocol__writer'] = None
+    state['_Protocol__chunk_error'] = None
+    return state
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
 
   @property
   @abstractmethod
@@ -51,7 +214,7 @@ class Protocol(ABC):
     """protocol name"""
 
   @property
-  def bandit(self) -> Bandit:
+  def bandit(self) -> Union[Bandit, AsyncBandit]:
     """bandit environment the simulator is running in"""
     return self.__bandit
 
@@ -60,8 +223,43 @@ class Protocol(ABC):
     """current learner the simulator is using"""
     return self.__current_learner
 
+  def _pool(self, processes: int) -> Pool:
+    """Pool of worker processes
+
+    If no pool is provided by the caller, a pool owned by the protocol is
+    created lazily and reused until :func:`close` is called or a different
+    number of processes is requested.
+
+    Args:
+      processes: maximum number of processes to run. -1 means no limit. It is
+        ignored when the pool is provided by the caller.
+
+    Returns:
+      pool to run the trials
+    """
+    processes = multiprocessing.cpu_count() if processes < 0 else processes
+    if self.__pool is not None and self.__owns_pool and \
+        self.__pool_processes != processes:
+      self.close()
+    if self.__pool is None:
+      self.__pool = Pool(processes=processes)
+      self.__owns_pool = True
+      self.__pool_processes = processes
+    return self.__pool
+
+  def close(self):
+    """Shut down the pool owned by the protocol
+
+    The pool provided by the caller is left untouched.
+    """
+    if self.__pool is not None and self.__owns_pool:
+      self.__pool.close()
+      self.__pool.join()
+      self.__pool = None
+      self.__owns_pool = False
+
   @abstractmethod
-  def _one_trial(self, random_seed: int, debug: bool) -> \
+  def _one_trial(self, random_seed: TrialSeed, debug: bool) -> \
       Union[Dict, List[Dict]]:
     """One trial of the game
 
@@ -75,67 +273,668 @@ class Protocol(ABC):
       result of one trial
     """
 
-  def __write_to_file(self, data: Union[Dict, List[Dict]]):
-    """Write the result of one trial to file
+  def _timed_phases(self) -> List[str]:
+    """
+    Returns:
+      phases measured in each trial, whose statistics are dumped by
+      :class:`banditpylib.protocols.PhaseTimer` in the final record of the
+      trial. Empty list means no instrumentation.
+    """
+    return []
+
+  def __profiled(self, trial: int, random_seed: TrialSeed) -> bool:
+    """
+    Args:
+      trial: index of the trial
+      random_seed: random seed of the trial
+
+    Returns:
+      whether the trial is run under the profiler
+    """
+    if self.__profile_fraction <= 0:
+      return False
+    # the first trial is always profiled. The others are sampled by the first
+    # words of their seed sequences which are uniformly distributed.
+    return trial == 0 or \
+        trial_seed_sequence(random_seed).generate_state(1)[0] % 1000000 < \
+        self.__profile_fraction * 1000000
+
+  def _trial_chunk(self, trials: List[Tuple[int, TrialSeed]], debug: bool) -> \
+      Tuple[List[Tuple[int, TrialSeed, Union[Dict, List[Dict]]]], float,
+            Optional[Dict]]:
+    """A chunk of trials of the game
+
+    This method runs the trials one after another in the worker and returns
+    their results in one batch.
+
+    Args:
+      trials: index and random seed of each trial
+      debug: whether to run the trials in debug mode
+
+    Returns:
+      index, random seed and result of each trial, the seconds used to run
+      the trials and the profiler statistics of the trials sampled for
+      profiling
+    """
+    start_time = time.perf_counter()
+    profiler = TrialProfiler()
+    results = []
+    for (trial, random_seed) in trials:
+      self.__bandit.set_common_random_numbers(
+          self._common_random_seed(random_seed))
+      one_trial = functools.partial(profiler.run, self._one_trial) \
+          if self.__profiled(trial, random_seed) else self._one_trial
+      if self.__track_memory:
+        (data, peak_memory, rss_growth) = memory.track_memory(
+            one_trial, random_seed=random_seed, debug=debug)
+        # memory usage is added to the final record of the trial
+        final_record = data[-1] if isinstance(data, list) else data
+        final_record['peak_memory'] = peak_memory
+        final_record['rss_growth'] = rss_growth
+      else:
+        data = one_trial(random_seed=random_seed, debug=debug)
+      results.append((trial, random_seed, data))
+      self._report_progress(data)
+    self._flush_progress()
+    return (results, time.perf_counter() - start_time, profiler.stats())
+
+  def _common_random_seed(self,
+                          random_seed: TrialSeed) -> Optional[List[int]]:
+    """
+    Args:
+      random_seed: random seed of the trial
+
+    Returns:
+      seed of common random numbers of the bandit environment in the trial,
+      which is drawn from the seed sequence of the trial. `None` means common
+      random numbers are not used.
+    """
+    if not self.__common_random_numbers:
+      return None
+    return trial_seed_sequence(random_seed).generate_state(4).tolist()
+
+  def _report_progress(self, data: Union[Dict, List[Dict]]):
+    """Report a finished trial to the parent process
+
+    Each report is a round trip to the manager process serving the queue, so
+    finished trials are accumulated in the worker and reported at most every
+    :attr:`PROGRESS_REPORT_SECONDS` seconds and by :func:`_flush_progress`.
+
+    Args:
+      data: result of the trial
+    """
+    if self.__progress_queue is None:
+      return
+    final_record = data[-1] if isinstance(data, list) else data
+    (trials, steps) = self.__unreported_progress
+    self.__unreported_progress = (trials + 1,
+                                  steps + final_record.get('total_actions', 0))
+    if time.monotonic() - self.__last_progress_report >= \
+        self.PROGRESS_REPORT_SECONDS:
+      self._flush_progress()
+
+  def _flush_progress(self):
+    """Report the finished trials not reported yet to the parent process"""
+    if self.__progress_queue is None or self.__unreported_progress[0] == 0:
+      return
+    self.__progress_queue.put(self.__unreported_progress)
+    self.__unreported_progress = (0, 0)
+    self.__last_progress_report = time.monotonic()
+
+  def __handle_chunk(
+      self, chunk: Tuple[List[Tuple[int, TrialSeed, Union[Dict, List[Dict]]]],
+                         float, Optional[Dict]]):
+    """Callback of a finished chunk of trials
+
+    The callback runs on the result handler thread of the pool, which stops
+    handling any result if the callback raises. So the callback never raises.
+    The first error is kept instead and raised in the main thread by
+    :func:`__run_wave`, and the chunks finished after it are dropped.
+
+    Args:
+      chunk: index, random seed and result of each trial, the seconds used to
+        run the trials and the profiler statistics
+    """
+    if self.__chunk_error is not None:
+      return
+    try:
+      self.__write_chunk(chunk)
+    except Exception as error:  # pylint: disable=broad-except
+      self.__chunk_error = error
+
+  def __write_chunk(
+      self, chunk: Tuple[List[Tuple[int, TrialSeed, Union[Dict, List[Dict]]]],
+                         float, Optional[Dict]]):
+    """Write the results of a chunk of trials to file
 
     Args:
-      data: result of one trial
+      chunk: index, random seed and result of each trial, the seconds used to
+        run the trials and the profiler statistics
     """
-    with open(self.__output_filename, 'a') as f:
-      if isinstance(data, list):
-        for data_point in data:
-          json.dump(data_point, f)
-          f.write('\n')
+    (results, seconds, profile_stats) = chunk
+    if profile_stats is not None:
+      self.__profile_stats = merge_stats(self.__profile_stats, profile_stats)
+    records: List[Dict] = []
+    # final regret of each trial, which is `None` if the trial is censored
+    final_regrets: List[Optional[float]] = []
+    for (trial, random_seed, data) in results:
+      records.extend(data if isinstance(data, list) else [data])
+      # the final regret is the last record of a trial
+      final_record = data[-1] if isinstance(data, list) else data
+      # the seed of the trial is the entropy of the play and the spawn key
+      # `(seed_stream, trial)`. The entropy is stored as a string since it
+      # does not fit in 64 bits.
+      final_record['trial'] = trial
+      final_record['seed_entropy'] = str(random_seed[0])
+      final_record['seed_stream'] = random_seed[1][0]
+      if self.__phase_timer is not None:
+        self.__phase_timer.merge(final_record)
+      if self.__track_memory:
+        self.__check_memory(trial, final_record['peak_memory'],
+                            final_record['rss_growth'])
+      # regrets of the trials stopped by a limit are cut short, so they are
+      # left out of the confidence interval
+      if final_record.get('censored', False):
+        self.__censored_trials += 1
+        final_regrets.append(None)
       else:
-        json.dump(data, f)
-        f.write('\n')
-      f.flush()
+        final_regrets.append(final_record['regret'])
+    self.__final_regrets.extend(
+        final_regret for final_regret in final_regrets
+        if final_regret is not None)
+    self.__writer.write(records,
+                        manifest_entries=[{
+                            'learner': self.__current_learner.name,
+                            'trial': trial,
+                            'seed': [random_seed[0],
+                                     list(random_seed[1])],
+                            'regret': final_regret
+                        } for ((trial, random_seed, _), final_regret) in zip(
+                            results, final_regrets)]
+                        if self.__resumable else None)
+    self.__finished_trials += len(results)
+    self.__trial_seconds += seconds
+
+  def __check_memory(self, trial: int, peak_memory: int, rss_growth: int):
+    """Check the memory usage of a trial against the budget
+
+    Args:
+      trial: index of the trial
+      peak_memory: peak traced memory of the trial in bytes
+      rss_growth: growth of the maximum resident set size in bytes
+    """
+    self.__max_peak_memory = max(self.__max_peak_memory, peak_memory)
+    self.__max_rss_growth = max(self.__max_rss_growth, rss_growth)
+    if self.__memory_budget is not None and \
+        max(peak_memory, rss_growth) > self.__memory_budget:
+      logging.warning(
+          'trial %d of %s uses %d bytes of memory which is over the budget '
+          '%d bytes', trial, self.__current_learner.name,
+          max(peak_memory, rss_growth), self.__memory_budget)
+
+  def __submit(self, pool: Pool, key: str, trials: List[Tuple[int, TrialSeed]],
+               chunk_size: int, debug: bool) -> List[AsyncResult]:
+    """Submit trials to the pool in chunks
+
+    Args:
+      pool: pool to run the trials
+      key: key of the protocol published for the workers
+      trials: index and random seed of each trial to submit
+      chunk_size: number of trials in each chunk
+      debug: whether to run the trials in debug mode
+
+    Returns:
+      results of the chunks
+    """
+    chunk_results = []
+    for start in range(0, len(trials), chunk_size):
+      chunk_results.append(
+          pool.apply_async(worker.run_trial_chunk,
+                           args=[key, trials[start:start + chunk_size], debug],
+                           callback=self.__handle_chunk))
+    return chunk_results
 
-  def play(self, trials: int, output_filename: str, processes=-1, debug=False):
+  @staticmethod
+  def manifest_filename(output_filename: str) -> str:
+    """
+    Args:
+      output_filename: file used to dump the results
+
+    Returns:
+      file used to dump the manifest of finished trials
+    """
+    return output_filename.rstrip('/\\') + '.manifest'
+
+  @staticmethod
+  def __finished_trials_in_manifest(manifest_filename: str) -> \
+      Dict[str, Dict[int, Tuple[TrialSeed, Optional[float]]]]:
+    """
+    Args:
+      manifest_filename: file of the manifest
+
+    Returns:
+      index, random seed and final regret of the finished trials of each
+      learner. The final regret is `None` if the trial is censored.
+    """
+    finished_trials: Dict[str, Dict[int, Tuple[TrialSeed,
+                                               Optional[float]]]] = {}
+    # the entry partially written at the end is dropped the same way as the
+    # result writer does when appending to the manifest
+    for entry in read_manifest(manifest_filename)[0]:
+      (entropy, spawn_key) = entry['seed']
+      finished_trials.setdefault(entry['learner'], {})[entry['trial']] = \
+          ((entropy, tuple(spawn_key)), entry.get('regret'))
+    return finished_trials
+
+  def play(self,
+           trials: int,
+           output_filename: str,
+           processes=-1,
+           debug=False,
+           chunk_size: Optional[int] = 1,
+           output_format: str = 'json',
+           resume: bool = False,
+           resumable: bool = False,
+           common_random_numbers: bool = False,
+           precision: Optional[float] = None,
+           relative_precision: bool = False,
+           confidence: float = 0.95,
+           profile: Optional[str] = None,
+           profile_fraction: float = 0.1,
+           track_memory: bool = False,
+           memory_budget: Optional[int] = None,
+           progress_interval: Optional[float] = None,
+           status_filename: Optional[str] = None,
+           seed: Optional[int] = None) -> Dict[str, int]:
     """Start playing the game
 
     Args:
       trials: number of repetitions
       output_filename: file used to dump the results
-      processes: maximum number of processes to run. -1 means no limit
+      processes: maximum number of processes to run. -1 means no limit. It is
+        ignored when the pool is provided by the caller.
       debug: debug mode. When it is set to `True`, `trials` will be
         automatically set to 1 and debug information of the trial will be
         printed out.
+      chunk_size: number of trials sent to a worker at a time. The results of
+        a chunk are returned in one batch. When it is set to `None`, one trial
+        per process is run first to measure the time of a trial and the chunk
+        size is tuned such that a chunk takes about
+        :attr:`CHUNK_SECONDS` seconds.
+      output_format: `json` to dump each record as one line of JSON or
+        `columnar` to store the records as typed columns under the directory
+        `output_filename`, which can be loaded by
+        :func:`banditpylib.protocols.load_columnar`
+      resume: whether to resume a previous run. Trials of a learner are
+        indexed from 0 and the finished ones are kept in the manifest returned
+        by :func:`manifest_filename`. When it is set to `True`, trials already
+        in the manifest are skipped, and records of the trials not in the
+        manifest are dropped from `output_filename` before the trials are
+        run again. The manifest keeps being written.
+      resumable: whether the play can be resumed later. When it is set to
+        `True`, the manifest is started over and each entry is only written
+        after the records of the trial are synced to the disk. Otherwise, no
+        manifest is written.
+      common_random_numbers: whether to compare the learners with common
+        random numbers. When it is set to `True`, the `i`-th trial of every
+        learner uses the same random seed and the bandit environment draws
+        the rewards of each arm from a stream determined by this seed, so
+        the learners see the same rewards and their regrets can be compared
+        in pairs. The bandit environment should support
+        :func:`banditpylib.bandits.Bandit.set_common_random_numbers`.
+      precision: target width of the confidence interval of the mean final
+        regret, which is the error rate for learners with
+        :class:`banditpylib.learners.BestArmId` goals. When it is set, trials
+        are run in waves and each learner stops once the interval is narrow
+        enough or `trials` trials are run. Trials censored by a limit are left
+        out of the interval since their regrets are cut short. When resuming,
+        the final regrets of the trials kept in the manifest are counted.
+      relative_precision: whether `precision` is relative to the mean final
+        regret
+      confidence: confidence level of the interval
+      profile: prefix of the files used to dump the profiler statistics. When
+        it is set, a sample of the trials are run under :mod:`cProfile` in
+        the workers. The statistics of each learner are merged and dumped to
+        `<profile>.<learner name>.pstats`, which can be loaded by
+        :class:`pstats.Stats`.
+      profile_fraction: fraction of the trials to profile. The first trial of
+        each learner is always profiled.
+      track_memory: whether to track the memory usage of each trial. When it
+        is set to `True`, the peak memory traced by :mod:`tracemalloc` and the
+        growth of the maximum resident set size of the worker during each
+        trial are added to the final record of the trial as `peak_memory` and
+        `rss_growth` in bytes. Tracing slows down the trials.
+      memory_budget: memory budget of one trial in bytes. A warning is logged
+        when a trial uses more memory than the budget. It requires
+        `track_memory` to be set.
+      progress_interval: seconds between two progress reports. When it is
+        set, workers report the finished trials to the parent process once
+        per chunk or every :attr:`PROGRESS_REPORT_SECONDS` seconds, which
+        logs the finished trials, the steps per second and the ETA of the
+        current learner periodically.
+      status_filename: file used to dump the progress in JSON, which is
+        replaced atomically every `progress_interval` seconds or every
+        :attr:`STATUS_INTERVAL` seconds if `progress_interval` is not set. See
+        :class:`banditpylib.protocols.ProgressMonitor` for details.
+      seed: root seed of the play. Each trial gets its own child of the
+        :class:`numpy.random.SeedSequence` of `seed` by :func:`trial_seeds`
+        and spawns the generators of the bandit environment and the learner
+        from it, so a play is reproducible with the same `seed` no matter how
+        the trials are distributed. `None` means fresh entropy is drawn from
+        the operating system, which is logged. The entropy and the spawn key
+        of each trial are kept in the final record of the trial as
+        `seed_entropy`, `seed_stream` and `trial` and in the manifest if any,
+        so a single trial can be replayed by :func:`seed_trial`.
+
+    Returns:
+      number of trials run for each learner
 
     .. warning::
-      By default, `output_filename` will be opened with mode `a`.
+      By default, results are appended to `output_filename`. Learners are
+      identified by their names in the manifest.
     """
     if debug:
       trials = 1
+    if chunk_size is not None and chunk_size < 1:
+      raise Exception('Chunk size %d is less than 1!' % chunk_size)
+    if precision is not None and precision < 0:
+      raise Exception('Precision %.2f is negative!' % precision)
+    if not 0 < confidence < 1:
+      raise Exception('Confidence %.2f is not in (0, 1)!' % confidence)
+    if profile is not None and not 0 < profile_fraction <= 1:
+      raise Exception('Profile fraction %.2f is not in (0, 1]!' %
+                      profile_fraction)
+    processes = multiprocessing.cpu_count() if processes < 0 else processes
+    pool = self._pool(processes)
+
+    # the manifest is only kept when the play can be resumed
+    manifest_filename = self.manifest_filename(output_filename) if (
+        resume or resumable) else None
+    self.__resumable = manifest_filename is not None
+    finished_trials = self.__finished_trials_in_manifest(
+        manifest_filename) if resume else {}
 
-    for learner in self.__learners:
-      # set current learner
-      self.__current_learner = learner
+    self.__common_random_numbers = common_random_numbers
+    self.__profile_fraction = profile_fraction if profile is not None else 0.0
+    if memory_budget is not None and not track_memory:
+      raise Exception('Memory budget requires tracking memory!')
+    self.__track_memory = track_memory
+    self.__memory_budget = memory_budget
+    if progress_interval is not None and progress_interval <= 0:
+      raise Exception('Progress interval %.2f is no greater than 0!' %
+                      progress_interval)
+    self.__progress_interval = progress_interval
+    self.__status_filename = status_filename
+    self.__chunk_error = None
+    root_seed_sequence = np.random.SeedSequence(seed)
+    if seed is None:
+      logging.info('root seed of the play is %d', root_seed_sequence.entropy)
+    random_seeds = None
+    if common_random_numbers:
+      # make sure the bandit environment supports common random numbers
+      self.__bandit.set_common_random_numbers(0)
+      self.__bandit.set_common_random_numbers(None)
+      # all the learners share the same seeds. Seeds of the trials finished
+      # before are reused so that the trials are still paired after resuming.
+      random_seeds = trial_seeds(root_seed_sequence.entropy, 0, trials)
+      for learner_trials in finished_trials.values():
+        for (trial, (random_seed, _)) in learner_trials.items():
+          if trial < trials:
+            random_seeds[trial] = random_seed
+
+    # number of trials run for each learner
+    used_trials: Dict[str, int] = {}
+    # the queue of progress reports is served by a manager process so that it
+    # can be passed to the workers of the pool
+    manager = multiprocessing.Manager() if (
+        progress_interval is not None or status_filename is not None) else None
+    # results are written by a background thread
+    with open_result_writer(output_filename,
+                            output_format,
+                            manifest_filename=manifest_filename,
+                            append_manifest=resume) as writer:
+      self.__writer = writer
+      if manager is not None:
+        self.__progress_queue = manager.Queue()
+      try:
+        for (learner_index, learner) in enumerate(self.__learners):
+          # without common random numbers, each learner gets its own stream of
+          # seeds
+          learner_seeds = random_seeds if random_seeds is not None else \
+              trial_seeds(root_seed_sequence.entropy, learner_index, trials)
+          used_trials[learner.name] = self.__play_learner(
+              learner=learner,
+              trials=trials,
+              pool=pool,
+              processes=processes,
+              debug=debug,
+              chunk_size=chunk_size,
+              finished_trials={
+                  trial: final_regret for (trial, (_, final_regret)) in
+                  finished_trials.get(learner.name, {}).items()
+              },
+              random_seeds=learner_seeds,
+              precision=precision,
+              relative_precision=relative_precision,
+              confidence=confidence)
+          if self.__profile_stats is not None:
+            profile_filename = '%s.%s.pstats' % (profile, learner.name)
+            self.__profile_stats.dump_stats(profile_filename)
+            logging.info('profiler statistics of %s are dumped to %s',
+                         learner.name, profile_filename)
+      finally:
+        self.__writer = None
+        self.__progress_queue = None
+        if manager is not None:
+          manager.shutdown()
+    return used_trials
+
+  def __play_learner(self, learner: Learner, trials: int, pool: Pool,
+                     processes: int, debug: bool, chunk_size: Optional[int],
+                     finished_trials: Dict[int, Optional[float]],
+                     random_seeds: List[TrialSeed],
+                     precision: Optional[float], relative_precision: bool,
+                     confidence: float) -> int:
+    """Run the trials of one learner
+
+    Args:
+      learner: learner to run
+      trials: number of repetitions
+      pool: pool to run the trials
+      processes: number of processes of the pool
+      debug: whether to run the trials in debug mode
+      chunk_size: number of trials sent to a worker at a time
+      finished_trials: final regret of each trial finished in a previous run.
+        The final regret is `None` if the trial is censored.
+      random_seeds: random seed of each trial
+      precision: target width of the confidence interval of the final regret
+      relative_precision: whether `precision` is relative to the mean
+      confidence: confidence level of the interval
+
+    Returns:
+      number of trials run
+    """
+    # set current learner
+    self.__current_learner = learner
 
-      logging.info('start %s\'s play with %s',
-                   self.__current_learner.name, self.__bandit.name)
+    logging.info('start %s\'s play with %s',
+                 self.__current_learner.name, self.__bandit.name)
 
-      start_time = time.time()
-      self.__output_filename = output_filename
-      pool = Pool(processes=(
-          multiprocessing.cpu_count() if processes < 0 else processes))
+    start_time = time.time()
+    self.__finished_trials = 0
+    self.__trial_seconds = 0.0
+    # final regrets of the trials not censored including the ones finished in
+    # a previous run, which are used by the stopping rule
+    self.__final_regrets: List[float] = [
+        final_regret for (trial, final_regret) in finished_trials.items()
+        if trial < trials and final_regret is not None
+    ]
+    # profiler statistics merged across the workers
+    self.__profile_stats: Optional[pstats.Stats] = None
+    # number of trials stopped by a limit
+    self.__censored_trials = 0
+    # maximum memory usage of the trials
+    self.__max_peak_memory = 0
+    self.__max_rss_growth = 0
+    # statistics of the phases aggregated across the workers
+    self.__phase_timer = PhaseTimer(
+        self._timed_phases()) if self._timed_phases() else None
+    # trials left to run
+    pending_trials = [(trial, random_seeds[trial]) for trial in range(trials)
+                      if trial not in finished_trials]
+    if len(pending_trials) < trials:
+      logging.info('%d trials of %s are finished before and skipped',
+                   trials - len(pending_trials), learner.name)
 
-      trial_results = []
-      for _ in range(trials):
-        result = pool.apply_async(self._one_trial,
-                                  args=[time_seed(), debug],
-                                  callback=self.__write_to_file)
+    monitor = None
+    if self.__progress_queue is not None:
+      monitor = ProgressMonitor(
+          self.__progress_queue,
+          learner_name=learner.name,
+          bandit_name=self.__bandit.name,
+          trials=len(pending_trials),
+          interval=self.__progress_interval if self.__progress_interval
+          is not None else self.STATUS_INTERVAL,
+          log_progress=self.__progress_interval is not None,
+          status_filename=self.__status_filename)
+      monitor.start()
 
-        trial_results.append(result)
+    # the bandit and the current learner are shipped to each worker once.
+    # Distributed workers may not share the file system with this process, so
+    # the protocol is published through the pool.
+    publisher = pool if isinstance(pool, DistributedPool) else worker
+    key = publisher.publish(self)
+    try:
+      # seconds of one trial, which is measured when the chunk size is tuned
+      trial_seconds = None
+      if chunk_size is None and pending_trials:
+        # run one trial per process to measure the time of one trial
+        self.__run_wave(pool=pool,
+                        key=key,
+                        trials=pending_trials[:processes],
+                        chunk_size=1,
+                        debug=debug)
+        pending_trials = pending_trials[processes:]
+        trial_seconds = self.__trial_seconds / max(self.__finished_trials, 1)
+        logging.info('one trial takes %.2e seconds', trial_seconds)
 
-      # can not apply for processes any more
-      pool.close()
-      pool.join()
+      while pending_trials:
+        wave_size = len(pending_trials) if precision is None else \
+            self.__wave_size(processes=processes,
+                             precision=precision,
+                             relative_precision=relative_precision,
+                             confidence=confidence)
+        # stop when the target precision is reached
+        if wave_size == 0:
+          break
+        wave = pending_trials[:wave_size]
+        pending_trials = pending_trials[wave_size:]
+        # keep a few chunks per process to balance the load
+        wave_chunk_size = chunk_size if chunk_size is not None else max(
+            1,
+            min(int(self.CHUNK_SECONDS / max(trial_seconds, 1e-9)),
+                math.ceil(len(wave) / (4 * processes))))
+        self.__run_wave(pool=pool,
+                        key=key,
+                        trials=wave,
+                        chunk_size=wave_chunk_size,
+                        debug=debug)
+    finally:
+      publisher.unpublish(key)
+      if monitor is not None:
+        monitor.stop()
 
-      # check if there are exceptions during the trials
-      for result in trial_results:
-        result.get()
+    if precision is not None:
+      logging.info(
+          '%s uses %d trials and the confidence interval of its final regret '
+          'over %d trials not censored is %.3e +/- %.3e',
+          self.__current_learner.name, self.__finished_trials,
+          len(self.__final_regrets), *self.__final_regret_interval(confidence))
+    if self.__censored_trials > 0:
+      logging.warning('%d trials of %s are censored by the limits',
+                      self.__censored_trials, self.__current_learner.name)
+    if self.__track_memory:
+      logging.info(
+          'peak memory of a trial of %s is %d bytes and its RSS grows by at '
+          'most %d bytes', self.__current_learner.name,
+          self.__max_peak_memory, self.__max_rss_growth)
+    if self.__phase_timer is not None:
+      logging.info('phases of %s: %s', self.__current_learner.name,
+                   self.__phase_timer.summary())
+    logging.info('%s\'s play with %s runs %.2f seconds.',
+                 self.__current_learner.name, self.__bandit.name,
+                 time.time() - start_time)
+    return self.__finished_trials
 
-      logging.info('%s\'s play with %s runs %.2f seconds.',
-                   self.__current_learner.name, self.__bandit.name,
-                   time.time() - start_time)
+  def __run_wave(self, pool: Pool, key: str,
+                 trials: List[Tuple[int, TrialSeed]], chunk_size: int,
+                 debug: bool):
+    """Run a wave of trials and wait for them to finish
+
+    Args:
+      pool: pool to run the trials
+      key: key of the protocol published for the workers
+      trials: index and random seed of each trial to run
+      chunk_size: number of trials in each chunk
+      debug: whether to run the trials in debug mode
+    """
+    chunk_results = self.__submit(pool=pool,
+                                  key=key,
+                                  trials=trials,
+                                  chunk_size=chunk_size,
+                                  debug=debug)
+    # wait for all the trials to finish
+    for result in chunk_results:
+      result.wait()
+    # check if there are exceptions during the trials
+    for result in chunk_results:
+      result.get()
+    if self.__chunk_error is not None:
+      raise self.__chunk_error
+
+  def __final_regret_interval(self, confidence: float) -> Tuple[float, float]:
+    """
+    Args:
+      confidence: confidence level of the interval
+
+    Returns:
+      mean of the final regrets of the trials finished and not censored and
+      half width of its confidence interval
+    """
+    final_regrets = np.array(self.__final_regrets)
+    if len(final_regrets) < 2:
+      return (float(np.mean(final_regrets)) if len(final_regrets) else 0.0,
+              math.inf)
+    return (float(np.mean(final_regrets)),
+            normal_quantile(0.5 + confidence / 2) *
+            float(np.std(final_regrets, ddof=1)) /
+            math.sqrt(len(final_regrets)))
+
+  def __wave_size(self, processes: int, precision: float,
+                  relative_precision: bool, confidence: float) -> int:
+    """Number of trials to run in the next wave
+
+    Args:
+      processes: number of processes of the pool
+      precision: target width of the confidence interval
+      relative_precision: whether `precision` is relative to the mean
+      confidence: confidence level of the interval
+
+    Returns:
+      number of trials to run in the next wave. 0 means the target precision
+      is reached.
+    """
+    finished_trials = len(self.__final_regrets)
+    if finished_trials < self.MIN_PRECISION_TRIALS:
+      return max(self.MIN_PRECISION_TRIALS - finished_trials, processes)
+    (mean, half_width) = self.__final_regret_interval(confidence)
+    target_width = precision * abs(mean) if relative_precision else precision
+    if 2 * half_width <= target_width:
+      return 0
+    # the width shrinks with the square root of the number of trials
+    needed_trials = math.inf if target_width == 0 else math.ceil(
+        finished_trials * (2 * half_width / target_width)**2)
+    # the number of trials is at most doubled in one wave since the estimated
+    # variance is not accurate
+    return max(processes, min(needed_trials - finished_trials,
+                              finished_trials))
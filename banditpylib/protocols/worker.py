@@ -0,0 +1,104 @@
+import os
+import pickle
+import tempfile
+import uuid
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# protocols loaded by the current worker process keyed by the payload
+_PROTOCOLS: Dict[str, Any] = {}
+
+
+def _load_from_file(key: str):
+  """Load a protocol published by :func:`publish`
+
+  Args:
+    key: key of the published protocol
+
+  Returns:
+    the protocol
+  """
+  with open(key, 'rb') as f:
+    return pickle.load(f)
+
+
+# function used to load a published protocol in the worker
+_loader: Callable[[str], Any] = _load_from_file
+
+
+def set_loader(loader: Callable[[str], Any]):
+  """Set how the worker loads a published protocol
+
+  By default, protocols are loaded from the files written by :func:`publish`.
+  Workers on other hosts can not read these files, so they fetch the
+  protocols in other ways.
+
+  Args:
+    loader: function mapping the key of a published protocol to the protocol
+  """
+  global _loader  # pylint: disable=global-statement
+  _loader = loader
+
+
+def publish(protocol) -> str:
+  """Publish a protocol for the workers
+
+  The protocol is pickled only once into a temporary file. Each worker process
+  loads it the first time it sees the returned key and reuses it afterwards,
+  so a task only needs to carry the key.
+
+  Args:
+    protocol: protocol to publish
+
+  Returns:
+    key of the published protocol
+  """
+  (fd, filename) = tempfile.mkstemp(prefix='banditpylib_%s_' %
+                                    uuid.uuid4().hex,
+                                    suffix='.pkl')
+  with os.fdopen(fd, 'wb') as f:
+    pickle.dump(protocol, f, protocol=pickle.HIGHEST_PROTOCOL)
+  return filename
+
+
+def unpublish(key: str):
+  """Remove a published protocol
+
+  Args:
+    key: key of the published protocol
+  """
+  if os.path.exists(key):
+    os.remove(key)
+
+
+def load(key: str):
+  """Load a published protocol in the worker
+
+  Args:
+    key: key of the published protocol
+
+  Returns:
+    the protocol
+  """
+  if key not in _PROTOCOLS:
+    # only the latest protocol is kept since trials of one learner are run at
+    # a time
+    _PROTOCOLS.clear()
+    _PROTOCOLS[key] = _loader(key)
+  return _PROTOCOLS[key]
+
+
+def run_trial_chunk(key: str, trials: List[Tuple[int, Any]], debug: bool):
+  """Run a chunk of trials of a published protocol in the worker
+
+  Args:
+    key: key of the published protocol
+    trials: index and random seed of each trial
+    debug: whether to run the trials in debug mode
+
+  Returns:
+    index, random seed and result of each trial, the seconds used to run the
+    trials and the profiler statistics of the trials sampled for profiling
+  """
+  # pylint: disable=protected-access
+  return load(key)._trial_chunk(trials=trials, debug=debug)
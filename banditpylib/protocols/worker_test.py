@@ -0,0 +1,30 @@
+import os
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import OrdinaryBandit
+from banditpylib.learners.ordinary_learner import EpsGreedy, UCB
+from .single_player import SinglePlayerProtocol
+from .worker import publish, unpublish, load
+
+
+class TestWorker:
+  """Test worker utilities"""
+
+  def test_publish_and_load(self):
+    arms = [BernoulliArm(mean) for mean in [0.3, 0.5, 0.7]]
+    single_player = SinglePlayerProtocol(
+        bandit=OrdinaryBandit(arms),
+        learners=[EpsGreedy(arm_num=3, horizon=10),
+                  UCB(arm_num=3, horizon=10)])
+    key = publish(single_player)
+    try:
+      protocol = load(key)
+      # the protocol is loaded only once
+      assert load(key) is protocol
+      # learners in the comparison list are not shipped
+      # pylint: disable=protected-access
+      assert protocol._Protocol__learners == []
+      assert protocol.bandit.name == 'ordinary_bandit'
+    finally:
+      unpublish(key)
+    assert not os.path.exists(key)
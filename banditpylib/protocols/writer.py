@@ -0,0 +1,806 @@
+from abc import ABC, abstractmethod
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+def _read_json_lines(filename: str) -> Tuple[List[Any], int]:
+  """Read the JSON lines of a file
+
+  Only the lines ending with a newline are complete. The line after the last
+  newline may be partially written and is ignored even if it can be parsed.
+
+  Args:
+    filename: file of the JSON lines
+
+  Returns:
+    values of the complete lines and their size in bytes
+  """
+  values: List[Any] = []
+  # size of the complete lines
+  size = 0
+  if not os.path.exists(filename):
+    return (values, size)
+  with open(filename, 'rb') as f:
+    for line in f:
+      if not line.endswith(b'\n'):
+        break
+      size += len(line)
+      try:
+        values.append(json.loads(line))
+      except ValueError:
+        continue
+  return (values, size)
+
+
+def read_manifest(manifest_filename: str) -> Tuple[List[Dict], int]:
+  """Read the entries of a manifest
+
+  Only the lines ending with a newline are complete entries. The line after
+  the last newline may be partially written and is ignored even if it can be
+  parsed.
+
+  Args:
+    manifest_filename: file of the manifest
+
+  Returns:
+    complete entries of the manifest and size in bytes of their lines
+  """
+  return _read_json_lines(manifest_filename)
+
+
+class ResultWriter(ABC):
+  """Background writer of trial results
+
+  Results are put into a bounded queue and dumped by a dedicated thread, so the
+  threads producing results never wait for file I/O unless the queue is full.
+  Records are written in batches, and a batch is written once `batch_size`
+  records are collected or `flush_interval` seconds have passed since the
+  oldest record of the batch arrived. All the records left are written by
+  :func:`close`.
+
+  Optionally, a manifest of finished trials is kept as JSON lines in
+  `manifest_filename`. Entries of the manifest are only written after the
+  records of the same batch are synced to the disk, so an entry never refers
+  to records not written yet. Each entry keeps the `position` of the output
+  after its batch. When the manifest is appended, the entry partially written
+  at its end is dropped, and so are the records after the position of its
+  last entry, which belong to trials not in the manifest. So a run
+  interrupted at any point can be resumed without torn or duplicated records.
+  """
+  def __init__(self,
+               filename: str,
+               batch_size: int = 1000,
+               flush_interval: float = 1.0,
+               max_queue_size: int = 10000,
+               manifest_filename: str = None,
+               append_manifest: bool = False):
+    """
+    Args:
+      filename: file used to dump the results
+      batch_size: maximum number of records written at a time
+      flush_interval: maximum seconds a record waits before being written
+      max_queue_size: maximum number of results waiting in the queue
+      manifest_filename: file used to dump the manifest of finished trials
+      append_manifest: whether to append to the manifest. Otherwise, the
+        manifest is truncated.
+    """
+    if batch_size < 1:
+      raise Exception('Batch size %d is less than 1!' % batch_size)
+    if flush_interval <= 0:
+      raise Exception('Flush interval %.2f is no greater than 0!' %
+                      flush_interval)
+    self.__filename = filename
+    self.__batch_size = batch_size
+    self.__flush_interval = flush_interval
+    self.__queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+    self.__error = None
+    self.__closed = False
+    self._open(
+        self.__recover_manifest(manifest_filename) if manifest_filename
+        is not None and append_manifest else None)
+    self.__manifest = None if manifest_filename is None else open(
+        manifest_filename, 'a' if append_manifest else 'w')
+    self.__thread = threading.Thread(target=self.__run, daemon=True)
+    self.__thread.start()
+
+  @property
+  def filename(self) -> str:
+    """file used to dump the results"""
+    return self.__filename
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  @staticmethod
+  def __recover_manifest(manifest_filename: str) -> Optional[int]:
+    """Drop the entry partially written at the end of the manifest
+
+    Args:
+      manifest_filename: file of the manifest
+
+    Returns:
+      position of the output after the batch of the last entry. `None` means
+      no entry tells the position.
+    """
+    if not os.path.exists(manifest_filename):
+      return None
+    (entries, size) = read_manifest(manifest_filename)
+    position = None
+    for entry in entries:
+      position = entry.get('position', position)
+    os.truncate(manifest_filename, size)
+    return position
+
+  def __check_error(self):
+    if self.__error is not None:
+      raise Exception('Failed to write results to %s!' % self.__filename) \
+          from self.__error
+
+  def write(self,
+            data: Union[Dict, List[Dict]],
+            manifest_entries: List[Dict] = None):
+    """Write results
+
+    The call only blocks when the queue is full.
+
+    Args:
+      data: one record or a list of records
+      manifest_entries: entries of the manifest telling which trials the
+        records come from
+    """
+    if self.__closed:
+      raise Exception('Writer of %s is closed!' % self.__filename)
+    self.__check_error()
+    self.__queue.put((data if isinstance(data, list) else [data],
+                      manifest_entries if manifest_entries else []))
+
+  def close(self):
+    """Write all the results left and close the file"""
+    if self.__closed:
+      return
+    self.__closed = True
+    # `None` tells the writer thread to stop
+    self.__queue.put(None)
+    self.__thread.join()
+    self._close()
+    if self.__manifest is not None:
+      self.__manifest.close()
+    self.__check_error()
+
+  @abstractmethod
+  def _open(self, position: Optional[int]):
+    """Open the file
+
+    Args:
+      position: position of the output after the last batch in the manifest.
+        Anything written after it is dropped. `None` means the position is
+        unknown.
+    """
+
+  @abstractmethod
+  def _write_batch(self, records: List[Dict]):
+    """Write a batch of records to the file
+
+    Args:
+      records: records to write
+    """
+
+  @abstractmethod
+  def _sync(self) -> int:
+    """Sync the records written to the disk
+
+    Returns:
+      position of the output
+    """
+
+  @abstractmethod
+  def _close(self):
+    """Close the file"""
+
+  def __flush(self, batch: List[Dict], manifest_entries: List[Dict]):
+    """Write a batch of records unless an error happened before
+
+    Args:
+      batch: records to write
+      manifest_entries: entries of the manifest of the batch
+    """
+    if self.__error is None:
+      try:
+        if batch:
+          self._write_batch(batch)
+        if self.__manifest is not None and manifest_entries:
+          position = self._sync()
+          self.__manifest.write(''.join([
+              json.dumps(dict(entry, position=position)) + '\n'
+              for entry in manifest_entries
+          ]))
+          self.__manifest.flush()
+      # pylint: disable=broad-except
+      except Exception as error:
+        self.__error = error
+
+  def __run(self):
+    """Loop of the writer thread"""
+    batch: List[Dict] = []
+    manifest_entries: List[Dict] = []
+    # time by which the oldest record in the batch should be written
+    deadline = None
+    while True:
+      try:
+        item = self.__queue.get(
+            timeout=None if deadline is None else max(
+                0.0, deadline - time.monotonic()))
+      except queue.Empty:
+        item = ([], [])
+      if item is None:
+        self.__flush(batch, manifest_entries)
+        return
+      (records, entries) = item
+      if (records or entries) and deadline is None:
+        deadline = time.monotonic() + self.__flush_interval
+      batch.extend(records)
+      manifest_entries.extend(entries)
+      if deadline is not None and (len(batch) >= self.__batch_size or
+                                   time.monotonic() >= deadline):
+        self.__flush(batch, manifest_entries)
+        batch = []
+        manifest_entries = []
+        deadline = None
+
+
+class JsonLinesWriter(ResultWriter):
+  """JSON lines writer
+
+  Each record is dumped as one line of JSON through a single file handle.
+
+  .. warning::
+    `filename` will be opened with mode `a`. A line partially written at its
+    end is dropped.
+  """
+
+  def _open(self, position: Optional[int]):
+    """Open the file
+
+    Args:
+      position: position of the output after the last batch in the manifest
+    """
+    if os.path.exists(self.filename):
+      with open(self.filename, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        if position is not None and position < end:
+          end = position
+        # drop the line partially written
+        while end > 0:
+          start = max(0, end - 4096)
+          f.seek(start)
+          newline = f.read(end - start).rfind(b'\n')
+          if newline >= 0:
+            end = start + newline + 1
+            break
+          end = start
+        f.truncate(end)
+    self.__file = open(self.filename, 'a')
+
+  def _write_batch(self, records: List[Dict]):
+    """Write a batch of records to the file
+
+    Args:
+      records: records to write
+    """
+    self.__file.write(''.join(
+        [json.dumps(record) + '\n' for record in records]))
+    self.__file.flush()
+
+  def _sync(self) -> int:
+    """Sync the records written to the disk
+
+    Returns:
+      size of the file in bytes
+    """
+    os.fsync(self.__file.fileno())
+    return self.__file.tell()
+
+  def _close(self):
+    """Close the file"""
+    self.__file.close()
+
+
+# name of the file storing the schema of the columns
+SCHEMA_FILENAME = 'schema.json'
+# value of a missing integer
+MISSING_INT = np.iinfo(np.int64).min
+# suffix of the file storing the dictionary of a dictionary-encoded column
+DICTIONARY_SUFFIX = '.dict'
+# suffix of the file storing the values of a list column
+VALUES_SUFFIX = '.values.bin'
+
+
+class ColumnarWriter(ResultWriter):
+  """Columnar writer
+
+  Records are stored as typed columns under the directory `filename`. Each
+  column is a raw binary file `<column>.bin` and the types of the columns are
+  kept in `schema.json`.
+
+  * integers are stored as `int64` and a missing value is
+    :data:`MISSING_INT`
+  * floats are stored as `float64` and a missing value is `nan`. An integer
+    column is converted to `float64` once a float shows up.
+  * booleans are stored as `int8` and a missing value is `-1`
+  * strings are dictionary-encoded and stored as `int32` codes where a missing
+    value is `-1`. The dictionary is appended to `<column>.dict` as JSON lines
+    when new strings show up.
+  * lists of numbers are stored as `int64` offsets, each of which is the end
+    of the values of a row and a missing value is :data:`MISSING_INT`. Values
+    of all the rows are concatenated in `<column>.values.bin`, which are
+    `int64` or `float64` as the integer columns.
+
+  `None` is a missing value and values of any other type are rejected. The
+  schema is only written when the writer is opened or closed, or when the
+  columns change, i.e., a column is added or converted to `float64`.
+
+  Use :func:`load_columnar` to load the columns.
+
+  .. warning::
+    Records are appended if columns already exist under `filename`.
+  """
+
+  def _open(self, position: Optional[int]):
+    """Open the file
+
+    Args:
+      position: number of rows after the last batch in the manifest
+    """
+    os.makedirs(self.filename, exist_ok=True)
+    self.__files: Dict[str, Any] = {}
+    # column name -> {'dtype': ..., 'encoding': ..., 'values_dtype': ...}
+    self.__schema: Dict[str, Dict] = {}
+    # column name -> {string: code}
+    self.__codes: Dict[str, Dict[str, int]] = {}
+    # files of the dictionaries of the dictionary-encoded columns
+    self.__dictionary_files: Dict[str, Any] = {}
+    # files of the values of the list columns
+    self.__value_files: Dict[str, Any] = {}
+    # number of values written to each list column
+    self.__value_counts: Dict[str, int] = {}
+    self.__rows = 0
+    if os.path.exists(os.path.join(self.filename, SCHEMA_FILENAME)):
+      results = load_columnar(self.filename)
+      self.__schema = results.schema
+      self.__rows = len(results)
+      if position is not None:
+        self.__rows = min(self.__rows, position)
+      for (column, schema) in self.__schema.items():
+        # drop the rows partially written or not in the manifest
+        os.truncate(self.__column_path(column),
+                    self.__rows * np.dtype(schema['dtype']).itemsize)
+        if schema.get('encoding') == 'dictionary':
+          os.truncate(
+              self.__column_path(column, DICTIONARY_SUFFIX),
+              _read_json_lines(self.__column_path(column,
+                                                  DICTIONARY_SUFFIX))[1])
+          self.__codes[column] = {
+              value: code
+              for (code, value) in enumerate(results.dictionary(column))
+          }
+          self.__dictionary_files[column] = open(
+              self.__column_path(column, DICTIONARY_SUFFIX), 'a')
+        elif schema.get('encoding') == 'list':
+          self.__value_counts[column] = int(
+              results.values(column)[0][self.__rows])
+          os.truncate(
+              self.__column_path(column, VALUES_SUFFIX),
+              self.__value_counts[column] *
+              np.dtype(schema['values_dtype']).itemsize)
+          self.__value_files[column] = open(
+              self.__column_path(column, VALUES_SUFFIX), 'ab')
+        self.__files[column] = open(self.__column_path(column), 'ab')
+      # the memory-mapped columns are released before they are appended
+      del results
+    self.__write_schema()
+
+  def __column_path(self, column: str, suffix: str = '.bin') -> str:
+    return os.path.join(self.filename, column + suffix)
+
+  def __write_schema(self):
+    """Write the schema of the columns"""
+    schema_path = os.path.join(self.filename, SCHEMA_FILENAME)
+    with open(schema_path + '.tmp', 'w') as f:
+      json.dump(self.__schema, f)
+    os.replace(schema_path + '.tmp', schema_path)
+
+  def __add_column(self, column: str, dtype: str):
+    """Add a new column with all the rows so far missing
+
+    Args:
+      column: column name
+      dtype: type of the column returned by :func:`__dtype`
+    """
+    if dtype == 'str':
+      self.__schema[column] = {'dtype': 'int32', 'encoding': 'dictionary'}
+      self.__codes[column] = {}
+      self.__dictionary_files[column] = open(
+          self.__column_path(column, DICTIONARY_SUFFIX), 'w')
+    elif dtype.startswith('list'):
+      self.__schema[column] = {
+          'dtype': 'int64',
+          'encoding': 'list',
+          'values_dtype': dtype[len('list:'):]
+      }
+      self.__value_counts[column] = 0
+      self.__value_files[column] = open(
+          self.__column_path(column, VALUES_SUFFIX), 'wb')
+    else:
+      self.__schema[column] = {'dtype': dtype}
+    self.__files[column] = open(self.__column_path(column), 'ab')
+    self.__files[column].write(
+        np.full(self.__rows, self.__missing_value(column),
+                dtype=self.__schema[column]['dtype']).tobytes())
+
+  def __missing_value(self, column: str):
+    dtype = self.__schema[column]['dtype']
+    if dtype == 'float64':
+      return np.nan
+    if dtype == 'int64':
+      return MISSING_INT
+    return -1
+
+  def __to_float(self, column: str):
+    """Convert an integer column or the values of an integer list column to
+    float
+
+    Args:
+      column: column name
+    """
+    schema = self.__schema[column]
+    if schema.get('encoding') == 'list':
+      (files, suffix, key) = (self.__value_files, VALUES_SUFFIX, 'values_dtype')
+    else:
+      (files, suffix, key) = (self.__files, '.bin', 'dtype')
+    files[column].close()
+    values = np.fromfile(self.__column_path(column, suffix), dtype='int64')
+    converted = values.astype('float64')
+    converted[values == MISSING_INT] = np.nan
+    converted.tofile(self.__column_path(column, suffix))
+    schema[key] = 'float64'
+    files[column] = open(self.__column_path(column, suffix), 'ab')
+
+  @staticmethod
+  def __dtype(column: str, value) -> str:
+    """
+    Args:
+      column: column name
+      value: value of the column
+
+    Returns:
+      type of the value, which is `list:<type of the elements>` for a list
+    """
+    if isinstance(value, (bool, np.bool_)):
+      return 'int8'
+    if isinstance(value, (int, np.integer)):
+      return 'int64'
+    if isinstance(value, (float, np.floating)):
+      return 'float64'
+    if isinstance(value, str):
+      return 'str'
+    if isinstance(value, (list, tuple, np.ndarray)):
+      values = np.asarray(value)
+      if values.ndim == 1 and (len(values) == 0 or values.dtype.kind in 'biu'):
+        return 'list:int64'
+      if values.ndim == 1 and values.dtype.kind == 'f':
+        return 'list:float64'
+    raise Exception('Value %r of column %s is neither a scalar nor a list of '
+                    'numbers!' % (value, column))
+
+  def __encode(self, column: str, value: str) -> int:
+    """Dictionary-encode a string
+
+    Args:
+      column: column name
+      value: string to encode
+
+    Returns:
+      code of the string
+    """
+    codes = self.__codes[column]
+    if value not in codes:
+      codes[value] = len(codes)
+      self.__dictionary_files[column].write(json.dumps(value) + '\n')
+    return codes[value]
+
+  def __update_schema(self, records: List[Dict]) -> bool:
+    """Add the new columns and convert the integer columns getting floats
+
+    Args:
+      records: records to write
+
+    Returns:
+      whether the schema is changed
+    """
+    changed = False
+    for record in records:
+      for (column, value) in record.items():
+        if value is None:
+          continue
+        dtype = self.__dtype(column, value)
+        if column not in self.__schema:
+          self.__add_column(column, dtype)
+          changed = True
+          continue
+        schema = self.__schema[column]
+        if (schema.get('encoding') == 'list') != dtype.startswith('list'):
+          raise Exception('Column %s mixes lists with scalars!' % column)
+        if dtype == 'float64' and schema['dtype'] == 'int64' and \
+            schema.get('encoding') is None:
+          self.__to_float(column)
+          changed = True
+        elif dtype == 'list:float64' and schema['values_dtype'] == 'int64':
+          self.__to_float(column)
+          changed = True
+    return changed
+
+  def _write_batch(self, records: List[Dict]):
+    """Write a batch of records to the file
+
+    Args:
+      records: records to write
+    """
+    if self.__update_schema(records):
+      self.__write_schema()
+    columns = {}
+    for (column, schema) in self.__schema.items():
+      missing = self.__missing_value(column)
+      present = [
+          column in record and record[column] is not None for record in records
+      ]
+      if schema.get('encoding') == 'dictionary':
+        values = [
+            self.__encode(column, record[column]) if is_present else missing
+            for (record, is_present) in zip(records, present)
+        ]
+      elif schema.get('encoding') == 'list':
+        lists = [
+            record[column] for (record, is_present) in zip(records, present)
+            if is_present
+        ]
+        self.__value_files[column].write(
+            np.concatenate([np.asarray(values, dtype=schema['values_dtype'])
+                            for values in lists] if lists else
+                           [np.zeros(0, dtype=schema['values_dtype'])
+                           ]).tobytes())
+        ends = np.full(len(records), missing, dtype='int64')
+        ends[np.flatnonzero(present)] = self.__value_counts[column] + \
+            np.cumsum([len(values) for values in lists], dtype='int64')
+        self.__value_counts[column] += sum(len(values) for values in lists)
+        values = ends
+      else:
+        values = [
+            record[column] if is_present else missing
+            for (record, is_present) in zip(records, present)
+        ]
+      columns[column] = np.asarray(values, dtype=schema['dtype'])
+    # dictionaries and values are flushed before the columns so that the
+    # columns never refer to data not written yet
+    for f in itertools.chain(self.__dictionary_files.values(),
+                             self.__value_files.values()):
+      f.flush()
+    for (column, values) in columns.items():
+      self.__files[column].write(values.tobytes())
+      self.__files[column].flush()
+    self.__rows += len(records)
+
+  def _sync(self) -> int:
+    """Sync the records written to the disk
+
+    Returns:
+      number of rows
+    """
+    for f in itertools.chain(self.__dictionary_files.values(),
+                             self.__value_files.values(),
+                             self.__files.values()):
+      os.fsync(f.fileno())
+    return self.__rows
+
+  def _close(self):
+    """Close the file"""
+    for f in itertools.chain(self.__dictionary_files.values(),
+                             self.__value_files.values(),
+                             self.__files.values()):
+      f.close()
+    self.__write_schema()
+
+
+class ColumnarResults:
+  """Columns loaded by :func:`load_columnar`
+
+  Numeric columns are memory-mapped. For a dictionary-encoded column, the codes
+  are memory-mapped and accessible via :func:`codes`, and the decoded values
+  are returned by indexing. For a list column, the offsets and the
+  memory-mapped values are accessible via :func:`values`, and the list of each
+  row is returned by indexing.
+  """
+  def __init__(self, schema: Dict[str, Dict], columns: Dict[str, np.ndarray],
+               dictionaries: Dict[str, List[str]],
+               lists: Dict[str, Tuple[np.ndarray, np.ndarray]], rows: int):
+    """
+    Args:
+      schema: schema of the columns
+      columns: memory-mapped columns
+      dictionaries: dictionaries of the dictionary-encoded columns
+      lists: offsets and values of the list columns
+      rows: number of rows
+    """
+    self.__schema = schema
+    self.__columns = columns
+    self.__dictionaries = dictionaries
+    self.__lists = lists
+    self.__rows = rows
+
+  def __len__(self) -> int:
+    return self.__rows
+
+  def __contains__(self, column: str) -> bool:
+    return column in self.__columns
+
+  def __getitem__(self, column: str) -> np.ndarray:
+    if column in self.__lists:
+      (offsets, values) = self.__lists[column]
+      rows = np.empty(self.__rows, dtype=object)
+      for (row, end) in enumerate(self.__columns[column]):
+        rows[row] = None if end == MISSING_INT else \
+            values[offsets[row]:offsets[row + 1]]
+      return rows
+    if column not in self.__dictionaries:
+      return self.__columns[column]
+    codes = self.__columns[column]
+    # the last entry is used to decode missing values
+    dictionary = np.array(self.__dictionaries[column] + [None], dtype=object)
+    return dictionary[codes]
+
+  @property
+  def columns(self) -> List[str]:
+    """column names"""
+    return list(self.__columns.keys())
+
+  @property
+  def schema(self) -> Dict[str, Dict]:
+    """schema of the columns"""
+    return self.__schema
+
+  def codes(self, column: str) -> np.ndarray:
+    """
+    Args:
+      column: name of a dictionary-encoded column
+
+    Returns:
+      memory-mapped codes of the column
+    """
+    return self.__columns[column]
+
+  def dictionary(self, column: str) -> List[str]:
+    """
+    Args:
+      column: name of a dictionary-encoded column
+
+    Returns:
+      values of the column indexed by codes
+    """
+    return self.__dictionaries[column]
+
+  def values(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Args:
+      column: name of a list column
+
+    Returns:
+      offsets with one more entry than the rows and the memory-mapped values
+      of the column. The list of row `i` is `values[offsets[i]:offsets[i +
+      1]]`, which is empty if the list is missing.
+    """
+    return self.__lists[column]
+
+
+def load_columnar(dirname: str) -> ColumnarResults:
+  """Load the columns written by :class:`ColumnarWriter`
+
+  Args:
+    dirname: directory storing the columns
+
+  Returns:
+    columns loaded
+  """
+  with open(os.path.join(dirname, SCHEMA_FILENAME), 'r') as f:
+    schema = json.load(f)
+  sizes = {
+      column: os.path.getsize(os.path.join(dirname, '%s.bin' % column)) //
+      np.dtype(column_schema['dtype']).itemsize
+      for (column, column_schema) in schema.items()
+  }
+  # rows fully written in all the columns
+  rows = min(sizes.values()) if sizes else 0
+  # end of the values of each row of the list columns
+  ends = {}
+  for (column, column_schema) in schema.items():
+    if column_schema.get('encoding') != 'list':
+      continue
+    column_ends = np.fromfile(os.path.join(dirname, '%s.bin' % column),
+                              dtype='int64',
+                              count=rows)
+    column_ends[column_ends == MISSING_INT] = 0
+    ends[column] = np.maximum.accumulate(column_ends)
+    # rows whose values are fully written
+    rows = min(
+        rows,
+        int(
+            np.searchsorted(
+                ends[column],
+                os.path.getsize(
+                    os.path.join(dirname, column + VALUES_SUFFIX)) //
+                np.dtype(column_schema['values_dtype']).itemsize,
+                side='right')))
+  columns = {}
+  for (column, column_schema) in schema.items():
+    if rows == 0:
+      columns[column] = np.zeros(0, dtype=column_schema['dtype'])
+    else:
+      columns[column] = np.memmap(os.path.join(dirname, '%s.bin' % column),
+                                  dtype=column_schema['dtype'],
+                                  mode='r',
+                                  shape=(rows,))
+  dictionaries = {
+      column: _read_json_lines(os.path.join(dirname,
+                                            column + DICTIONARY_SUFFIX))[0]
+      for (column, column_schema) in schema.items()
+      if column_schema.get('encoding') == 'dictionary'
+  }
+  lists = {}
+  for (column, column_ends) in ends.items():
+    offsets = np.concatenate([[0], column_ends[:rows]]).astype('int64')
+    values_dtype = schema[column]['values_dtype']
+    lists[column] = (offsets, np.zeros(0, dtype=values_dtype)
+                     if offsets[-1] == 0 else np.memmap(
+                         os.path.join(dirname, column + VALUES_SUFFIX),
+                         dtype=values_dtype,
+                         mode='r',
+                         shape=(int(offsets[-1]),)))
+  return ColumnarResults(schema=schema,
+                         columns=columns,
+                         dictionaries=dictionaries,
+                         lists=lists,
+                         rows=rows)
+
+
+def open_result_writer(filename: str,
+                       output_format: str = 'json',
+                       manifest_filename: str = None,
+                       append_manifest: bool = False) -> ResultWriter:
+  """Open a result writer
+
+  Args:
+    filename: file used to dump the results
+    output_format: `json` for JSON lines or `columnar` for typed columns
+    manifest_filename: file used to dump the manifest of finished trials
+    append_manifest: whether to append to the manifest
+
+  Returns:
+    result writer
+  """
+  if output_format == 'json':
+    return JsonLinesWriter(filename,
+                           manifest_filename=manifest_filename,
+                           append_manifest=append_manifest)
+  if output_format == 'columnar':
+    return ColumnarWriter(filename,
+                          manifest_filename=manifest_filename,
+                          append_manifest=append_manifest)
+  raise Exception('Output format %s is not supported!' % output_format)
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from .writer import JsonLinesWriter, ColumnarWriter, load_columnar, \
+    read_manifest
+
+
+class TestJsonLinesWriter:
+  """Test JSON lines writer"""
+
+  def test_write_in_batches(self):
+    temp_file = tempfile.NamedTemporaryFile()
+    with JsonLinesWriter(temp_file.name, batch_size=3,
+                         flush_interval=60) as writer:
+      for trial in range(10):
+        writer.write([{'trial': trial, 'rounds': rounds}
+                      for rounds in range(2)])
+      writer.write({'trial': 10, 'rounds': 0})
+    # all the records are written once the writer is closed
+    with open(temp_file.name, 'r') as f:
+      records = [json.loads(line) for line in f.readlines()]
+    assert len(records) == 21
+    assert [record['trial'] for record in records] == \
+        sorted([record['trial'] for record in records])
+
+  def test_read_manifest(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    manifest_filename = os.path.join(temp_dir.name, 'manifest')
+    assert read_manifest(manifest_filename) == ([], 0)
+    with open(manifest_filename, 'w') as f:
+      f.write('{"trial": 0, "position": 1}\n')
+      # the last entry can be parsed but misses its newline
+      f.write('{"trial": 1, "position": 2}')
+    assert read_manifest(manifest_filename) == ([{
+        'trial': 0,
+        'position': 1
+    }], 28)
+    # the writer drops the same entry when appending to the manifest
+    with JsonLinesWriter(os.path.join(temp_dir.name, 'results'),
+                         manifest_filename=manifest_filename,
+                         append_manifest=True):
+      pass
+    with open(manifest_filename, 'r') as f:
+      assert [json.loads(line)['trial'] for line in f] == [0]
+
+
+class TestColumnarWriter:
+  """Test columnar writer"""
+
+  def test_write_and_load(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    with ColumnarWriter(temp_dir.name, batch_size=2) as writer:
+      writer.write([{'learner': 'ucb', 'rounds': 10, 'regret': 1},
+                    {'learner': 'moss', 'rounds': 20, 'regret': 2.5}])
+      writer.write({'learner': 'ucb', 'rounds': 30, 'regret': 3.5,
+                    'censored': True})
+    # records are appended
+    with ColumnarWriter(temp_dir.name) as writer:
+      writer.write({'learner': 'ts', 'rounds': 40, 'regret': 4.5})
+    columns = load_columnar(temp_dir.name)
+    assert len(columns) == 4
+    assert list(columns['learner']) == ['ucb', 'moss', 'ucb', 'ts']
+    assert columns.dictionary('learner') == ['ucb', 'moss', 'ts']
+    assert columns['rounds'].dtype == 'int64'
+    assert list(columns['rounds']) == [10, 20, 30, 40]
+    # integer column is converted to float
+    assert columns['regret'].dtype == 'float64'
+    assert list(columns['regret']) == [1.0, 2.5, 3.5, 4.5]
+    assert list(columns['censored']) == [-1, -1, 1, -1]
+
+  def test_list_columns(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    with ColumnarWriter(temp_dir.name, batch_size=2) as writer:
+      writer.write([{'trial': 0, 'histogram': [1, 2]},
+                    {'trial': 1, 'histogram': []},
+                    {'trial': 2}])
+    # values are converted to float once a float shows up
+    with ColumnarWriter(temp_dir.name) as writer:
+      writer.write({'trial': 3, 'histogram': np.array([0.5, 1.5, 2.5])})
+    columns = load_columnar(temp_dir.name)
+    (offsets, values) = columns.values('histogram')
+    assert list(offsets) == [0, 2, 2, 2, 5]
+    assert values.dtype == 'float64'
+    assert list(values) == [1.0, 2.0, 0.5, 1.5, 2.5]
+    histograms = columns['histogram']
+    assert list(histograms[0]) == [1.0, 2.0]
+    assert len(histograms[1]) == 0
+    assert histograms[2] is None
+    # values of other types are rejected
+    with pytest.raises(Exception, match='Failed to write') as error_info:
+      with ColumnarWriter(temp_dir.name) as writer:
+        writer.write({'trial': 4, 'histogram': {'bucket': 1}})
+    assert 'list of numbers' in str(error_info.value.__cause__)
+
+  def test_write_schema_once(self, monkeypatch):
+    temp_dir = tempfile.TemporaryDirectory()
+    replaced = []
+    replace = os.replace
+
+    def recording_replace(src, dst):
+      replaced.append(dst)
+      replace(src, dst)
+
+    monkeypatch.setattr(os, 'replace', recording_replace)
+    with ColumnarWriter(temp_dir.name, batch_size=1) as writer:
+      for trial in range(10):
+        writer.write({'learner': 'ucb_%d' % trial, 'trial': trial})
+    # the schema is written when the writer is opened and closed, and when
+    # the columns are added
+    assert len(replaced) == 3
+    assert load_columnar(temp_dir.name).dictionary('learner') == \
+        ['ucb_%d' % trial for trial in range(10)]
+
+  def test_drop_rows_not_in_manifest(self):
+    temp_dir = tempfile.TemporaryDirectory()
+    output_dir = os.path.join(temp_dir.name, 'results')
+    manifest_filename = os.path.join(temp_dir.name, 'manifest')
+    with ColumnarWriter(output_dir,
+                        manifest_filename=manifest_filename) as writer:
+      writer.write({'trial': 0, 'regret': 1.0, 'histogram': [1]},
+                   manifest_entries=[{'trial': 0}])
+    # records of a trial whose entry of the manifest is not written
+    with ColumnarWriter(output_dir) as writer:
+      writer.write({'trial': 1, 'regret': 2.0, 'histogram': [2, 2]})
+    with ColumnarWriter(output_dir,
+                        manifest_filename=manifest_filename,
+                        append_manifest=True) as writer:
+      writer.write({'trial': 1, 'regret': 3.0, 'histogram': [3]},
+                   manifest_entries=[{'trial': 1}])
+    columns = load_columnar(output_dir)
+    assert list(columns['trial']) == [0, 1]
+    assert list(columns['regret']) == [1.0, 3.0]
+    assert list(columns.values('histogram')[1]) == [1, 3]
+    with open(manifest_filename, 'r') as f:
+      assert [json.loads(line)['position'] for line in f] == [1, 2]
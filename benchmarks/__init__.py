@@ -0,0 +1,6 @@
+"""Benchmarks of the learners and the bandit environments
+
+Steps per second and peak memory of every learner are measured in the bandit
+environments it can play in at several sizes. Results are stored as JSON keyed
+by git commit. See :mod:`benchmarks.__main__` for the command line.
+"""
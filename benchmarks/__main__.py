@@ -0,0 +1,119 @@
+"""Command line of the benchmarks
+
+Run the benchmarks at the current commit::
+
+  python -m benchmarks run --quick
+
+Compare two commits and flag regressions::
+
+  python -m benchmarks compare <base commit> <head commit>
+"""
+import argparse
+import re
+import sys
+
+from .cases import cases
+from .runner import run_case, current_commit, load_results, save_results, \
+    find_commit, compare
+
+# default file of the results
+RESULTS_FILENAME = 'benchmark_results.json'
+
+
+def _run(args: argparse.Namespace) -> int:
+  """Run the benchmarks
+
+  Args:
+    args: command line arguments
+
+  Returns:
+    exit status
+  """
+  commit = args.commit if args.commit is not None else current_commit()
+  results = {}
+  for case in cases(quick=args.quick):
+    if args.filter is not None and re.search(args.filter, case.name) is None:
+      continue
+    results[case.name] = run_case(case,
+                                  repeats=args.repeats,
+                                  max_steps=args.max_steps)
+    print('%-70s %12.0f steps/s %10.1f KiB' %
+          (case.name, results[case.name]['steps_per_second'],
+           results[case.name]['peak_memory'] / 1024))
+  save_results(args.results, commit, results)
+  print('results of %d cases are saved to %s under commit %s' %
+        (len(results), args.results, commit))
+  return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+  """Compare the results of two commits
+
+  Args:
+    args: command line arguments
+
+  Returns:
+    exit status which is 1 if there are regressions
+  """
+  all_results = load_results(args.results)
+  base = find_commit(all_results, args.base)
+  head = find_commit(all_results, args.head)
+  regressions = compare(all_results[base]['results'],
+                        all_results[head]['results'], args.threshold)
+  for regression in regressions:
+    print(regression)
+  print('%d regressions from %s to %s' % (len(regressions), base, head))
+  return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+  """Entry of the command line
+
+  Args:
+    argv: command line arguments
+
+  Returns:
+    exit status
+  """
+  parser = argparse.ArgumentParser(prog='python -m benchmarks')
+  parser.add_argument('--results',
+                      default=RESULTS_FILENAME,
+                      help='file of the results keyed by git commit')
+  subparsers = parser.add_subparsers(dest='command')
+  subparsers.required = True
+
+  run_parser = subparsers.add_parser('run', help='run the benchmarks')
+  run_parser.add_argument('--quick',
+                          action='store_true',
+                          help='only use the smallest sizes')
+  run_parser.add_argument('--filter',
+                          help='regular expression of the cases to run')
+  run_parser.add_argument('--repeats',
+                          type=int,
+                          default=3,
+                          help='number of timed games of each case')
+  run_parser.add_argument('--max-steps',
+                          type=int,
+                          default=100000,
+                          help='maximum number of steps of a game')
+  run_parser.add_argument('--commit',
+                          help='commit to save the results under. The current '
+                          'commit is used by default.')
+  run_parser.set_defaults(func=_run)
+
+  compare_parser = subparsers.add_parser(
+      'compare', help='compare two commits and flag regressions')
+  compare_parser.add_argument('base', help='prefix of the base commit')
+  compare_parser.add_argument('head', help='prefix of the head commit')
+  compare_parser.add_argument('--threshold',
+                              type=float,
+                              default=0.1,
+                              help='relative change tolerated')
+  compare_parser.set_defaults(func=_compare)
+
+  args = parser.parse_args(argv)
+  return args.func(args)
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,190 @@
+import functools
+from typing import Callable, List
+
+import numpy as np
+
+from banditpylib.arms import BernoulliArm
+from banditpylib.bandits import Bandit, OrdinaryBandit, LinearBandit, \
+    OrdinaryMNLBandit, MeanReward
+from banditpylib.learners import Learner
+import banditpylib.learners.ordinary_learner as ordinary_learner
+import banditpylib.learners.ordinary_fbbai_learner as ordinary_fbbai_learner
+import banditpylib.learners.ordinary_fcbai_learner as ordinary_fcbai_learner
+import banditpylib.learners.ordinary_mnl_learner as ordinary_mnl_learner
+
+
+class Case:
+  """Benchmark case
+
+  A case is one learner playing in one bandit environment of a given size.
+  Learners and environments are created by factories so that each run starts
+  from a fresh state.
+  """
+  def __init__(self, name: str, make_bandit: Callable[[], Bandit],
+               make_learner: Callable[[], Learner]):
+    """
+    Args:
+      name: name of the case, which identifies the case across commits
+      make_bandit: factory of the bandit environment
+      make_learner: factory of the learner
+    """
+    self.__name = name
+    self.__make_bandit = make_bandit
+    self.__make_learner = make_learner
+
+  @property
+  def name(self) -> str:
+    """case name"""
+    return self.__name
+
+  def make_bandit(self) -> Bandit:
+    """
+    Returns:
+      a new bandit environment
+    """
+    return self.__make_bandit()
+
+  def make_learner(self) -> Learner:
+    """
+    Returns:
+      a new learner
+    """
+    return self.__make_learner()
+
+
+def _ordinary_bandit(arm_num: int) -> OrdinaryBandit:
+  """
+  Args:
+    arm_num: number of arms
+
+  Returns:
+    ordinary bandit with Bernoulli arms whose means are evenly spaced
+  """
+  return OrdinaryBandit(
+      [BernoulliArm(mean) for mean in np.linspace(0.1, 0.9, arm_num)])
+
+
+def _linear_bandit(arm_num: int) -> LinearBandit:
+  """
+  Args:
+    arm_num: number of arms
+
+  Returns:
+    linear bandit with random features of dimension 5
+  """
+  random_state = np.random.RandomState(0)
+  features = [random_state.uniform(-1, 1, 5) for _ in range(arm_num)]
+  theta = random_state.uniform(-1, 1, 5)
+  return LinearBandit(features, theta)
+
+
+def _ordinary_mnl_bandit(product_num: int) -> OrdinaryMNLBandit:
+  """
+  Args:
+    product_num: number of products
+
+  Returns:
+    ordinary mnl bandit with random preference parameters and revenues
+  """
+  random_state = np.random.RandomState(0)
+  preference_params = np.concatenate(
+      ([1.0], random_state.uniform(0, 1, product_num)))
+  revenues = np.concatenate(([0.0], random_state.uniform(0.1, 1,
+                                                         product_num)))
+  return OrdinaryMNLBandit(preference_params, revenues)
+
+
+# factories of the environments ordinary learners can play in
+_ORDINARY_BANDITS = {
+    'ordinary_bandit': _ordinary_bandit,
+    'linear_bandit': _linear_bandit,
+}
+
+# extra arguments of the ordinary learners in each environment. Rewards of the
+# linear bandit are not in [0, 1], so the beta prior can not be used.
+_ORDINARY_LEARNER_ARGS = {
+    ('linear_bandit', ordinary_learner.ThompsonSampling): {
+        'prior_dist': 'gaussian'
+    },
+}
+
+
+def cases(quick: bool = False) -> List[Case]:
+  """Benchmark cases
+
+  Every learner in :mod:`banditpylib.learners` is benchmarked. Learners of the
+  ordinary bandit are run in both :class:`banditpylib.bandits.OrdinaryBandit`
+  and :class:`banditpylib.bandits.LinearBandit`. Learners of the ordinary mnl
+  bandit are run in :class:`banditpylib.bandits.OrdinaryMNLBandit`.
+
+  Args:
+    quick: whether to only use the smallest sizes
+
+  Returns:
+    benchmark cases
+  """
+  arm_nums = [10] if quick else [10, 100]
+  horizons = [1000] if quick else [1000, 10000]
+  product_nums = [4] if quick else [4, 8]
+  mnl_horizons = [100] if quick else [100, 1000]
+
+  all_cases = []
+  for (bandit_name, make_bandit) in _ORDINARY_BANDITS.items():
+    for arm_num in arm_nums:
+      for horizon in horizons:
+        suffix = '%s/arms=%d/horizon=%d' % (bandit_name, arm_num, horizon)
+        for learner_class in [
+            ordinary_learner.EpsGreedy, ordinary_learner.UCB,
+            ordinary_learner.MOSS, ordinary_learner.UCBV,
+            ordinary_learner.ThompsonSampling, ordinary_learner.Uniform
+        ]:
+          all_cases.append(
+              Case('ordinary.%s/%s' % (learner_class.__name__, suffix),
+                   make_bandit=functools.partial(make_bandit, arm_num),
+                   make_learner=functools.partial(
+                       learner_class,
+                       arm_num=arm_num,
+                       horizon=horizon,
+                       **_ORDINARY_LEARNER_ARGS.get(
+                           (bandit_name, learner_class), {}))))
+        # the horizon is used as the budget
+        for learner_class in [
+            ordinary_fbbai_learner.Uniform, ordinary_fbbai_learner.SR,
+            ordinary_fbbai_learner.SH
+        ]:
+          all_cases.append(
+              Case('fbbai.%s/%s' % (learner_class.__name__, suffix),
+                   make_bandit=functools.partial(make_bandit, arm_num),
+                   make_learner=functools.partial(learner_class,
+                                                  arm_num=arm_num,
+                                                  budget=horizon)))
+      # fixed confidence learners stop by themselves
+      suffix = '%s/arms=%d' % (bandit_name, arm_num)
+      for learner_class in [
+          ordinary_fcbai_learner.ExpGap, ordinary_fcbai_learner.LilUCBHeuristic
+      ]:
+        all_cases.append(
+            Case('fcbai.%s/%s' % (learner_class.__name__, suffix),
+                 make_bandit=functools.partial(make_bandit, arm_num),
+                 make_learner=functools.partial(learner_class,
+                                                arm_num=arm_num,
+                                                confidence=0.95)))
+
+  for product_num in product_nums:
+    revenues = _ordinary_mnl_bandit(product_num).revenues()
+    for horizon in mnl_horizons:
+      suffix = 'ordinary_mnl_bandit/products=%d/horizon=%d' % (product_num,
+                                                                horizon)
+      for learner_class in [
+          ordinary_mnl_learner.EpsGreedy, ordinary_mnl_learner.UCB,
+          ordinary_mnl_learner.ThompsonSampling
+      ]:
+        all_cases.append(
+            Case('mnl.%s/%s' % (learner_class.__name__, suffix),
+                 make_bandit=functools.partial(_ordinary_mnl_bandit,
+                                               product_num),
+                 make_learner=functools.partial(learner_class,
+                                                revenues=revenues,
+                                                horizon=horizon,
+                                                reward=MeanReward())))
+  return all_cases
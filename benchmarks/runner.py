@@ -0,0 +1,188 @@
+import json
+import os
+import subprocess
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from banditpylib.protocols import seed_trial
+from .cases import Case
+
+# changes of peak memory below this number of bytes are seen as noise
+MEMORY_NOISE = 64 * 1024
+
+
+def _play(case: Case, random_seed: int, max_steps: int) -> Tuple[int, float]:
+  """Play one game of a case
+
+  Args:
+    case: benchmark case
+    random_seed: random seed
+    max_steps: maximum number of steps i.e., actions executed by the bandit
+      environment. Learners with fixed confidence may take too many steps to
+      stop, so their games are cut at this number.
+
+  Returns:
+    number of steps and the seconds used to play them
+  """
+  bandit = case.make_bandit()
+  learner = case.make_learner()
+  seed_trial(random_seed, bandit, learner)
+  bandit.reset()
+  learner.reset()
+
+  steps = 0
+  start_time = time.perf_counter()
+  while steps < max_steps:
+    actions = learner.actions(bandit.context())
+    if actions is None:
+      break
+    feedback = bandit.feed(actions)
+    learner.update(feedback)
+    for (_, times) in actions:
+      steps += int(times)
+  return (steps, time.perf_counter() - start_time)
+
+
+def run_case(case: Case, repeats: int = 3, max_steps: int = 100000) -> Dict:
+  """Run a benchmark case
+
+  Steps per second is the best of `repeats` games. Peak memory is measured in
+  an extra game under :mod:`tracemalloc` so that tracing does not slow down
+  the timed games.
+
+  Args:
+    case: benchmark case
+    repeats: number of timed games
+    max_steps: maximum number of steps of a game
+
+  Returns:
+    number of steps, steps per second and peak memory in bytes
+  """
+  best_steps_per_second = 0.0
+  for repeat in range(repeats):
+    (steps, seconds) = _play(case, random_seed=repeat, max_steps=max_steps)
+    best_steps_per_second = max(best_steps_per_second,
+                                steps / max(seconds, 1e-9))
+
+  tracemalloc.start()
+  try:
+    _play(case, random_seed=0, max_steps=max_steps)
+    (_, peak_memory) = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  return {
+      'steps': steps,
+      'steps_per_second': best_steps_per_second,
+      'peak_memory': peak_memory
+  }
+
+
+def current_commit() -> str:
+  """
+  Returns:
+    hash of the current git commit. `-dirty` is appended if there are
+    uncommitted changes and `unknown` is returned outside of a git repository.
+  """
+  # the repository the benchmarks are in
+  repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  try:
+    commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                     cwd=repository,
+                                     stderr=subprocess.DEVNULL).decode().strip()
+    status = subprocess.check_output(['git', 'status', '--porcelain', '-uno'],
+                                     cwd=repository,
+                                     stderr=subprocess.DEVNULL).decode()
+  except (OSError, subprocess.CalledProcessError):
+    return 'unknown'
+  return commit + ('-dirty' if status.strip() else '')
+
+
+def load_results(filename: str) -> Dict[str, Dict]:
+  """
+  Args:
+    filename: file of the results
+
+  Returns:
+    results of each commit
+  """
+  if not os.path.exists(filename):
+    return {}
+  with open(filename, 'r') as f:
+    return json.load(f)
+
+
+def save_results(filename: str, commit: str, results: Dict[str, Dict]):
+  """Save the results of a commit
+
+  Results of the other commits in the file are kept. The results of the same
+  commit are updated case by case.
+
+  Args:
+    filename: file of the results
+    commit: commit the results are measured at
+    results: results of each case
+  """
+  all_results = load_results(filename)
+  commit_results = all_results.setdefault(commit, {
+      'time': None,
+      'results': {}
+  })
+  commit_results['time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+  commit_results['results'].update(results)
+  # write to a temporary file first so that the file is never half written
+  temp_filename = filename + '.tmp'
+  with open(temp_filename, 'w') as f:
+    json.dump(all_results, f, indent=2, sort_keys=True)
+  os.replace(temp_filename, filename)
+
+
+def find_commit(all_results: Dict[str, Dict], prefix: str) -> str:
+  """
+  Args:
+    all_results: results of each commit
+    prefix: prefix of the commit hash
+
+  Returns:
+    the commit whose hash starts with `prefix`
+  """
+  commits = [commit for commit in all_results if commit.startswith(prefix)]
+  if len(commits) != 1:
+    raise Exception('%d commits found for %s!' % (len(commits), prefix))
+  return commits[0]
+
+
+def compare(base: Dict[str, Dict], head: Dict[str, Dict],
+            threshold: float) -> List[str]:
+  """Compare the results of two commits
+
+  A case regresses if its steps per second drops or its peak memory grows by
+  more than `threshold` relatively. Growth of peak memory below
+  :data:`MEMORY_NOISE` bytes is ignored. Only cases measured at both commits
+  are compared.
+
+  Args:
+    base: results of each case at the base commit
+    head: results of each case at the head commit
+    threshold: relative change tolerated
+
+  Returns:
+    descriptions of the regressions
+  """
+  regressions = []
+  for case in sorted(set(base) & set(head)):
+    speed_ratio = head[case]['steps_per_second'] / max(
+        base[case]['steps_per_second'], 1e-9)
+    if speed_ratio < 1 - threshold:
+      regressions.append('%s: steps per second %.0f -> %.0f (%+.1f%%)' %
+                         (case, base[case]['steps_per_second'],
+                          head[case]['steps_per_second'],
+                          100 * (speed_ratio - 1)))
+    memory_ratio = head[case]['peak_memory'] / max(base[case]['peak_memory'],
+                                                   1)
+    if memory_ratio > 1 + threshold and head[case]['peak_memory'] - base[
+        case]['peak_memory'] > MEMORY_NOISE:
+      regressions.append('%s: peak memory %d -> %d bytes (%+.1f%%)' %
+                         (case, base[case]['peak_memory'],
+                          head[case]['peak_memory'], 100 * (memory_ratio - 1)))
+  return regressions
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+from .cases import cases
+from .runner import run_case, save_results, load_results, find_commit, \
+    compare
+
+
+class TestRunner:
+  """Test benchmark runner"""
+
+  def test_run_and_compare(self):
+    case = [
+        case for case in cases(quick=True)
+        if case.name == 'ordinary.UCB/ordinary_bandit/arms=10/horizon=1000'
+    ][0]
+    result = run_case(case, repeats=1, max_steps=100)
+    assert result['steps'] == 100
+    assert result['steps_per_second'] > 0
+    assert result['peak_memory'] > 0
+
+    temp_dir = tempfile.TemporaryDirectory()
+    filename = os.path.join(temp_dir.name, 'results.json')
+    save_results(filename, 'aaaa', {case.name: result})
+    slower_result = dict(result,
+                         steps_per_second=result['steps_per_second'] / 2)
+    save_results(filename, 'bbbb', {case.name: slower_result})
+    all_results = load_results(filename)
+    assert find_commit(all_results, 'b') == 'bbbb'
+    # the speed drops by half
+    assert len(
+        compare(all_results['aaaa']['results'],
+                all_results['bbbb']['results'],
+                threshold=0.1)) == 1
+    assert not compare(all_results['bbbb']['results'],
+                       all_results['aaaa']['results'],
+                       threshold=0.1)